@@ -1,7 +1,33 @@
 """Public API for never_sets."""
 
-from .core.solver import check_never_sets
-from .io.country_loader import iter_countries, load_country, to_latlon_list
+from .core.densify import densify_boundary
+from .core.ephemeris import check_never_sets_over_time
+from .core.field import CoverageField
+from .core.parameter_sweep import parameter_sweep
+from .core.point_index import PointIndex
+from .core.robustness import jitter_ensemble
+from .core.session import TerritorySession
+from .core.solver import check_never_sets, check_never_sets_many
+from .io.country_loader import iter_countries, load_country, load_country_arrays, to_country_arrays, to_latlon_list
+from .io.stream_loader import load_csv_points, load_geojson, load_territory
 
-__all__ = ["check_never_sets", "iter_countries", "load_country", "to_latlon_list"]
+__all__ = [
+    "CoverageField",
+    "PointIndex",
+    "TerritorySession",
+    "check_never_sets",
+    "check_never_sets_many",
+    "check_never_sets_over_time",
+    "densify_boundary",
+    "iter_countries",
+    "jitter_ensemble",
+    "load_country",
+    "load_country_arrays",
+    "load_csv_points",
+    "load_geojson",
+    "load_territory",
+    "parameter_sweep",
+    "to_country_arrays",
+    "to_latlon_list",
+]
 __version__ = "0.1.0"
@@ -2,58 +2,410 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from ..core.solver import check_never_sets
-from ..io.archive_writer import archive_witness
-from ..io.country_loader import iter_countries, to_latlon_list
-from ..io.report_writer import write_report
+import numpy as np
+
+from ..core.adaptive import DEFAULT_TOLERANCE_DEG
+from ..core.backends import BACKENDS
+from ..core.field import FIELD_DTYPES, CoverageField
+from ..core.point_index import PointIndex
+from ..core.robustness import jitter_ensemble
+from ..core.geometry import EARTH_OBLIQUITY_DEG, SunGrid
+from ..core.solver import DEFAULT_MAX_BYTES, ENGINES, MODES, PRECISIONS, check_never_sets, coverage_result
+from ..core.subsets import analyze_component_subsets
+from ..io.archive_writer import subsets_payload, witness_payload
+from ..io.country_loader import country_components
+from ..io.stream_loader import load_territory, territory_files
+from ..io.output_writer import DEFAULT_MAX_PENDING, LAYOUTS, Outputs, OutputWriter
+from ..io.report_writer import render_markdown_report
+from ..io.result_cache import DEFAULT_CACHE_MAX_BYTES, ResultCache, cache_key
+from ..models.country import AnyCountry
+from ..models.result import CoverageResult
+
+_INTERPRETATION = "margin_deg >= 0 indicates the 'never sets' condition for the chosen visibility limit"
+
+
+def _summary_entry(country: AnyCountry, results: Sequence[CoverageResult], decide: bool = False) -> Dict[str, Any]:
+    res = results[0]
+    entry: Dict[str, Any] = {
+        "id": country.id,
+        "name": country.name,
+        "pass": res.always_daylight_somewhere,
+        "worst_altitude_deg": res.witness.worst_max_altitude_deg,
+        "margin_deg": res.margin_altitude_deg,
+        "witness_decl_deg": res.witness.decl_deg,
+        "witness_hour_angle_deg": res.witness.hour_angle_deg,
+        "point_count": len(country.points),
+        "interpretation": _INTERPRETATION,
+    }
+    if len(results) > 1:
+        # Per-limit verdicts replace the single pass/margin pair.
+        del entry["pass"], entry["margin_deg"]
+        entry["verdicts"] = [
+            {
+                "visibility_limit_deg": r.limit_altitude_deg,
+                "pass": r.always_daylight_somewhere,
+                "margin_deg": r.margin_altitude_deg,
+            }
+            for r in results
+        ]
+    if decide:
+        # Per-limit decision witnesses; their altitudes and margins only bound the worst case.
+        for key in ("worst_altitude_deg", "margin_deg", "witness_decl_deg", "witness_hour_angle_deg"):
+            entry.pop(key, None)
+        verdicts = entry.pop("verdicts", None) or [
+            {"visibility_limit_deg": res.limit_altitude_deg, "pass": entry.pop("pass")}
+        ]
+        for v, r in zip(verdicts, results):
+            v.pop("margin_deg", None)
+            v["margin_upper_bound_deg"] = r.margin_altitude_deg
+            v["altitude_upper_bound_deg"] = r.witness.worst_max_altitude_deg
+            v["witness_decl_deg"] = r.witness.decl_deg
+            v["witness_hour_angle_deg"] = r.witness.hour_angle_deg
+        entry["verdicts"] = verdicts
+    if res.witness.worst_max_dot_bounds is not None:
+        entry["worst_max_dot_bounds"] = list(res.witness.worst_max_dot_bounds)
+    return entry
+
+
+def _witness_params(solve_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # Settings that determine the witness; limits, memory budget and pruning/index do not.
+    return {
+        "decl_step_deg": solve_kwargs["decl_step_deg"],
+        "hour_angle_step_deg": solve_kwargs["hour_angle_step_deg"],
+        "obliquity_deg": EARTH_OBLIQUITY_DEG,
+        "engine": solve_kwargs["engine"],
+        "tolerance_deg": solve_kwargs["tolerance_deg"],
+        "criticality": solve_kwargs["criticality"],
+    }
+
+
+def _already_rendered(out_dir: Path, country: AnyCountry, input_key: str) -> bool:
+    cdir = out_dir / country.id
+    try:
+        previous = json.loads((cdir / "witness.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return (cdir / "report.md").exists() and previous.get("extra", {}).get("input_key") == input_key
+
+
+_WORKER_GRIDS: Dict[Path, SunGrid] = {}
+
+
+def _resolve_grid(grid: Union[SunGrid, Path, None]) -> Optional[SunGrid]:
+    # Pool workers receive the path of the saved grid and memory-map it once per process.
+    if not isinstance(grid, Path):
+        return grid
+    if grid not in _WORKER_GRIDS:
+        _WORKER_GRIDS[grid] = SunGrid.load(grid, mmap=True)
+    return _WORKER_GRIDS[grid]
+
+
+def _process_country(
+    path: Path,
+    out_dir: Path,
+    solve_kwargs: Dict[str, Any],
+    use_index: bool,
+    cache: Optional[ResultCache] = None,
+    incremental: bool = False,
+    sun_grid: Union[SunGrid, Path, None] = None,
+    subsets: bool = False,
+    decimate_deg: Optional[float] = None,
+    skip_rendered: bool = False,
+    export_field: bool = False,
+    jitter: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], bool, Optional[Outputs]]:
+    # Unit of work for both the serial loop and pool workers: load, solve once (unless cached),
+    # render outputs. Returns the summary entry, whether the solve was a cache hit and the
+    # rendered outputs (None when incremental skipping keeps the previous ones); the parent's
+    # OutputWriter writes them.
+    # Columnar load (.json, .geojson or .csv): the solver reads the precomputed unit vectors.
+    country = load_territory(path, decimate_deg=decimate_deg)
+    pts = np.column_stack([country.lat, country.lon])
+    limits = solve_kwargs["visibility_limit_deg"]
+
+    key = cache_key(pts, _witness_params(solve_kwargs)) if cache is not None else None
+    # A cached witness has no field to export, so exporting runs always re-sweep.
+    witness = cache.get(key) if cache is not None and not export_field else None
+    field_dir = out_dir / country.id / "field" if export_field else None
+    if witness is not None:
+        results = [coverage_result(witness, limit) for limit in limits]
+    else:
+        results = check_never_sets(
+            country,
+            point_index=PointIndex.from_country(country) if use_index else None,
+            sun_grid=_resolve_grid(sun_grid),
+            field_dir=field_dir,
+            **solve_kwargs,
+        )
+        if cache is not None:
+            cache.put(key, results[0].witness)
+
+    decide = solve_kwargs["mode"] == "decide"
+    entry = _summary_entry(country, results, decide)
+    ensemble = None
+    if jitter is not None:
+        ensemble = jitter_ensemble(
+            country,
+            visibility_limit_deg=limits,
+            decl_step_deg=solve_kwargs["decl_step_deg"],
+            hour_angle_step_deg=solve_kwargs["hour_angle_step_deg"],
+            max_bytes=solve_kwargs["max_bytes"] or DEFAULT_MAX_BYTES,
+            sun_grid=_resolve_grid(sun_grid),
+            **jitter,
+        )
+        if "verdicts" in entry:
+            for v, probability in zip(entry["verdicts"], ensemble.pass_probability):
+                v["pass_probability"] = probability
+        else:
+            entry["pass_probability"] = ensemble.pass_probability[0]
+    extra = None
+    if key is not None:
+        # Rendered outputs also depend on the limits and the non-geometric country fields.
+        render_params = {
+            "witness_key": key,
+            "limits": limits,
+            "id": country.id,
+            "name": country.name,
+            "notes": country.notes,
+            "labels": [p.label for p in country.points],
+            "components": [p.component for p in country.points] if subsets else None,
+            "jitter": jitter,
+        }
+        input_key = cache_key(pts, render_params)
+        extra = {"input_key": input_key}
+        if skip_rendered and _already_rendered(out_dir, country, input_key):
+            return entry, witness is not None, None
+    outputs: Outputs = {
+        "report.md": render_markdown_report(country, results, decide=decide, ensemble=ensemble),
+        "witness.json": witness_payload(
+            country,
+            results,
+            extra=extra,
+            decide=decide,
+            field=CoverageField.load(field_dir) if field_dir else None,
+            ensemble=ensemble,
+        ),
+    }
+    if subsets:
+        analyses = analyze_component_subsets(
+            country_components(country),
+            visibility_limit_deg=limits,
+            decl_step_deg=solve_kwargs["decl_step_deg"],
+            hour_angle_step_deg=solve_kwargs["hour_angle_step_deg"],
+            max_bytes=solve_kwargs["max_bytes"] or DEFAULT_MAX_BYTES,
+            sun_grid=_resolve_grid(sun_grid),
+        )
+        outputs["subsets.json"] = subsets_payload(country, analyses)
+    return entry, witness is not None, outputs
+
+
+def _run_tasks(
+    paths: Sequence[Path],
+    out_dir: Path,
+    solve_kwargs: Dict[str, Any],
+    use_index: bool,
+    workers: int,
+    cache: Optional[ResultCache],
+    incremental: bool,
+    sun_grid: Optional[SunGrid],
+    subsets: bool = False,
+    decimate_deg: Optional[float] = None,
+    skip_rendered: bool = False,
+    export_field: bool = False,
+    jitter: Optional[Dict[str, Any]] = None,
+) -> Iterator[Tuple[int, Optional[Tuple[Dict[str, Any], bool, Optional[Outputs]]], Optional[BaseException]]]:
+    # Yields (position, (entry, cache_hit, outputs), error) as tasks finish; at most
+    # 2 * workers tasks are in flight.
+    task_args = (out_dir, solve_kwargs, use_index, cache, incremental, sun_grid)
+    task_args += (subsets, decimate_deg, skip_rendered, export_field, jitter)
+    if workers <= 1:
+        for i, path in enumerate(paths):
+            try:
+                yield i, _process_country(path, *task_args), None
+            except Exception as exc:
+                yield i, None, exc
+        return
+
+    with tempfile.TemporaryDirectory(prefix="never_sets_grid_") as grid_dir:
+        # Workers share one read-only copy of a materialised Sun grid through a memory-mapped .npy.
+        if sun_grid is not None and sun_grid.sun_vectors is not None:
+            task_args = task_args[:5] + (sun_grid.save(grid_dir),) + task_args[6:]
+        yield from _run_pool(paths, task_args, workers)
+
+
+def _run_pool(
+    paths: Sequence[Path],
+    task_args: Tuple[Any, ...],
+    workers: int,
+) -> Iterator[Tuple[int, Optional[Tuple[Dict[str, Any], bool, Optional[Outputs]]], Optional[BaseException]]]:
+    # Spawned, not forked: a fork taken while the parent's Numba thread pool is live can deadlock.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending: Dict[Future, int] = {}
+        queue = iter(enumerate(paths))
+        while True:
+            for i, path in queue:
+                pending[pool.submit(_process_country, path, *task_args)] = i
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = pending.pop(fut)
+                exc = fut.exception()
+                yield i, (None if exc else fut.result()), exc
 
 
 def run_batch(
     data_dir: str | Path,
     out_dir: str | Path,
     *,
-    limit: float,
+    limit: Union[float, Sequence[float]],
     decl_step: float,
     hour_step: float,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    engine: str = "grid",
+    tolerance_deg: float = DEFAULT_TOLERANCE_DEG,
+    prune_dominated: bool = False,
+    use_index: bool = False,
+    workers: int = 1,
+    cache_dir: Optional[str | Path] = None,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    incremental: bool = False,
+    criticality: bool = False,
+    subsets: bool = False,
+    mode: str = "solve",
+    backend: str = "auto",
+    precision: str = "float64",
+    decimate_deg: Optional[float] = None,
+    output_layout: str = "files",
+    max_pending: int = DEFAULT_MAX_PENDING,
+    export_field: bool = False,
+    field_dtype: str = "float64",
+    jitter_radius_deg: Optional[float] = None,
+    jitter_replicas: int = 1000,
+    jitter_seed: int = 0,
 ) -> Dict[str, Any]:
+    """Solve every territory in ``data_dir`` and write reports, witnesses and a summary.
+
+    Outputs go through a background ``OutputWriter``: ``output_layout="files"`` keeps one
+    directory per country and the full ``summary.json``; ``"jsonl"`` and ``"zip"`` consolidate
+    them into ``results.jsonl``/``results.zip``, and the per-country entries then live only in
+    the incrementally appended ``summary.jsonl`` (``summary.json`` keeps the run metadata).
+    ``export_field`` writes each country's coverage field to ``<out>/<id>/field/``, and
+    ``jitter_radius_deg`` adds a Monte Carlo robustness section (see ``jitter_ensemble``).
+    """
+    if output_layout not in LAYOUTS:
+        raise ValueError(f"output_layout must be one of {', '.join(LAYOUTS)}.")
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    limits: List[float] = [float(limit)] if isinstance(limit, (int, float)) else [float(x) for x in limit]
 
     summary: Dict[str, Any] = {
         "data_dir": str(Path(data_dir).resolve()),
         "out_dir": str(out_dir.resolve()),
-        "visibility_limit_deg": limit,
+        "visibility_limit_deg": limits[0] if len(limits) == 1 else limits,
         "decl_step_deg": decl_step,
         "hour_angle_step_deg": hour_step,
+        "engine": engine,
+        "mode": mode,
+        "output_layout": output_layout,
         "countries": [],
     }
+    if decimate_deg is not None:
+        if not decimate_deg > 0:
+            raise ValueError("decimate_deg must be positive.")
+        summary["decimate_deg"] = decimate_deg
+    jitter = None
+    if jitter_radius_deg is not None:
+        jitter = {"radius_deg": jitter_radius_deg, "replicas": jitter_replicas, "seed": jitter_seed}
+        summary["jitter"] = jitter
 
-    for country in iter_countries(data_dir):
-        pts = to_latlon_list(country)
-        res = check_never_sets(
-            pts,
-            visibility_limit_deg=limit,
-            decl_step_deg=decl_step,
-            hour_angle_step_deg=hour_step,
-        )
-        write_report(out_dir, country, res)
-        archive_witness(out_dir, country, res)
-        summary["countries"].append(
-            {
-                "id": country.id,
-                "name": country.name,
-                "pass": res.always_daylight_somewhere,
-                "worst_altitude_deg": res.witness.worst_max_altitude_deg,
-                "margin_deg": res.margin_altitude_deg,
-                "witness_decl_deg": res.witness.decl_deg,
-                "witness_hour_angle_deg": res.witness.hour_angle_deg,
-                "point_count": len(country.points),
-                "interpretation": "margin_deg >= 0 indicates the 'never sets' condition for the chosen visibility limit",
-            }
-        )
+    solve_kwargs: Dict[str, Any] = {
+        # One sweep per country, however many limits are requested.
+        "visibility_limit_deg": limits,
+        "decl_step_deg": decl_step,
+        "hour_angle_step_deg": hour_step,
+        "max_bytes": max_bytes,
+        "engine": engine,
+        "tolerance_deg": tolerance_deg,
+        "prune_dominated": prune_dominated,
+        "criticality": criticality,
+        "mode": mode,
+        "backend": backend,
+        "precision": precision,
+        "field_dtype": field_dtype,
+    }
+    # Incremental runs need to know what was solved before; default the cache into the output.
+    if incremental and cache_dir is None:
+        cache_dir = out_dir / ".cache"
+    # Decide-mode witnesses depend on the limit, so that mode bypasses the cache (and with it
+    # incremental skipping).
+    use_cache = cache_dir is not None and mode == "solve"
+    cache = ResultCache(cache_dir, max_bytes=cache_max_bytes) if use_cache else None
+
+    paths = territory_files(data_dir)
+    consolidated = output_layout != "files"
+    # The files layout returns entries in input order; consolidated layouts keep none in memory.
+    entries: List[Optional[Dict[str, Any]]] = [None] * (0 if consolidated else len(paths))
+    solved = 0
+    failures: List[Dict[str, Any]] = []
+    hits = 0
+    # Built once per batch. The grid engine reuses the full (D,3,H) Sun-vector array only when
+    # it fits the memory budget; otherwise blocks are computed on the fly, as in check_never_sets.
+    sun_grid = SunGrid(decl_step_deg=decl_step, hour_angle_step_deg=hour_step)
+    if engine == "grid" and (max_bytes is None or sun_grid.nbytes <= max_bytes):
+        sun_grid.materialize()
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and backend == "auto":
+        # Processes already use every core; a threaded kernel per worker would oversubscribe them.
+        solve_kwargs["backend"] = "numpy"
+    # Previous outputs can only be reused when they are separate files.
+    skip_rendered = incremental and not consolidated
+    tasks = _run_tasks(
+        paths,
+        out_dir,
+        solve_kwargs,
+        use_index,
+        workers,
+        cache,
+        incremental,
+        sun_grid,
+        subsets=subsets,
+        decimate_deg=decimate_deg,
+        skip_rendered=skip_rendered,
+        export_field=export_field,
+        jitter=jitter,
+    )
+    with OutputWriter(out_dir, layout=output_layout, max_pending=max_pending) as writer:
+        for i, outcome, exc in tasks:
+            if exc is not None:
+                # A bad territory is recorded and skipped rather than aborting the whole batch.
+                failures.append({"file": paths[i].name, "error": f"{type(exc).__name__}: {exc}"})
+                continue
+            entry, hit, outputs = outcome
+            writer.submit(entry["id"], outputs, entry)
+            if not consolidated:
+                entries[i] = entry
+            solved += 1
+            hits += hit
+    if consolidated:
+        del summary["countries"]
+        summary["country_count"] = solved
+    else:
+        summary["countries"] = [e for e in entries if e is not None]
+    if failures:
+        summary["failures"] = sorted(failures, key=lambda f: f["file"])
+    if cache is not None:
+        summary["cache"] = {"hits": hits, "misses": solved - hits}
+        cache.evict()
 
     (out_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
     return summary
@@ -61,14 +413,161 @@ def run_batch(
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Batch-check 'sun never sets' over country point sets.")
-    parser.add_argument("--data", required=True, help="Directory containing country JSON files.")
+    parser.add_argument("--data", required=True, help="Directory of territory files (.json, .geojson, .csv).")
     parser.add_argument("--out", required=True, help="Output directory.")
-    parser.add_argument("--limit", type=float, default=0.0, help="Visibility altitude threshold in degrees.")
+    parser.add_argument(
+        "--limit",
+        type=float,
+        nargs="+",
+        default=[0.0],
+        help="Visibility altitude threshold(s) in degrees; several limits share one sweep.",
+    )
     parser.add_argument("--decl-step", type=float, default=0.10, help="Declination step in degrees.")
     parser.add_argument("--hour-step", type=float, default=0.10, help="Hour-angle step in degrees.")
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Memory budget in bytes for each block of the declination x hour-angle sweep "
+        "(the shared Sun grid is only precomputed when it fits too).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="grid",
+        help=(
+            "'grid' sweeps the sampled grid; 'adaptive' certifies the continuous minimum by "
+            "branch-and-bound; 'envelope' is exact in hour angle on the sampled declinations."
+        ),
+    )
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default="solve",
+        help="'decide' only settles PASS/FAIL, stopping early; margins are then not the worst case.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="auto",
+        help="Grid sweep kernel: 'numba' (fused, parallel; optional dependency), 'numpy', or 'auto' "
+        "(numba when installed; numpy in --workers pools). Results are identical.",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        default="float64",
+        help="'mixed' sweeps in float32 and re-verifies near the minimum in float64 (same results, grid engine).",
+    )
+    parser.add_argument(
+        "--decimate",
+        type=float,
+        default=None,
+        help="Decimate boundaries/point runs to one point per this many degrees of arc "
+        "(lowers the worst-case max altitude by at most that much).",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE_DEG,
+        help="Target width in degrees of the certified altitude interval (adaptive engine).",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Skip points that are never the best point for any Sun direction in the band.",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Answer max-dot queries through a spherical cap tree (for very large point sets).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (0 = one per CPU core).",
+    )
+    parser.add_argument("--cache", default=None, help="Directory of the content-addressed result cache.")
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES,
+        help="Size above which least-recently-used cache entries are evicted.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-render territories whose inputs changed (uses <out>/.cache unless --cache is given).",
+    )
+    parser.add_argument(
+        "--criticality",
+        action="store_true",
+        help="Rank points by the worst case without each of them (grid engine, one sweep).",
+    )
+    parser.add_argument(
+        "--subsets",
+        action="store_true",
+        help="Write the minimal sets of components that still pass, per limit, to subsets.json.",
+    )
+    parser.add_argument(
+        "--output-layout",
+        choices=LAYOUTS,
+        default="files",
+        help="'files' writes <out>/<id>/...; 'jsonl' and 'zip' write one results.jsonl/results.zip "
+        "(per-country summary entries then go to summary.jsonl only).",
+    )
+    parser.add_argument(
+        "--export-field",
+        action="store_true",
+        help="Write each territory's max-dot and argmax-point fields as .npy files to <out>/<id>/field/ "
+        "(plain grid sweep).",
+    )
+    parser.add_argument(
+        "--field-dtype",
+        choices=FIELD_DTYPES,
+        default="float64",
+        help="Storage type of the exported max-dot field.",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=None,
+        help="Coordinate uncertainty radius in degrees of arc: report margin quantiles and PASS "
+        "probability over jittered replicas.",
+    )
+    parser.add_argument("--jitter-replicas", type=int, default=1000, help="Number of jittered replicas.")
+    parser.add_argument("--jitter-seed", type=int, default=0, help="Seed of the jitter replicas.")
     args = parser.parse_args()
 
-    run_batch(args.data, args.out, limit=args.limit, decl_step=args.decl_step, hour_step=args.hour_step)
+    run_batch(
+        args.data,
+        args.out,
+        limit=args.limit,
+        decl_step=args.decl_step,
+        hour_step=args.hour_step,
+        max_bytes=args.max_bytes,
+        engine=args.engine,
+        tolerance_deg=args.tolerance,
+        prune_dominated=args.prune,
+        use_index=args.index,
+        workers=args.workers,
+        cache_dir=args.cache,
+        cache_max_bytes=args.cache_max_bytes,
+        incremental=args.incremental,
+        criticality=args.criticality,
+        subsets=args.subsets,
+        mode=args.mode,
+        backend=args.backend,
+        precision=args.precision,
+        decimate_deg=args.decimate,
+        output_layout=args.output_layout,
+        export_field=args.export_field,
+        field_dtype=args.field_dtype,
+        jitter_radius_deg=args.jitter,
+        jitter_replicas=args.jitter_replicas,
+        jitter_seed=args.jitter_seed,
+    )
 
 
 if __name__ == "__main__":
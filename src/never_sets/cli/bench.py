@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.geometry import SunGrid
+from ..core.solver import check_never_sets
+from ..io.country_loader import to_country_arrays
+from ..models.country import CountryArrays, CountryDef, CountryPoint
+from .batch import run_batch
+
+DEFAULT_HISTORY = "bench_history.jsonl"
+DEFAULT_THRESHOLD = 0.10
+# Wall times below this are timer noise and never flagged.
+DEFAULT_NOISE_FLOOR_S = 0.01
+METRICS = ("wall_s", "peak_rss_mb")
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    # "solve": one check_never_sets call (grid engine); "envelope": the same with the envelope
+    # engine; "batch": run_batch over territory files.
+    kind: str
+    points: int
+    step_deg: float
+    territories: int = 1
+
+
+def _solve(points: int, step: float) -> BenchCase:
+    return BenchCase(f"solve-K{points}-step{step:g}", "solve", points, step)
+
+
+def _envelope(points: int, step: float) -> BenchCase:
+    # Paired with _solve(points, step): the same declinations, solved exactly in hour angle.
+    return BenchCase(f"envelope-K{points}-step{step:g}", "envelope", points, step)
+
+
+def _batch(territories: int, points: int, step: float) -> BenchCase:
+    return BenchCase(f"batch-T{territories}-K{points}-step{step:g}", "batch", points, step, territories)
+
+
+SUITES: Dict[str, Tuple[BenchCase, ...]] = {
+    "quick": (
+        _solve(5, 1.0),
+        _solve(1_000, 0.5),
+        _solve(100_000, 1.0),
+        _solve(50, 0.1),
+        _solve(500, 0.1),
+        _envelope(500, 0.1),
+        _batch(20, 50, 1.0),
+    ),
+    "full": (
+        _solve(5, 1.0),
+        _solve(5, 0.1),
+        _solve(5, 0.01),
+        _solve(100, 0.1),
+        _envelope(100, 0.1),
+        _solve(1_000, 0.1),
+        _envelope(1_000, 0.1),
+        _envelope(10_000, 0.1),
+        _solve(10_000, 0.5),
+        _solve(100_000, 1.0),
+        _batch(1, 50, 0.5),
+        _batch(100, 50, 1.0),
+        _batch(5_000, 20, 1.0),
+    ),
+}
+
+
+def synthetic_territory(points: int, *, seed: int = 0, territory_id: str = "synthetic") -> CountryDef:
+    """A deterministic territory: ``points`` spread over a few regional clusters on the globe.
+
+    Cluster centres are uniform on the sphere and each point lies within a few degrees of its
+    centre, like the mainland-plus-overseas shape of the sample countries.
+    """
+    rng = np.random.default_rng(seed)
+    clusters = min(points, int(rng.integers(2, 7)))
+    centres = rng.normal(size=(clusters, 3))
+    centres /= np.linalg.norm(centres, axis=1)[:, None]
+    member = np.arange(points) % clusters
+    spread = rng.normal(scale=np.radians(3.0), size=(points, 3))
+    v = centres[member] + spread
+    v /= np.linalg.norm(v, axis=1)[:, None]
+    lat = np.degrees(np.arcsin(np.clip(v[:, 2], -1.0, 1.0)))
+    lon = np.degrees(np.arctan2(v[:, 1], v[:, 0]))
+    return CountryDef(
+        id=territory_id,
+        name=territory_id,
+        points=[
+            CountryPoint(label=f"p{i}", lat=float(a), lon=float(b), component=f"c{m}")
+            for i, (a, b, m) in enumerate(zip(lat.tolist(), lon.tolist(), member.tolist()))
+        ],
+    )
+
+
+def _write_territories(data_dir: Path, case: BenchCase) -> None:
+    for t in range(case.territories):
+        country = synthetic_territory(case.points, seed=t, territory_id=f"t{t:05d}")
+        payload = {
+            "id": country.id,
+            "name": country.name,
+            "points": [{"label": p.label, "lat": p.lat, "lon": p.lon, "component": p.component} for p in country.points],
+        }
+        (data_dir / f"{country.id}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux (bytes on macOS).
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def run_case(case: BenchCase, repeat: int = 3) -> Dict[str, Any]:
+    """Time ``case`` (best of ``repeat`` runs after setup) and report wall time, peak RSS and
+    throughput in grid cells x points per second (for the envelope engine, the cells of the
+    grid of the same step, so the two throughputs compare directly)."""
+    cells = int(np.prod(SunGrid(decl_step_deg=case.step_deg, hour_angle_step_deg=case.step_deg).shape))
+    times = []
+    with tempfile.TemporaryDirectory(prefix="never_sets_bench_") as tmp:
+        if case.kind in ("solve", "envelope"):
+            country: CountryArrays = to_country_arrays(synthetic_territory(case.points))
+            engine = "grid" if case.kind == "solve" else "envelope"
+            kwargs = dict(decl_step_deg=case.step_deg, hour_angle_step_deg=case.step_deg, engine=engine)
+            check_never_sets(country, decl_step_deg=5.0, hour_angle_step_deg=5.0, engine=engine)  # warm-up
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                check_never_sets(country, **kwargs)
+                times.append(time.perf_counter() - t0)
+        elif case.kind == "batch":
+            data = Path(tmp) / "data"
+            data.mkdir()
+            _write_territories(data, case)
+            for r in range(repeat):
+                t0 = time.perf_counter()
+                run_batch(data, Path(tmp) / f"out{r}", limit=0.0, decl_step=case.step_deg, hour_step=case.step_deg)
+                times.append(time.perf_counter() - t0)
+        else:
+            raise ValueError(f"unknown benchmark kind {case.kind!r}.")
+    wall = min(times)
+    work = cells * case.points * case.territories
+    return {
+        **asdict(case),
+        "cells": cells,
+        "wall_s": wall,
+        "peak_rss_mb": _peak_rss_mb(),
+        "throughput_cell_points_per_s": work / wall if wall > 0 else None,
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    try:
+        import numba
+
+        numba_version: Optional[str] = numba.__version__
+    except ImportError:
+        numba_version = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(
+    cases: Sequence[BenchCase], *, suite: str = "custom", repeat: int = 3, isolate: bool = True
+) -> Dict[str, Any]:
+    """Run ``cases`` and return one history record.
+
+    With ``isolate`` each case runs in its own freshly spawned process, so its peak RSS is
+    its own rather than the high-water mark of everything run before it.
+    """
+    results = []
+    for case in cases:
+        if isolate:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                results.append(pool.submit(run_case, case, repeat).result())
+        else:
+            results.append(run_case(case, repeat))
+        print(
+            f"{case.name}: {results[-1]['wall_s']:.4f} s, {results[-1]['peak_rss_mb']:.1f} MB peak RSS",
+            file=sys.stderr,
+        )
+    return {
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "suite": suite,
+        "repeat": repeat,
+        "environment": _environment(),
+        "cases": results,
+    }
+
+
+def append_history(path: str | Path, record: Dict[str, Any]) -> None:
+    # One JSON record per line, so concurrent or interrupted runs never corrupt earlier ones.
+    with Path(path).open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def load_history(path: str | Path) -> List[Dict[str, Any]]:
+    with Path(path).open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_runs(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    noise_floor_s: float = DEFAULT_NOISE_FLOOR_S,
+) -> List[Dict[str, Any]]:
+    """Per case and metric present in both runs: relative change and whether it regressed.
+
+    A metric regresses when ``current > baseline * (1 + threshold)``; lower is better for
+    every metric compared (wall time, peak RSS). Wall times under ``noise_floor_s`` in the
+    current run are reported but not flagged.
+    """
+    before = {c["name"]: c for c in baseline["cases"]}
+    rows = []
+    for case in current["cases"]:
+        old = before.get(case["name"])
+        if old is None:
+            continue
+        for metric in METRICS:
+            a, b = old.get(metric), case.get(metric)
+            if not a or b is None:
+                continue
+            change = b / a - 1.0
+            rows.append(
+                {
+                    "case": case["name"],
+                    "metric": metric,
+                    "baseline": a,
+                    "current": b,
+                    "change": change,
+                    "regression": change > threshold and not (metric == "wall_s" and b < noise_floor_s),
+                }
+            )
+    return rows
+
+
+def _print_comparison(rows: List[Dict[str, Any]], threshold: float) -> None:
+    print("| Case | Metric | Baseline | Current | Change |")
+    print("|---|---|---:|---:|---:|")
+    for r in rows:
+        flag = " REGRESSION" if r["regression"] else ""
+        print(f"| {r['case']} | {r['metric']} | {r['baseline']:.4g} | {r['current']:.4g} | {r['change']:+.1%}{flag} |")
+    regressions = sum(r["regression"] for r in rows)
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%}.")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the solver and batch pipeline; track regressions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run a benchmark suite and append the results to the history.")
+    run.add_argument("--suite", choices=sorted(SUITES), default="quick", help="Set of benchmark cases.")
+    run.add_argument("--cases", nargs="+", default=None, help="Only run the cases with these names.")
+    run.add_argument("--repeat", type=int, default=3, help="Timed repetitions per case (best is kept).")
+    run.add_argument("--history", default=DEFAULT_HISTORY, help="JSON Lines history file to append to.")
+    run.add_argument("--no-isolate", action="store_true", help="Run cases in this process (peak RSS accumulates).")
+
+    cmp = sub.add_parser("compare", help="Compare two runs of the history; exit 1 on regressions.")
+    cmp.add_argument("--history", default=DEFAULT_HISTORY, help="JSON Lines history file.")
+    cmp.add_argument(
+        "--noise-floor",
+        type=float,
+        default=DEFAULT_NOISE_FLOOR_S,
+        help="Wall times in seconds below which slowdowns are not flagged.",
+    )
+    cmp.add_argument("--baseline", type=int, default=-2, help="Index of the baseline run (default: second to last).")
+    cmp.add_argument("--current", type=int, default=-1, help="Index of the run to check (default: last).")
+    cmp.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative slowdown, e.g. 0.1 for 10%%."
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        cases = SUITES[args.suite]
+        if args.cases:
+            known = {c.name: c for suite in SUITES.values() for c in suite}
+            unknown = [name for name in args.cases if name not in known]
+            if unknown:
+                parser.error(f"unknown case(s): {', '.join(unknown)}")
+            cases = tuple(known[name] for name in args.cases)
+        record = run_suite(cases, suite=args.suite, repeat=args.repeat, isolate=not args.no_isolate)
+        append_history(args.history, record)
+        return 0
+
+    history = load_history(args.history)
+    try:
+        baseline, current = history[args.baseline], history[args.current]
+    except IndexError:
+        parser.error(f"{args.history} has {len(history)} run(s); need runs {args.baseline} and {args.current}.")
+    rows = compare_runs(baseline, current, threshold=args.threshold, noise_floor_s=args.noise_floor)
+    _print_comparison(rows, args.threshold)
+    return 1 if any(r["regression"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from ..core.backends import BACKENDS
+from ..core.ephemeris import check_never_sets_over_time
+from ..core.solver import DEFAULT_MAX_BYTES
+from ..io.stream_loader import load_territory
+from ..models.result import EphemerisResult
+
+
+def ephemeris_payload(territory_id: str, res: EphemerisResult) -> Dict[str, Any]:
+    results = res.result if isinstance(res.result, list) else [res.result]
+    w = results[0].witness
+    return {
+        "id": territory_id,
+        "worst_time_utc": res.worst_time_utc.isoformat(),
+        "instants": res.instants,
+        "step_seconds": res.step_seconds,
+        "worst_altitude_deg": w.worst_max_altitude_deg,
+        "sun_decl_deg": w.decl_deg,
+        "sun_hour_angle_deg": w.hour_angle_deg,
+        "best_point_indices": list(w.best_point_indices),
+        "verdicts": [
+            {
+                "visibility_limit_deg": r.limit_altitude_deg,
+                "pass": r.always_daylight_somewhere,
+                "margin_deg": r.margin_altitude_deg,
+            }
+            for r in results
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Worst real instant of a date range for one territory, from a low-precision solar ephemeris."
+    )
+    parser.add_argument("--country", required=True, help="Territory file (.json, .geojson, .csv).")
+    parser.add_argument("--start", required=True, help="First instant, ISO 8601 (UTC unless an offset is given).")
+    parser.add_argument("--end", required=True, help="Last instant, ISO 8601.")
+    parser.add_argument("--step", type=float, default=1.0, help="Time step in seconds.")
+    parser.add_argument("--limit", type=float, nargs="+", default=[0.0], help="Visibility altitude threshold(s) in degrees.")
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Memory budget in bytes for each chunk of instants.",
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="auto", help="Max-dot reduction kernel.")
+    parser.add_argument("--out", default=None, help="Also write the result as JSON to this file.")
+    args = parser.parse_args()
+
+    country = load_territory(args.country)
+    res = check_never_sets_over_time(
+        country,
+        start=args.start,
+        end=args.end,
+        step_seconds=args.step,
+        visibility_limit_deg=args.limit,
+        max_bytes=args.max_bytes,
+        backend=args.backend,
+    )
+    payload = ephemeris_payload(country.id, res)
+    print(
+        f"{country.id}: worst instant {payload['worst_time_utc']} ({res.instants} instants), "
+        f"max altitude {payload['worst_altitude_deg']:.6f}°"
+    )
+    for v in payload["verdicts"]:
+        print(f"  limit {v['visibility_limit_deg']:g}°: {'PASS' if v['pass'] else 'FAIL'} (margin {v['margin_deg']:+.6f}°)")
+    if args.out:
+        Path(args.out).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ..core.backends import BACKENDS
+from ..core.parameter_sweep import parameter_sweep
+from ..core.solver import DEFAULT_MAX_BYTES
+from ..io.stream_loader import load_territory
+from ..models.result import ParameterSweep
+
+
+def sweep_payload(territory_id: str, sweep: ParameterSweep) -> Dict[str, Any]:
+    return {
+        "id": territory_id,
+        "obliquities_deg": list(sweep.obliquities_deg),
+        "visibility_limits_deg": list(sweep.limits_deg),
+        "verdicts": [
+            {
+                "obliquity_deg": obliquity,
+                "worst_altitude_deg": w.worst_max_altitude_deg,
+                "witness_decl_deg": w.decl_deg,
+                "witness_hour_angle_deg": w.hour_angle_deg,
+                "pass": passes,
+                "margin_deg": margins,
+            }
+            for obliquity, w, passes, margins in zip(
+                sweep.obliquities_deg, sweep.witnesses, sweep.passes.tolist(), sweep.margins_deg.tolist()
+            )
+        ],
+    }
+
+
+def render_table(sweep: ParameterSweep) -> str:
+    lines = [
+        "| Obliquity | Worst altitude | " + " | ".join(f"{limit:g}°" for limit in sweep.limits_deg) + " |",
+        "|---:|---:|" + "---|" * len(sweep.limits_deg),
+    ]
+    for obliquity, w, passes, margins in zip(
+        sweep.obliquities_deg, sweep.witnesses, sweep.passes.tolist(), sweep.margins_deg.tolist()
+    ):
+        cells = [f"{'PASS' if ok else 'FAIL'} ({m:+.3f}°)" for ok, m in zip(passes, margins)]
+        lines.append(f"| {obliquity:.4f}° | {w.worst_max_altitude_deg:.6f}° | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def _obliquities(values: List[float], ranges: List[List[float]]) -> List[float]:
+    out = list(values)
+    for start, stop, step in ranges:
+        if step <= 0:
+            raise ValueError("--obliquity-range step must be positive.")
+        # Inclusive of stop; rounding keeps 22.1 + 3 * 0.1 from printing as 22.400000000000002.
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        out.extend(round(start + k * step, 10) for k in range(max(count, 0)))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Verdict table over obliquity x visibility limit for one territory, from a single sweep."
+    )
+    parser.add_argument("--country", required=True, help="Territory file (.json, .geojson, .csv).")
+    parser.add_argument("--obliquity", type=float, nargs="+", default=[], help="Obliquities in degrees.")
+    parser.add_argument(
+        "--obliquity-range",
+        type=float,
+        nargs=3,
+        action="append",
+        default=[],
+        metavar=("START", "STOP", "STEP"),
+        help="Inclusive obliquity range in degrees, e.g. 22.1 24.5 0.01 (repeatable).",
+    )
+    parser.add_argument("--limit", type=float, nargs="+", default=[0.0], help="Visibility altitude threshold(s) in degrees.")
+    parser.add_argument("--decl-step", type=float, default=0.10, help="Declination step in degrees.")
+    parser.add_argument("--hour-step", type=float, default=0.10, help="Hour-angle step in degrees.")
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Memory budget in bytes for each block of the declination x hour-angle sweep.",
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="auto", help="Grid sweep kernel.")
+    parser.add_argument("--out", default=None, help="Also write the verdicts as JSON to this file.")
+    args = parser.parse_args()
+
+    obliquities = _obliquities(args.obliquity, args.obliquity_range)
+    if not obliquities:
+        parser.error("give --obliquity and/or --obliquity-range.")
+    country = load_territory(args.country)
+    sweep = parameter_sweep(
+        country,
+        obliquities_deg=obliquities,
+        visibility_limits_deg=args.limit,
+        decl_step_deg=args.decl_step,
+        hour_angle_step_deg=args.hour_step,
+        max_bytes=args.max_bytes,
+        backend=args.backend,
+    )
+    print(render_table(sweep))
+    if args.out:
+        Path(args.out).write_text(json.dumps(sweep_payload(country.id, sweep), indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+# Compiled kernels of the optional Numba backend. Importing this module needs numba; the
+# backends module only imports it on first use, and falls back to NumPy when it fails. The
+# kernels live at module level so Numba's on-disk cache is keyed to this file (and moves to
+# the user-wide cache directory when the installed package is read-only).
+import numba
+import numpy as np
+
+
+@numba.njit("void(f8[:, ::1], f8[:, :, ::1], f8[::1], i8[::1])", parallel=True, cache=True)
+def row_min_max(N, sun, values, idx):
+    K = N.shape[0]
+    for r in numba.prange(sun.shape[0]):
+        best = np.inf
+        best_j = 0
+        for j in range(sun.shape[2]):
+            sx = sun[r, 0, j]
+            sy = sun[r, 1, j]
+            sz = sun[r, 2, j]
+            m = -np.inf
+            for k in range(K):
+                v = N[k, 0] * sx + N[k, 1] * sy
+                v = v + N[k, 2] * sz
+                if v > m:
+                    m = v
+            # Strict comparison keeps the first hour, like np.argmin.
+            if m < best:
+                best = m
+                best_j = j
+        values[r] = best
+        idx[r] = best_j
+
+
+@numba.njit("void(f8[:, ::1], i8[::1], f8[:, :, ::1], f8[:, ::1], i8[:, ::1])", parallel=True, cache=True)
+def row_min_max_many(N, bounds, sun, values, idx):
+    # row_min_max for territories stacked in N, territory t in rows bounds[t]:bounds[t + 1];
+    # values and idx are (d,T). Four hours are scanned together as independent max chains
+    # (the single chain of row_min_max is latency-bound); each chain keeps the same summation
+    # and comparisons, so every column matches a separate row_min_max call bit for bit.
+    H = sun.shape[2]
+    for r in numba.prange(sun.shape[0]):
+        for t in range(bounds.size - 1):
+            best = np.inf
+            best_j = 0
+            j = 0
+            while j < H:
+                lanes = min(4, H - j)
+                m0 = -np.inf
+                m1 = -np.inf
+                m2 = -np.inf
+                m3 = -np.inf
+                # Past the last hour, lanes reuse hour j; their maxima are discarded below.
+                j1 = j + 1 if lanes > 1 else j
+                j2 = j + 2 if lanes > 2 else j
+                j3 = j + 3 if lanes > 3 else j
+                for k in range(bounds[t], bounds[t + 1]):
+                    x = N[k, 0]
+                    y = N[k, 1]
+                    z = N[k, 2]
+                    v0 = x * sun[r, 0, j] + y * sun[r, 1, j]
+                    v0 = v0 + z * sun[r, 2, j]
+                    v1 = x * sun[r, 0, j1] + y * sun[r, 1, j1]
+                    v1 = v1 + z * sun[r, 2, j1]
+                    v2 = x * sun[r, 0, j2] + y * sun[r, 1, j2]
+                    v2 = v2 + z * sun[r, 2, j2]
+                    v3 = x * sun[r, 0, j3] + y * sun[r, 1, j3]
+                    v3 = v3 + z * sun[r, 2, j3]
+                    if v0 > m0:
+                        m0 = v0
+                    if v1 > m1:
+                        m1 = v1
+                    if v2 > m2:
+                        m2 = v2
+                    if v3 > m3:
+                        m3 = v3
+                # Strict comparisons in hour order keep the first hour, like np.argmin.
+                if m0 < best:
+                    best = m0
+                    best_j = j
+                if lanes > 1 and m1 < best:
+                    best = m1
+                    best_j = j + 1
+                if lanes > 2 and m2 < best:
+                    best = m2
+                    best_j = j + 2
+                if lanes > 3 and m3 < best:
+                    best = m3
+                    best_j = j + 3
+                j += 4
+            values[r, t] = best
+            idx[r, t] = best_j
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+COARSE_STEP_DEG = 1.0
+DEFAULT_TOLERANCE_DEG = 1e-6
+DEFAULT_MAX_CELLS = 1 << 20
+_ROUNDING_SLACK = 1e-15
+
+
+def _altitude(dot: float) -> float:
+    return math.degrees(math.asin(min(1.0, max(-1.0, dot))))
+
+
+def _evaluate_cells(
+    N: np.ndarray,
+    dc: np.ndarray,
+    hc: np.ndarray,
+    a: float,
+    b: float,
+    chunk: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Returns (max_i n_i·s at each centre, certified lower bound of max_i n_i·s over each cell).
+    # Each f_i = n_i·s(δ,H) has all second partials bounded by 1 in magnitude, so on a cell of
+    # half-widths (a,b) around the centre: f_i >= f_i(c) - |∂δ f_i| a - |∂H f_i| b - (a + b)² / 2.
+    values = np.empty(dc.size)
+    lower = np.empty(dc.size)
+    quad = 0.5 * (a + b) ** 2
+    for start in range(0, dc.size, chunk):
+        sl = slice(start, start + chunk)
+        cd, sd = np.cos(dc[sl]), np.sin(dc[sl])
+        ch, sh = np.cos(hc[sl]), np.sin(hc[sl])
+        s = np.stack([cd * ch, cd * sh, sd], axis=1)
+        s_decl = np.stack([-sd * ch, -sd * sh, cd], axis=1)
+        s_hour = np.stack([-cd * sh, cd * ch, np.zeros_like(cd)], axis=1)
+        dots = s @ N.T  # (M,K)
+        bound = dots - np.abs(s_decl @ N.T) * a - np.abs(s_hour @ N.T) * b - quad
+        values[sl] = dots.max(axis=1)
+        lower[sl] = bound.max(axis=1)
+    return values, lower
+
+
+def adaptive_min_max_dot(
+    N: np.ndarray,
+    *,
+    obliquity_deg: float,
+    tolerance_deg: float = DEFAULT_TOLERANCE_DEG,
+    max_cells: int = DEFAULT_MAX_CELLS,
+    max_bytes: int = 64 * 1024 * 1024,
+) -> Tuple[float, float, float, Tuple[float, float]]:
+    """Branch-and-bound minimum of ``max_i n_i·s`` over the achievable Sun directions.
+
+    Returns ``(decl_deg, hour_angle_deg, worst_max_dot, (lower, upper))`` where the true
+    minimum over the continuous band is certified to lie in ``[lower, upper]`` and ``upper``
+    is attained at the returned direction. Refinement stops once the interval is narrower
+    than ``tolerance_deg`` in altitude, or before the active cell count would exceed
+    ``max_cells`` (the interval is then still certified, only wider).
+    """
+    eps = math.radians(obliquity_deg)
+    nd = max(1, math.ceil(2.0 * obliquity_deg / COARSE_STEP_DEG))
+    nh = max(1, math.ceil(360.0 / COARSE_STEP_DEG))
+    a = eps / nd
+    b = math.pi / nh
+    dc = -eps + a * (2.0 * np.arange(nd) + 1.0)
+    hc = b * (2.0 * np.arange(nh) + 1.0)
+    dc, hc = (g.ravel() for g in np.meshgrid(dc, hc, indexing="ij"))
+
+    chunk = max(1, max_bytes // (4 * N.shape[0] * np.dtype(float).itemsize))
+    upper = math.inf
+    best_decl = best_hour = 0.0
+    while True:
+        values, lower_cells = _evaluate_cells(N, dc, hc, a, b, chunk)
+        i = int(np.argmin(values))
+        if values[i] < upper:
+            upper = float(values[i])
+            best_decl, best_hour = float(dc[i]), float(hc[i])
+
+        keep = lower_cells <= upper
+        dc, hc, lower_cells = dc[keep], hc[keep], lower_cells[keep]
+        lower = min(upper, float(lower_cells.min()) - _ROUNDING_SLACK) if dc.size else upper
+        if _altitude(upper) - _altitude(lower) <= tolerance_deg:
+            break
+
+        split_decl = a > 0.0
+        factor = 4 if split_decl else 2
+        if dc.size * factor > max_cells:
+            break
+        b /= 2.0
+        if split_decl:
+            a /= 2.0
+            dc = np.concatenate([dc - a, dc - a, dc + a, dc + a])
+            hc = np.concatenate([hc - b, hc + b, hc - b, hc + b])
+        else:
+            dc = np.concatenate([dc, dc])
+            hc = np.concatenate([hc - b, hc + b])
+
+    return math.degrees(best_decl), math.degrees(best_hour) % 360.0, upper, (lower, upper)
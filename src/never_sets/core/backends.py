@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+BACKENDS = ("auto", "numpy", "numba")
+
+
+def _block_dots(N: np.ndarray, sun: np.ndarray) -> np.ndarray:
+    # Fixed summation order ((x*sx + y*sy) + z*sz) so every block shape rounds identically.
+    out = np.multiply(N[None, :, 0, None], sun[:, None, 0, :])
+    tmp = np.multiply(N[None, :, 1, None], sun[:, None, 1, :])
+    out += tmp
+    np.multiply(N[None, :, 2, None], sun[:, None, 2, :], out=tmp)
+    out += tmp
+    return out  # (d,K,h)
+
+
+def _row_min(max_dots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Per row of a (d,h) block: min over hours and the first hour index attaining it.
+    idx = np.argmin(max_dots, axis=1)
+    return max_dots[np.arange(max_dots.shape[0]), idx], idx
+
+
+class NumpyBackend:
+    """Reference backend: materialises each (d,K,h) block of dots, then reduces it."""
+
+    name = "numpy"
+
+    def points_per_cell(self, K: int) -> int:
+        # Points' worth of float pairs held per grid cell, for sizing blocks to the budget.
+        return K
+
+    def row_min_max(self, N: np.ndarray, sun: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per declination row of a (d,3,h) Sun block: min over hours of max_i n_i·s, first hour index."""
+        return _row_min(_block_dots(N, sun).max(axis=1))
+
+    def row_min_max_many(self, N: np.ndarray, starts: np.ndarray, sun: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """``row_min_max`` for territories stacked in N from rows ``starts``; (d,T) results."""
+        bounds = np.append(starts, N.shape[0])
+        out = [self.row_min_max(N[a:b], sun) for a, b in zip(bounds[:-1], bounds[1:])]
+        return np.stack([v for v, _ in out], axis=1), np.stack([i for _, i in out], axis=1)
+
+
+class NumbaBackend(NumpyBackend):
+    """Fused kernel: dot, max over points and argmin over hours in one pass, no (d,K,h) array.
+
+    Declination rows run in parallel. Each dot is summed as ((x*sx + y*sy) + z*sz) without
+    fast-math, so there is no reassociation or FMA contraction and values match the NumPy
+    backend bit for bit.
+    """
+
+    name = "numba"
+
+    def __init__(self, kernel, kernel_many) -> None:
+        self._kernel = kernel
+        self._kernel_many = kernel_many
+
+    def points_per_cell(self, K: int) -> int:
+        # Only a contiguous copy of the Sun block (3 floats per cell) is held.
+        return 2
+
+    def row_min_max(self, N: np.ndarray, sun: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.empty(sun.shape[0])
+        idx = np.empty(sun.shape[0], dtype=np.int64)
+        self._kernel(np.ascontiguousarray(N, dtype=np.float64), np.ascontiguousarray(sun, dtype=np.float64), values, idx)
+        return values, idx.astype(np.intp)
+
+    def row_min_max_many(self, N: np.ndarray, starts: np.ndarray, sun: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.empty((sun.shape[0], starts.size))
+        idx = np.empty((sun.shape[0], starts.size), dtype=np.int64)
+        bounds = np.append(starts, N.shape[0]).astype(np.int64)
+        self._kernel_many(
+            np.ascontiguousarray(N, dtype=np.float64), bounds, np.ascontiguousarray(sun, dtype=np.float64), values, idx
+        )
+        return values, idx.astype(np.intp)
+
+
+@lru_cache(maxsize=None)
+def _numba_backend() -> Optional[NumbaBackend]:
+    # None when numba is missing or the kernel fails to compile; callers fall back to NumPy.
+    try:
+        from . import _numba_kernels
+    except Exception:
+        return None
+    return NumbaBackend(_numba_kernels.row_min_max, _numba_kernels.row_min_max_many)
+
+
+_NUMPY = NumpyBackend()
+
+
+def get_backend(name: str = "auto") -> NumpyBackend:
+    """Resolve a backend name; ``"auto"`` prefers the fused Numba kernel and falls back to NumPy."""
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}.")
+    if name == "numpy":
+        return _NUMPY
+    fused = _numba_backend()
+    if fused is not None:
+        return fused
+    if name == "numba":
+        raise ValueError("backend 'numba' needs the optional numba package.")
+    return _NUMPY
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+from .geometry import SunGrid
+from .point_index import fixed_order_dots
+
+# Level-0 tiles span about this many degrees in each direction.
+COARSE_TILE_DEG = 8.0
+# Widens tile radii so rounding in the bound can never certify a failing cell.
+_BOUND_SLACK = 1e-12
+
+
+def _passes(values: np.ndarray, limit_dot: float) -> np.ndarray:
+    # Vectorised form of coverage_result's test: dot > limit_dot or math.isclose(dot, limit_dot, abs_tol=1e-15).
+    tol = np.maximum(1e-9 * np.maximum(np.abs(values), abs(limit_dot)), 1e-15)
+    return (values > limit_dot) | (np.abs(values - limit_dot) <= tol)
+
+
+def _max_dots(N: np.ndarray, grid: SunGrid, di: np.ndarray, hi: np.ndarray, max_bytes: int) -> np.ndarray:
+    # max_i n_i·s at grid cells (di, hi), with the same products and summation order as a sweep.
+    out = np.empty(di.size)
+    step = max(1, max_bytes // (2 * N.shape[0] * 8))
+    for start in range(0, di.size, step):
+        d, h = di[start : start + step], hi[start : start + step]
+        cd = grid.cos_decl[d]
+        S = np.stack([cd * grid.cos_hour[h], cd * grid.sin_hour[h], grid.sin_decl[d]], axis=1)
+        out[start : start + step] = fixed_order_dots(N, S).max(axis=1)
+    return out
+
+
+def _seed_cell(N: np.ndarray, grid: SunGrid) -> Tuple[int, int]:
+    # Grid cell nearest the antipode of the points' centroid, the likeliest place to fail.
+    c = -N.mean(axis=0)
+    norm = float(np.linalg.norm(c))
+    if norm < 1e-12:
+        return grid.shape[0] // 2, 0
+    decl = math.degrees(math.asin(float(np.clip(c[2] / norm, -1.0, 1.0))))
+    hour = math.degrees(math.atan2(c[1], c[0])) % 360.0
+    d = int(np.argmin(np.abs(grid.decls - decl)))
+    h = int(round(hour / grid.hour_angle_step_deg)) % grid.shape[1]
+    return d, h
+
+
+def decide_min_max_dot(
+    N: np.ndarray,
+    grid: SunGrid,
+    limit_dot: float,
+    *,
+    max_bytes: int,
+) -> Tuple[bool, int, int, float]:
+    """Decide whether every grid cell keeps ``max_i n_i·s`` at or above ``limit_dot``.
+
+    Returns ``(passes, decl_idx, hour_idx, value)``. On FAIL the cell is the first failing
+    one found; on PASS it is the lowest cell evaluated. The verdict equals that of a full
+    grid sweep, but most cells are never evaluated: tiles of the index grid are checked at
+    one representative cell, and a tile is certified once that value minus the tile's
+    angular radius clears the limit (|n·s - n·s'| <= |s - s'|); other tiles are split.
+    """
+    D, H = grid.shape
+    d0, h0 = _seed_cell(N, grid)
+    seed = _max_dots(N, grid, np.array([d0]), np.array([h0]), max_bytes)[0]
+    if not _passes(np.array([seed]), limit_dot)[0]:
+        return False, d0, h0, float(seed)
+    best = (float(seed), d0, h0)
+
+    step_d = math.radians(grid.decl_step_deg)
+    step_h = math.radians(grid.hour_angle_step_deg)
+    td = max(1, int(COARSE_TILE_DEG / grid.decl_step_deg))
+    th = max(1, int(COARSE_TILE_DEG / grid.hour_angle_step_deg))
+    da, ha = np.meshgrid(np.arange(0, D, td), np.arange(0, H, th), indexing="ij")
+    # Active tiles as half-open index ranges [a0, a1) x [b0, b1).
+    a0, b0 = da.ravel(), ha.ravel()
+    a1, b1 = np.minimum(a0 + td, D), np.minimum(b0 + th, H)
+    while a0.size:
+        rd, rh = (a0 + a1 - 1) // 2, (b0 + b1 - 1) // 2
+        values = _max_dots(N, grid, rd, rh, max_bytes)
+        ok = _passes(values, limit_dot)
+        if not ok.all():
+            i = int(np.argmin(np.where(ok, np.inf, values)))
+            return False, int(rd[i]), int(rh[i]), float(values[i])
+        i = int(np.argmin(values))
+        if values[i] < best[0]:
+            best = (float(values[i]), int(rd[i]), int(rh[i]))
+
+        radius = np.maximum(rd - a0, a1 - 1 - rd) * step_d + np.maximum(rh - b0, b1 - 1 - rh) * step_h
+        single = (a1 - a0 == 1) & (b1 - b0 == 1)
+        open_ = ~single & (values - radius - _BOUND_SLACK <= limit_dot)
+        a0, a1, b0, b1 = a0[open_], a1[open_], b0[open_], b1[open_]
+        # Split each open tile in half along both axes (an axis of length 1 is not split).
+        am, bm = (a0 + a1 + 1) // 2, (b0 + b1 + 1) // 2
+        halves_a = [(a0, am), (am, a1)]
+        halves_b = [(b0, bm), (bm, b1)]
+        parts = [(p0, p1, q0, q1) for p0, p1 in halves_a for q0, q1 in halves_b]
+        a0 = np.concatenate([p[0] for p in parts])
+        a1 = np.concatenate([p[1] for p in parts])
+        b0 = np.concatenate([p[2] for p in parts])
+        b1 = np.concatenate([p[3] for p in parts])
+        keep = (a1 > a0) & (b1 > b0)
+        a0, a1, b0, b1 = a0[keep], a1[keep], b0[keep], b1[keep]
+    return True, best[1], best[2], best[0]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .geometry import EARTH_OBLIQUITY_DEG, LatLon, SunGrid, sun_vector_block
+from .session import TerritorySession
+from .solver import DEFAULT_MAX_BYTES, _parse_limits, _unit_vectors
+from ..models.result import DensifiedResult
+
+DEFAULT_DENSIFY_TOLERANCE_DEG = 0.01
+DEFAULT_MAX_ITERATIONS = 50
+
+
+def _ring_edges(rings: Sequence[Sequence[LatLon]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Each closed ring's edges as great-circle arcs a -> b: start a, unit tangent u at a in the
+    # plane of a and b, and arc length L, so the arc is a cos t + u sin t for t in [0, L].
+    A, B = [], []
+    for ring in rings:
+        N = _unit_vectors(list(ring))
+        if N.shape[0] > 1:
+            A.append(N)
+            B.append(np.roll(N, -1, axis=0))
+    if not A:
+        return np.empty((0, 3)), np.empty((0, 3)), np.empty(0)
+    return _arcs(np.vstack(A), np.vstack(B))
+
+
+def _arcs(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    cos_l = np.einsum("ij,ij->i", a, b)
+    u = b - cos_l[:, None] * a
+    sin_l = np.linalg.norm(u, axis=1)
+    # Repeated or antipodal vertices span no well-defined arc; they stay plain samples.
+    ok = sin_l > 1e-12
+    u[ok] /= sin_l[ok, None]
+    return a[ok], u[ok], np.arctan2(sin_l[ok], cos_l[ok])
+
+
+def _arc_max(
+    a: np.ndarray, u: np.ndarray, length: np.ndarray, s: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Exact max of n·s over each arc, the parameter t attaining it and whether t is interior.
+    # On the arc n·s = p cos t + q sin t, maximal at t* = atan2(q, p); outside [0, L] an
+    # endpoint (already a sample) wins.
+    p, q = a @ s, u @ s
+    t = np.arctan2(q, p)
+    inside = (t > 0.0) & (t < length)
+    end = p * np.cos(length) + q * np.sin(length)
+    return np.where(inside, np.hypot(p, q), np.maximum(p, end)), t, inside
+
+
+def _altitude(dot: float) -> float:
+    return math.degrees(math.asin(min(1.0, max(-1.0, dot))))
+
+
+def densify_boundary(
+    rings: Iterable[Sequence[LatLon]],
+    *,
+    visibility_limit_deg: Union[float, Sequence[float]] = 0.0,
+    tolerance_deg: float = DEFAULT_DENSIFY_TOLERANCE_DEG,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    decl_step_deg: float = 0.10,
+    hour_angle_step_deg: float = 0.10,
+    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+    return_multiple_best_points: bool = True,
+    tie_tol: float = 1e-12,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    sun_grid: Optional[SunGrid] = None,
+) -> DensifiedResult:
+    """Grid-engine solve of polygon territories, sampling boundaries only where the witness needs it.
+
+    ``rings`` are closed boundaries (vertex lists, edges taken as great-circle arcs). Starting
+    from the vertices, each round finds the exact max of n·s over every edge at the current
+    witness direction and adds that point on the edges where it beats the sampled worst case
+    by more than ``tolerance_deg``; the others are never densified. On the same Sun grid the
+    continuous boundary's worst-case max altitude lies between the sampled value and the best
+    boundary altitude at the final witness, returned as ``worst_max_altitude_bounds_deg``.
+    The result (from the samples) is conservative: a PASS holds for the whole boundary.
+    """
+    if tolerance_deg <= 0:
+        raise ValueError("tolerance_deg must be positive.")
+    if max_iterations < 0:
+        raise ValueError("max_iterations must be non-negative.")
+    single_limit, limits = _parse_limits(visibility_limit_deg)
+    rings = [list(ring) for ring in rings]
+    session = TerritorySession(
+        [pt for ring in rings for pt in ring],
+        decl_step_deg=decl_step_deg,
+        hour_angle_step_deg=hour_angle_step_deg,
+        obliquity_deg=obliquity_deg,
+        return_multiple_best_points=return_multiple_best_points,
+        tie_tol=tie_tol,
+        max_bytes=max_bytes,
+        sun_grid=sun_grid,
+    )
+    a, u, length = _ring_edges(rings)
+
+    rounds = 0
+    while True:
+        results = session.result(limits)
+        w = results[0].witness
+        d, h = np.radians([w.decl_deg]), np.radians([w.hour_angle_deg])
+        s = sun_vector_block(np.cos(d), np.sin(d), np.cos(h), np.sin(h))[0, :, 0]
+        best, t, inside = _arc_max(a, u, length, s)
+        # The witness is a grid cell, so the boundary's worst case is at most its max there.
+        upper = max(w.worst_max_dot, float(best.max(initial=-1.0)))
+        gain = np.degrees(np.arcsin(np.clip(best, -1.0, 1.0))) - w.worst_max_altitude_deg
+        grow = np.flatnonzero(inside & (gain > tolerance_deg))
+        if grow.size == 0 or rounds == max_iterations:
+            break
+        rounds += 1
+        # Split each growing edge at its max point: a -> p keeps a, and p -> b is appended.
+        tg, lg = t[grow][:, None], length[grow][:, None]
+        p = a[grow] * np.cos(tg) + u[grow] * np.sin(tg)
+        b = a[grow] * np.cos(lg) + u[grow] * np.sin(lg)
+        for x, y, z in p.tolist():
+            session.add_point(_altitude(z), math.degrees(math.atan2(y, x)))
+        length[grow] = t[grow]
+        a2, u2, l2 = _arcs(p, b)
+        a, u, length = np.vstack([a, a2]), np.vstack([u, u2]), np.concatenate([length, l2])
+
+    lower_alt, upper_alt = w.worst_max_altitude_deg, _altitude(upper)
+    return DensifiedResult(
+        result=results[0] if single_limit else results,
+        points=tuple(session.points),
+        rounds=rounds,
+        converged=grow.size == 0,
+        worst_max_altitude_bounds_deg=(lower_alt, upper_alt),
+    )
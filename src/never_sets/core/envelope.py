@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+TWO_PI = 2.0 * math.pi
+_ANGLE_TOL = 1e-12
+_VALUE_TOL = 1e-14
+# Headroom on the interval bounds for rounding in the sampled values.
+_BOUND_TOL = 1e-12
+# Each refinement level splits every kept hour interval into this many parts.
+_SUBDIVISIONS = 32
+_REFINE_LEVELS = 2
+# Float temporaries per (declination, point) pair while the first level is sampled.
+_REFINE_FLOATS = 4 * (_SUBDIVISIONS + 1)
+_FLOAT_BYTES = np.dtype(float).itemsize
+
+
+def _top_at(A: np.ndarray, B: np.ndarray, C: np.ndarray, alive: np.ndarray, H: np.ndarray) -> np.ndarray:
+    # Per row, the sinusoid on top just after H[r]: highest value, ties broken by the
+    # steepest rise (then the lowest index).
+    ch, sh = np.cos(H)[:, None], np.sin(H)[:, None]
+    values = np.where(alive, A * ch + B * sh + C, -np.inf)
+    tied = values >= values.max(axis=1, keepdims=True) - _VALUE_TOL
+    slopes = np.where(tied, -A * sh + B * ch, -np.inf)
+    return np.argmax(slopes, axis=1)
+
+
+def _next_upcrossing(
+    A: np.ndarray, B: np.ndarray, C: np.ndarray, alive: np.ndarray, i: np.ndarray, H: np.ndarray
+) -> np.ndarray:
+    # Per row, the smallest angle after H[r] where some j rises through sinusoid i[r]. With
+    # g = f_j - f_i = R cos(x - ψ) + ΔC, the rising root is x = ψ - acos(-ΔC / R).
+    rows = np.arange(A.shape[0])
+    dA = A - A[rows, i][:, None]
+    dB = B - B[rows, i][:, None]
+    dC = C - C[rows, i][:, None]
+    R = np.hypot(dA, dB)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = -dC / R
+        valid = alive & (R > 0.0) & (np.abs(ratio) <= 1.0)
+        valid[rows, i] = False
+        roots = np.arctan2(dB, dA) - np.arccos(ratio)
+    delta = np.mod(roots - H[:, None], TWO_PI)
+    delta[delta <= _ANGLE_TOL] += TWO_PI
+    return np.where(valid, delta, np.inf).min(axis=1)
+
+
+def _compact(
+    A: np.ndarray, B: np.ndarray, C: np.ndarray, keep: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Each row's kept columns moved to the front, in their original order, padded to the
+    # longest row; the returned mask marks the real (non-padding) entries.
+    counts = keep.sum(axis=1)
+    width = max(1, int(counts.max()))
+    cols = np.argsort(~keep, axis=1, kind="stable")[:, :width]
+    alive = np.arange(width) < counts[:, None]
+    take = lambda X: np.take_along_axis(X, cols, axis=1)  # noqa: E731
+    return take(A), take(B), take(C), alive
+
+
+def _refine(
+    A: np.ndarray,
+    B: np.ndarray,
+    C: np.ndarray,
+    alive: np.ndarray,
+    row: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    cd: np.ndarray,
+    upper: np.ndarray,
+) -> Tuple[np.ndarray, ...]:
+    # One branch-and-bound level. Every interval [lo, hi] is sampled at _SUBDIVISIONS + 1
+    # points; on a part of width w a sinusoid of amplitude a <= cos δ dips below (or rises
+    # above) its endpoint values by at most a (1 - cos(w/2)). That bounds the envelope from
+    # below on each part (through the sinusoids on top at its ends); parts whose bound
+    # exceeds the row's best sample cannot hold the minimum and are dropped, and in the rest
+    # only the sinusoids that can reach the bound stay candidates.
+    t = np.arange(_SUBDIVISIONS + 1) / _SUBDIVISIONS
+    H = lo[:, None] + (hi - lo)[:, None] * t
+    Q = np.stack([np.cos(H), np.sin(H), np.ones_like(H)], axis=1)
+    F = np.where(alive[:, :, None], np.stack([A, B, C], axis=2) @ Q, -np.inf)  # (m,c,S+1)
+    top = F.argmax(axis=1)[:, None, :]
+    env = np.take_along_axis(F, top, axis=1)[:, 0, :]
+    np.minimum.at(upper, row, env.min(axis=1))
+
+    slack = (cd[row] * (1.0 - np.cos((hi - lo) / (2 * _SUBDIVISIONS))))[:, None] + _BOUND_TOL
+    left_top_at_right = np.take_along_axis(F[:, :, 1:], top[:, :, :-1], axis=1)[:, 0, :]
+    right_top_at_left = np.take_along_axis(F[:, :, :-1], top[:, :, 1:], axis=1)[:, 0, :]
+    lower = np.maximum(
+        np.minimum(env[:, :-1], left_top_at_right), np.minimum(right_top_at_left, env[:, 1:])
+    ) - slack
+    m, k = np.nonzero(lower <= upper[row][:, None] + _BOUND_TOL)
+    reach = np.maximum(F[m, :, k], F[m, :, k + 1]) + slack[m] >= lower[m, k][:, None]
+    A, B, C, alive = _compact(A[m], B[m], C[m], alive[m] & reach)
+    return A, B, C, alive, row[m], H[m, k], H[m, k + 1]
+
+
+def _walk(
+    A: np.ndarray, B: np.ndarray, C: np.ndarray, alive: np.ndarray, lo: np.ndarray, hi: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Envelope walk over [lo[r], hi[r]] for every row at once: each row advances one piece
+    # per step, so the Python loop runs as many times as the longest row has pieces. The
+    # minimum is a piece endpoint (a kink where two sinusoids cross) or a trough.
+    phase = np.arctan2(B, A)
+    n = A.shape[0]
+    best_H = np.zeros(n)
+    best_val = np.full(n, np.inf)
+    pos = lo.copy()
+    i = _top_at(A, B, C, alive, pos)
+    active = np.arange(n)
+    for _ in range(4 * A.shape[1] + 4):
+        r = active
+        delta = _next_upcrossing(A[r], B[r], C[r], alive[r], i[r], pos[r])
+        end = np.minimum(pos[r] + delta, hi[r])
+        ai, bi, ci = A[r, i[r]], B[r, i[r]], C[r, i[r]]
+        trough = (phase[r, i[r]] + math.pi) % TWO_PI
+        in_piece = (pos[r] <= trough) & (trough <= end)
+        # Piece start, piece end, then the trough; strict comparisons keep the earliest.
+        for H, ok in ((pos[r], True), (end, True), (trough, in_piece)):
+            v = ai * np.cos(H) + bi * np.sin(H) + ci
+            better = ok & (v < best_val[r])
+            best_val[r] = np.where(better, v, best_val[r])
+            best_H[r] = np.where(better, H % TWO_PI, best_H[r])
+        pos[r] = end
+        active = r[end < hi[r]]
+        if active.size == 0:
+            break
+        # Re-derive the top sinusoid rather than trusting the predicted crossing, so
+        # tangencies and rounding noise cannot leave the walk on a buried piece.
+        i[active] = _top_at(A[active], B[active], C[active], alive[active], pos[active])
+    else:
+        # Each sinusoid pair crosses at most twice per turn, so this only trips on a walk
+        # that stalls; a partial interval could miss the minimum, so do not return it.
+        raise RuntimeError(
+            f"Envelope walk did not cover its interval (stopped at H={float(pos[active].min()):.6f} rad)."
+        )
+    return best_H, best_val
+
+
+def _envelope_rows(N: np.ndarray, decl_rad: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Exact min over H and its hour angle for a chunk of declinations: _refine narrows the
+    # circle to the few short intervals (and few points) that can hold the minimum, then
+    # the envelope is walked exactly over those.
+    n = decl_rad.size
+    cd, sd = np.cos(decl_rad), np.sin(decl_rad)
+    A = cd[:, None] * N[:, 0]
+    B = cd[:, None] * N[:, 1]
+    C = sd[:, None] * N[:, 2]
+    alive = np.ones(A.shape, dtype=bool)
+    row = np.arange(n)
+    lo, hi = np.zeros(n), np.full(n, TWO_PI)
+    upper = np.full(n, np.inf)
+    for _ in range(_REFINE_LEVELS):
+        A, B, C, alive, row, lo, hi = _refine(A, B, C, alive, row, lo, hi, cd, upper)
+    H, values = _walk(A, B, C, alive, lo, hi)
+    # Intervals are in row order and, within a row, by hour angle: keep each row's first minimum.
+    order = np.lexsort((np.arange(row.size), values, row))
+    first = order[np.unique(row[order], return_index=True)[1]]
+    return H[first], values[first]
+
+
+def envelope_min_over_hour(N: np.ndarray, decl_rad: float) -> Tuple[float, float]:
+    """Exact ``min_H max_i n_i·s(δ, H)`` for one declination.
+
+    For fixed δ each ``n_i·s`` is the sinusoid ``a_i cos H + b_i sin H + c_i``. Sampled
+    bounds first discard the hour angles and points that cannot hold the minimum; the upper
+    envelope is then walked piece by piece over what is left, and its minimum is either a
+    piece endpoint (a kink where two sinusoids cross) or the trough of the sinusoid on top.
+    Returns ``(H_rad, value)``.
+    """
+    H, v = _envelope_rows(N, np.array([decl_rad], dtype=float))
+    return float(H[0]), float(v[0])
+
+
+def envelope_min_max_dot(
+    N: np.ndarray, decls_deg: np.ndarray, max_bytes: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Per-declination exact minimum over H and the hour angle (degrees) attaining it. All
+    # declinations of a chunk (sized to max_bytes) are solved together.
+    decl_rad = np.radians(np.asarray(decls_deg, dtype=float))
+    D = decl_rad.size
+    per_decl = _REFINE_FLOATS * N.shape[0] * _FLOAT_BYTES
+    chunk = D if max_bytes is None else max(1, min(D, max_bytes // per_decl))
+    hours = np.empty(D)
+    values = np.empty(D)
+    for d0 in range(0, D, chunk):
+        H, v = _envelope_rows(N, decl_rad[d0 : d0 + chunk])
+        hours[d0 : d0 + chunk] = np.degrees(H)
+        values[d0 : d0 + chunk] = v
+    return values, hours
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+from .backends import BACKENDS, get_backend
+from .geometry import LatLon
+from .solver import (
+    DEFAULT_MAX_BYTES,
+    _FLOAT_BYTES,
+    _build_witness,
+    _parse_limits,
+    _territory_vectors,
+    coverage_result,
+)
+from ..models.country import CountryArrays
+from ..models.result import EphemerisResult
+
+J2000_UTC = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+# Instants per row handed to the backend; rows of a chunk are reduced in parallel by Numba.
+_ROW_INSTANTS = 4096
+# Float temporaries per instant while the Sun vectors are computed.
+_EPHEMERIS_FLOATS = 16
+
+Instant = Union[datetime, str]
+
+
+def _utc(t: Instant) -> datetime:
+    # ISO strings or datetimes; naive values are taken as UTC.
+    if isinstance(t, str):
+        t = datetime.fromisoformat(t.replace("Z", "+00:00"))
+    return t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t.astimezone(timezone.utc)
+
+
+def solar_position(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Low-precision solar declination and Greenwich hour angle in degrees (about 0.01°).
+
+    ``days`` counts UTC days from J2000.0 (2000-01-01 12:00 UTC); UT1 is taken as UTC. Uses
+    the Astronomical Almanac's low-precision formulae for the Sun and the linear GMST.
+    """
+    days = np.asarray(days, dtype=float)
+    mean_lon = np.radians((280.460 + 0.9856474 * days) % 360.0)
+    anomaly = np.radians((357.528 + 0.9856003 * days) % 360.0)
+    ecl_lon = mean_lon + np.radians(1.915 * np.sin(anomaly) + 0.020 * np.sin(2.0 * anomaly))
+    obliquity = np.radians(23.439 - 4e-7 * days)
+    sin_lon = np.sin(ecl_lon)
+    ra = np.degrees(np.arctan2(np.cos(obliquity) * sin_lon, np.cos(ecl_lon)))
+    decl = np.degrees(np.arcsin(np.sin(obliquity) * sin_lon))
+    # 360.98564736629 * days mod 360, split so the whole turns of a large day count cancel exactly.
+    gmst = (280.46061837 + 0.98564736629 * days + 360.0 * (days % 1.0)) % 360.0
+    return decl, (gmst - ra) % 360.0
+
+
+def _sun_vectors(days: np.ndarray) -> np.ndarray:
+    # (T,3) Earth-fixed Sun directions: the sub-solar point is at longitude -GHA.
+    decl, gha = solar_position(days)
+    d, h = np.radians(decl), np.radians(gha)
+    cd = np.cos(d)
+    return np.stack([cd * np.cos(h), -cd * np.sin(h), np.sin(d)], axis=1)
+
+
+def check_never_sets_over_time(
+    territory_points: Union[Iterable[LatLon], CountryArrays],
+    *,
+    start: Instant,
+    end: Instant,
+    step_seconds: float = 1.0,
+    visibility_limit_deg: Union[float, Sequence[float]] = 0.0,
+    return_multiple_best_points: bool = True,
+    tie_tol: float = 1e-12,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backend: str = "auto",
+) -> EphemerisResult:
+    """Worst real instant in ``[start, end]`` (every ``step_seconds``) instead of the (δ,H) grid.
+
+    Sun directions come from ``solar_position`` and are generated in chunks sized to
+    ``max_bytes``, then reduced by the same max-dot backend as the grid sweep, so a year at
+    1 s steps runs in bounded memory. The witness holds the worst instant's declination and
+    Sun hour angle (sub-solar longitude, as on the grid); ties keep the earliest instant.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}.")
+    if not (step_seconds > 0 and math.isfinite(step_seconds)):
+        raise ValueError("step_seconds must be positive.")
+    if tie_tol < 0:
+        raise ValueError("tie_tol must be non-negative.")
+    if max_bytes <= 0:
+        raise ValueError("max_bytes must be positive.")
+    single_limit, limits = _parse_limits(visibility_limit_deg)
+    t0, t1 = _utc(start), _utc(end)
+    if t1 < t0:
+        raise ValueError("end must not be before start.")
+    N = _territory_vectors(territory_points)
+    compute = get_backend(backend)
+
+    count = int((t1 - t0).total_seconds() // step_seconds) + 1
+    day0 = (t0 - J2000_UTC).total_seconds() / 86400.0
+    step_days = step_seconds / 86400.0
+    per_instant = (2 * compute.points_per_cell(N.shape[0]) + _EPHEMERIS_FLOATS) * _FLOAT_BYTES
+    chunk = max(1, max_bytes // per_instant)
+    best, best_i = np.inf, 0
+    for c0 in range(0, count, chunk):
+        m = min(chunk, count - c0)
+        S = _sun_vectors(day0 + np.arange(c0, c0 + m) * step_days)
+        # Whole rows of _ROW_INSTANTS as a (rows,3,cols) block, then the remainder as one row.
+        cols = min(m, _ROW_INSTANTS)
+        rows = m // cols
+        parts = [(0, S[: rows * cols].reshape(rows, cols, 3).transpose(0, 2, 1))]
+        if rows * cols < m:
+            parts.append((rows * cols, S[rows * cols :].T[None]))
+        for offset, sun in parts:
+            values, hour_idx = compute.row_min_max(N, np.ascontiguousarray(sun))
+            r = int(np.argmin(values))
+            # Strict comparison keeps the earliest instant, like the grid's first-occurrence rule.
+            if values[r] < best:
+                best, best_i = float(values[r]), c0 + offset + r * sun.shape[2] + int(hour_idx[r])
+
+    decl, gha = solar_position(np.array([day0 + best_i * step_days]))
+    witness = _build_witness(
+        N,
+        float(decl[0]),
+        float(-gha[0] % 360.0),
+        best,
+        tie_tol=tie_tol,
+        return_multiple_best_points=return_multiple_best_points,
+    )
+    results = [coverage_result(witness, limit) for limit in limits]
+    return EphemerisResult(
+        result=results[0] if single_limit else results,
+        worst_time_utc=t0 + timedelta(seconds=best_i * step_seconds),
+        instants=count,
+        step_seconds=float(step_seconds),
+    )
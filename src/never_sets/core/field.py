@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .geometry import SunGrid
+
+FIELD_DTYPES = ("float64", "float32")
+
+
+class CoverageField:
+    """The sweep's full (D,H) fields: ``max_dot`` (max_i n_i·s per cell) and ``argmax`` (the
+    first point attaining it), as memory-mapped ``.npy`` files in one directory.
+
+    Created empty by the solver and filled block by block as the sweep runs, so the field is
+    never held in memory. Point indices are ``uint16`` when they fit, else ``uint32``.
+    """
+
+    _VALUES_FILE = "max_dot.npy"
+    _INDEX_FILE = "argmax.npy"
+    _PARAMS_FILE = "field.json"
+
+    def __init__(self, directory: Path, max_dot: np.ndarray, argmax: np.ndarray, params: Dict[str, Any]) -> None:
+        self.directory = directory
+        self.max_dot = max_dot
+        self.argmax = argmax
+        self.params = params
+
+    @classmethod
+    def create(
+        cls, directory: str | Path, grid: SunGrid, point_count: int, *, dtype: str = "float64"
+    ) -> "CoverageField":
+        if dtype not in FIELD_DTYPES:
+            raise ValueError(f"field dtype must be one of {', '.join(FIELD_DTYPES)}.")
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        index_dtype = np.uint16 if point_count <= np.iinfo(np.uint16).max + 1 else np.uint32
+        open_memmap = np.lib.format.open_memmap
+        max_dot = open_memmap(d / cls._VALUES_FILE, mode="w+", dtype=dtype, shape=grid.shape)
+        argmax = open_memmap(d / cls._INDEX_FILE, mode="w+", dtype=index_dtype, shape=grid.shape)
+        params = {
+            "obliquity_deg": grid.obliquity_deg,
+            "decl_step_deg": grid.decl_step_deg,
+            "hour_angle_step_deg": grid.hour_angle_step_deg,
+            "shape": list(grid.shape),
+            "point_count": point_count,
+            "max_dot": cls._VALUES_FILE,
+            "argmax": cls._INDEX_FILE,
+        }
+        (d / cls._PARAMS_FILE).write_text(json.dumps(params), encoding="utf-8")
+        return cls(d, max_dot, argmax, params)
+
+    @classmethod
+    def load(cls, directory: str | Path, *, mmap: bool = True) -> "CoverageField":
+        d = Path(directory)
+        params = json.loads((d / cls._PARAMS_FILE).read_text(encoding="utf-8"))
+        mode: Optional[str] = "r" if mmap else None
+        max_dot = np.load(d / params["max_dot"], mmap_mode=mode)
+        argmax = np.load(d / params["argmax"], mmap_mode=mode)
+        if max_dot.shape != tuple(params["shape"]) or argmax.shape != max_dot.shape:
+            raise ValueError(f"Coverage field in {d} does not match its parameters.")
+        return cls(d, max_dot, argmax, params)
+
+    @property
+    def grid(self) -> SunGrid:
+        return SunGrid(
+            obliquity_deg=self.params["obliquity_deg"],
+            decl_step_deg=self.params["decl_step_deg"],
+            hour_angle_step_deg=self.params["hour_angle_step_deg"],
+        )
+
+    def write_block(self, ds: slice, hs: slice, max_dots: np.ndarray, argmax: np.ndarray) -> None:
+        self.max_dot[ds, hs] = max_dots
+        self.argmax[ds, hs] = argmax
+
+    def flush(self) -> None:
+        for a in (self.max_dot, self.argmax):
+            if isinstance(a, np.memmap):
+                a.flush()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import json
 import math
-from typing import Tuple
+from pathlib import Path
+from typing import Optional, Tuple
 
 import numpy as np
 
@@ -16,8 +18,119 @@ def latlon_to_unit(lat_deg: float, lon_deg: float) -> np.ndarray:
     return np.array([clat * math.cos(lon), clat * math.sin(lon), math.sin(lat)], dtype=float)
 
 
+def latlon_to_unit_array(lat_deg: np.ndarray, lon_deg: np.ndarray) -> np.ndarray:
+    # Vectorised latlon_to_unit: (K,) latitudes and longitudes to a C-contiguous (K,3) array.
+    lat = np.radians(np.asarray(lat_deg, dtype=float))
+    lon = np.radians(np.asarray(lon_deg, dtype=float))
+    out = np.empty((lat.size, 3))
+    np.cos(lat, out=out[:, 2])
+    np.multiply(out[:, 2], np.cos(lon), out=out[:, 0])
+    np.multiply(out[:, 2], np.sin(lon), out=out[:, 1])
+    np.sin(lat, out=out[:, 2])
+    return out
+
+
 def sun_vectors_for_decl(decl_deg: float, hour_angles_deg: np.ndarray) -> np.ndarray:
     d = math.radians(decl_deg)
     cd, sd = math.cos(d), math.sin(d)
     h = np.deg2rad(hour_angles_deg)
     return np.vstack([cd * np.cos(h), cd * np.sin(h), np.full_like(h, sd)])
+
+
+def sun_vector_block(cd: np.ndarray, sd: np.ndarray, cos_h: np.ndarray, sin_h: np.ndarray) -> np.ndarray:
+    return np.stack(
+        [
+            cd[:, None] * cos_h[None, :],
+            cd[:, None] * sin_h[None, :],
+            np.broadcast_to(sd[:, None], (cd.size, cos_h.size)),
+        ],
+        axis=1,
+    )  # (d,3,h)
+
+
+class SunGrid:
+    """Declination × hour-angle grid of Sun directions, shared across territories.
+
+    The 1-D axes and their cos/sin are always kept. The full ``(D,3,H)`` array of Sun
+    vectors is only built by :meth:`materialize` (or loaded by :meth:`load`, optionally as
+    a read-only memory map); until then :meth:`block` computes each block on the fly.
+    Blocks are bitwise identical either way.
+    """
+
+    _VECTORS_FILE = "sun_vectors.npy"
+    _PARAMS_FILE = "sun_grid.json"
+
+    def __init__(
+        self,
+        *,
+        obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+        decl_step_deg: float = 0.10,
+        hour_angle_step_deg: float = 0.10,
+    ) -> None:
+        if decl_step_deg <= 0:
+            raise ValueError("decl_step_deg must be positive.")
+        if hour_angle_step_deg <= 0:
+            raise ValueError("hour_angle_step_deg must be positive.")
+        if not (0.0 <= obliquity_deg <= 90.0):
+            raise ValueError("obliquity_deg must be between 0 and 90 degrees.")
+        self.obliquity_deg = float(obliquity_deg)
+        self.decl_step_deg = float(decl_step_deg)
+        self.hour_angle_step_deg = float(hour_angle_step_deg)
+
+        self.decls = np.arange(-obliquity_deg, obliquity_deg + 1e-12, decl_step_deg, dtype=float)
+        self.hour_angles = np.arange(0.0, 360.0, hour_angle_step_deg, dtype=float)
+        d = np.deg2rad(self.decls)
+        h = np.deg2rad(self.hour_angles)
+        self.cos_decl, self.sin_decl = np.cos(d), np.sin(d)
+        self.cos_hour, self.sin_hour = np.cos(h), np.sin(h)
+        self.sun_vectors: Optional[np.ndarray] = None
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.decls.size, self.hour_angles.size
+
+    @property
+    def nbytes(self) -> int:
+        # Size of the full (D,3,H) float64 Sun-vector array, whether or not it is built.
+        D, H = self.shape
+        return D * 3 * H * np.dtype(float).itemsize
+
+    def matches(self, obliquity_deg: float, decl_step_deg: float, hour_angle_step_deg: float) -> bool:
+        return (self.obliquity_deg, self.decl_step_deg, self.hour_angle_step_deg) == (
+            float(obliquity_deg),
+            float(decl_step_deg),
+            float(hour_angle_step_deg),
+        )
+
+    def block(self, ds: slice, hs: slice) -> np.ndarray:
+        if self.sun_vectors is not None:
+            return self.sun_vectors[ds, :, hs]
+        return sun_vector_block(self.cos_decl[ds], self.sin_decl[ds], self.cos_hour[hs], self.sin_hour[hs])
+
+    def materialize(self) -> "SunGrid":
+        if self.sun_vectors is None:
+            self.sun_vectors = self.block(slice(None), slice(None))
+        return self
+
+    def save(self, directory: str | Path) -> Path:
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        np.save(d / self._VECTORS_FILE, self.materialize().sun_vectors)
+        params = {
+            "obliquity_deg": self.obliquity_deg,
+            "decl_step_deg": self.decl_step_deg,
+            "hour_angle_step_deg": self.hour_angle_step_deg,
+        }
+        (d / self._PARAMS_FILE).write_text(json.dumps(params), encoding="utf-8")
+        return d
+
+    @classmethod
+    def load(cls, directory: str | Path, *, mmap: bool = True) -> "SunGrid":
+        d = Path(directory)
+        params = json.loads((d / cls._PARAMS_FILE).read_text(encoding="utf-8"))
+        grid = cls(**params)
+        vectors = np.load(d / cls._VECTORS_FILE, mmap_mode="r" if mmap else None)
+        if vectors.shape != (grid.decls.size, 3, grid.hour_angles.size):
+            raise ValueError(f"Sun grid in {d} does not match its parameters.")
+        grid.sun_vectors = vectors
+        return grid
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+from .backends import BACKENDS, get_backend
+from .decide import _passes
+from .geometry import LatLon, sun_vector_block
+from .solver import (
+    DEFAULT_MAX_BYTES,
+    _build_witness,
+    _fold_row_minima,
+    _iter_sun_blocks,
+    _parse_limits,
+    _territory_vectors,
+    _validate_grid_options,
+    coverage_result,
+)
+from ..models.country import CountryArrays
+from ..models.result import ParameterSweep, Witness
+
+
+class _AxisGrid:
+    # Duck-typed SunGrid over arbitrary declination and hour axes, so the sweep's ±|δ| rows
+    # go through the shared block walk.
+    def __init__(self, decls: np.ndarray, hours: np.ndarray) -> None:
+        d, h = np.radians(decls), np.radians(hours)
+        self.cos_decl, self.sin_decl = np.cos(d), np.sin(d)
+        self.cos_hour, self.sin_hour = np.cos(h), np.sin(h)
+        self.shape = (decls.size, hours.size)
+
+    def block(self, ds: slice, hs: slice) -> np.ndarray:
+        return sun_vector_block(self.cos_decl[ds], self.sin_decl[ds], self.cos_hour[hs], self.sin_hour[hs])
+
+
+def _row_minima(
+    N: np.ndarray, decls: np.ndarray, hours: np.ndarray, max_bytes: int, backend: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Per declination row: min over hour angles of max_i n_i·s and the first hour index.
+    compute = get_backend(backend)
+    blocks = _iter_sun_blocks(_AxisGrid(decls, hours), compute.points_per_cell(N.shape[0]), max_bytes)
+    return _fold_row_minima(decls.size, ((ds, hs, *compute.row_min_max(N, sun)) for ds, hs, sun in blocks))
+
+
+def parameter_sweep(
+    territory_points: Union[Iterable[LatLon], CountryArrays],
+    *,
+    obliquities_deg: Sequence[float],
+    visibility_limits_deg: Sequence[float],
+    decl_step_deg: float = 0.10,
+    hour_angle_step_deg: float = 0.10,
+    return_multiple_best_points: bool = True,
+    tie_tol: float = 1e-12,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backend: str = "auto",
+) -> ParameterSweep:
+    """Verdicts for every (obliquity, visibility limit) pair from one sweep of the widest band.
+
+    Declinations are sampled at ±multiples of ``decl_step_deg`` plus each requested band edge
+    ±obliquity, over the usual hour-angle grid. The per-declination minima of the max dot are
+    computed once; folding ±δ together, an obliquity ε keeps every |δ| <= ε, so its worst
+    case is a prefix minimum over |δ|, and each limit is one comparison against it. Where a
+    ``check_never_sets`` grid has the same declinations (2ε a multiple of the step) the worst
+    case and verdicts are identical; on exact ties the witness cell may differ.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}.")
+    obliquities = [float(x) for x in obliquities_deg]
+    if not obliquities:
+        raise ValueError("obliquities_deg must contain at least one obliquity.")
+    for obliquity in obliquities:
+        _validate_grid_options(decl_step_deg, hour_angle_step_deg, obliquity, tie_tol, max_bytes, None)
+    _, limits = _parse_limits(list(visibility_limits_deg))
+    N = _territory_vectors(territory_points)
+
+    widest = max(obliquities)
+    levels = np.union1d(np.arange(0.0, widest, decl_step_deg), obliquities)  # sorted |δ|
+    hours = np.arange(0.0, 360.0, hour_angle_step_deg, dtype=float)
+    # Rows -|δ| first; on a tie between ±δ the southern one wins, as in a row-major sweep.
+    decls = np.concatenate([-levels, levels])
+    row_min, hour_idx = _row_minima(N, decls, hours, max_bytes, backend)
+    L = levels.size
+    south = row_min[:L] <= row_min[L:]
+    level_min = np.where(south, row_min[:L], row_min[L:])
+    level_row = np.where(south, np.arange(L), np.arange(L, 2 * L))
+
+    # Prefix minimum over |δ| with the first level attaining it.
+    pos = np.arange(L)
+    running = np.minimum.accumulate(level_min)
+    new_min = np.r_[True, level_min[1:] < running[:-1]]
+    first = np.maximum.accumulate(np.where(new_min, pos, 0))
+
+    # Obliquities sharing a worst level share its witness.
+    witnesses: Dict[int, Witness] = {}
+    picked = first[np.searchsorted(levels, obliquities, side="right") - 1]
+    for i in picked.tolist():
+        if i not in witnesses:
+            row = int(level_row[i])
+            witnesses[i] = _build_witness(
+                N,
+                float(decls[row]),
+                float(hours[hour_idx[row]]),
+                float(level_min[i]),
+                tie_tol=tie_tol,
+                return_multiple_best_points=return_multiple_best_points,
+            )
+    worst = tuple(witnesses[i] for i in picked.tolist())
+    worst_dot = np.array([w.worst_max_dot for w in worst])
+    worst_alt = np.array([w.worst_max_altitude_deg for w in worst])
+    limit_arr = np.array(limits)
+    limit_dot = np.array([math.sin(math.radians(limit)) for limit in limits])  # as coverage_result
+    return ParameterSweep(
+        obliquities_deg=tuple(obliquities),
+        limits_deg=tuple(limits),
+        witnesses=worst,
+        passes=_passes(worst_dot[:, None], limit_dot[None, :]),
+        margins_deg=worst_alt[:, None] - limit_arr[None, :],
+    )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+
+from .geometry import LatLon, latlon_to_unit_array
+from ..models.country import CountryArrays, CountryDef
+
+DEFAULT_LEAF_SIZE = 32
+_SEED_NODES = 255
+# Cap bounds are evaluated in floating point; widen them so rounding never prunes the true max.
+_BOUND_SLACK = 1e-12
+
+
+def fixed_order_dots(P: np.ndarray, S: np.ndarray) -> np.ndarray:
+    # (m,L) dots summed as ((x*sx + y*sy) + z*sz), the same rounding as the solver's sweep.
+    out = np.multiply(S[:, 0, None], P[None, :, 0])
+    out += np.multiply(S[:, 1, None], P[None, :, 1])
+    out += np.multiply(S[:, 2, None], P[None, :, 2])
+    return out
+
+
+class PointIndex:
+    """Hierarchy of bounding spherical caps over territory unit vectors.
+
+    Answers batched ``max_i n_i·s`` queries by best-first pruning: a node whose cap cannot
+    beat the best dot found so far for a query is skipped for that query. Values are
+    bitwise identical to a brute-force sweep over all points.
+    """
+
+    def __init__(self, unit_vectors: np.ndarray, *, leaf_size: int = DEFAULT_LEAF_SIZE) -> None:
+        N = np.ascontiguousarray(unit_vectors, dtype=float)
+        if N.ndim != 2 or N.shape[1] != 3 or N.shape[0] == 0:
+            raise ValueError("unit_vectors must be a non-empty (K, 3) array.")
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be at least 1.")
+
+        order = np.arange(N.shape[0])
+        centers: List[np.ndarray] = []
+        radii: List[float] = []
+        spans: List[Tuple[int, int]] = []
+        children: List[Tuple[int, int]] = []
+        reps: List[int] = []
+
+        # Breadth-first, so the first nodes are the coarsest caps (used to seed queries).
+        queue = deque([(0, N.shape[0], -1, 0)])
+        while queue:
+            start, end, parent, side = queue.popleft()
+            node = len(spans)
+            if parent >= 0:
+                left, right = children[parent]
+                children[parent] = (node, right) if side == 0 else (left, node)
+            pts = N[order[start:end]]
+            mean = pts.mean(axis=0)
+            norm = float(np.linalg.norm(mean))
+            center = mean / norm if norm > 1e-12 else pts[0]
+            cosines = pts @ center
+            centers.append(center)
+            radii.append(float(np.arccos(np.clip(cosines.min(), -1.0, 1.0))))
+            reps.append(int(order[start + int(np.argmax(cosines))]))
+            spans.append((start, end))
+            children.append((-1, -1))
+            if end - start > leaf_size:
+                axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+                mid = (end - start) // 2
+                part = np.argpartition(pts[:, axis], mid)
+                order[start:end] = order[start:end][part]
+                queue.append((start, start + mid, node, 0))
+                queue.append((start + mid, end, node, 1))
+
+        self._points = N[order]
+        self._order = order
+        self._centers = np.vstack(centers)
+        self._radii = np.asarray(radii)
+        self._spans = spans
+        self._children = children
+        self._seeds = np.unique(np.asarray(reps[:_SEED_NODES]))
+
+    @classmethod
+    def from_points(cls, points: Iterable[LatLon], **kwargs) -> "PointIndex":
+        latlon = np.asarray(list(points), dtype=float).reshape(-1, 2)
+        return cls(latlon_to_unit_array(latlon[:, 0], latlon[:, 1]), **kwargs)
+
+    @classmethod
+    def from_country(cls, country: Union[CountryDef, CountryArrays], **kwargs) -> "PointIndex":
+        if isinstance(country, CountryArrays):
+            return cls(country.unit_vectors, **kwargs)
+        return cls.from_points(((p.lat, p.lon) for p in country.points), **kwargs)
+
+    @property
+    def size(self) -> int:
+        return int(self._points.shape[0])
+
+    def _upper_bound(self, node: int, S: np.ndarray) -> np.ndarray:
+        theta = np.arccos(np.clip(S @ self._centers[node], -1.0, 1.0))
+        return np.cos(np.maximum(0.0, theta - self._radii[node])) + _BOUND_SLACK
+
+    def max_dot(self, sun_dirs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(max_i n_i·s, argmax index)`` for each row of an (M,3) direction array."""
+        S = np.ascontiguousarray(sun_dirs, dtype=float).reshape(-1, 3)
+        inv = np.empty_like(self._order)
+        inv[self._order] = np.arange(self._order.size)
+        seed_dots = fixed_order_dots(self._points[inv[self._seeds]], S)
+        arg = np.argmax(seed_dots, axis=1)
+        best = seed_dots[np.arange(S.shape[0]), arg]
+        best_idx = self._seeds[arg]
+
+        stack = [(0, np.arange(S.shape[0]))]
+        while stack:
+            node, q = stack.pop()
+            q = q[self._upper_bound(node, S[q]) > best[q]]
+            if q.size == 0:
+                continue
+            left, right = self._children[node]
+            if left < 0:
+                start, end = self._spans[node]
+                dots = fixed_order_dots(self._points[start:end], S[q])
+                local = np.argmax(dots, axis=1)
+                vals = dots[np.arange(q.size), local]
+                better = vals > best[q]
+                best[q[better]] = vals[better]
+                best_idx[q[better]] = self._order[start + local[better]]
+                continue
+            # Visit the child whose cap centre is closer to the queries first (pushed last).
+            closer_left = float((S[q] @ self._centers[left]).sum()) >= float((S[q] @ self._centers[right]).sum())
+            stack.extend([(right, q), (left, q)] if closer_left else [(left, q), (right, q)])
+        return best, best_idx
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import math
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .geometry import EARTH_OBLIQUITY_DEG, LatLon, latlon_to_unit_array
+
+COARSE_STEP_DEG = 8.0
+DEFAULT_MAX_DEPTH = 9
+# Dominance must survive rounding: a pruned point stays this far below the max everywhere.
+_STRICT_MARGIN = 1e-12
+
+
+def _cell_frames(dc: np.ndarray, hc: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    cd, sd = np.cos(dc), np.sin(dc)
+    ch, sh = np.cos(hc), np.sin(hc)
+    s = np.stack([cd * ch, cd * sh, sd], axis=1)
+    s_decl = np.stack([-sd * ch, -sd * sh, cd], axis=1)
+    s_hour = np.stack([-cd * sh, cd * ch, np.zeros_like(cd)], axis=1)
+    return s, s_decl, s_hour
+
+
+def _dominance_bound(
+    N: np.ndarray,
+    s: np.ndarray,
+    s_decl: np.ndarray,
+    s_hour: np.ndarray,
+    t: np.ndarray,
+    u: np.ndarray,
+    a: float,
+    b: float,
+) -> np.ndarray:
+    # Lower bound over the cell of (n_t - n_u)·s, by the same second-order Taylor argument as
+    # the adaptive engine (second partials of v·s are bounded by |v|). Shapes broadcast
+    # between the per-cell frames and the (t, u) index arrays.
+    v = N[t] - N[u]
+    norm = np.sqrt(np.einsum("...q,...q->...", v, v))
+    return (
+        np.einsum("...q,...q->...", v, s)
+        - np.abs(np.einsum("...q,...q->...", v, s_decl)) * a
+        - np.abs(np.einsum("...q,...q->...", v, s_hour)) * b
+        - 0.5 * norm * (a + b) ** 2
+    )
+
+
+def _column_gap(m: np.ndarray, rows: np.ndarray, t: np.ndarray) -> np.ndarray:
+    return m[rows, t[:, None]] - m
+
+
+def dominated_mask(
+    N: np.ndarray,
+    *,
+    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    max_bytes: int = 64 * 1024 * 1024,
+) -> np.ndarray:
+    """Boolean mask of points that are never the maximiser of ``n·s`` for any Sun direction
+    in the declination band ``[-obliquity, +obliquity]``.
+
+    A point ``u`` is certified dominated on a (δ,H) cell when, for the maximiser ``t`` at the
+    cell centre, a lower bound of ``(n_t - n_u)·s`` over the cell is positive. Cells that are
+    not certified are split, down to ``max_depth`` levels below an 8° grid; anything still
+    uncertain is kept. Dominated points are strictly below the maximum everywhere in the
+    band, so dropping them leaves ``max_i n_i·s`` unchanged on every Sun direction.
+    """
+    K = N.shape[0]
+    eps = math.radians(obliquity_deg)
+    nd = max(1, math.ceil(2.0 * obliquity_deg / COARSE_STEP_DEG))
+    nh = max(1, math.ceil(360.0 / COARSE_STEP_DEG))
+    a = eps / nd
+    b = math.pi / nh
+    dc, hc = np.meshgrid(-eps + a * (2.0 * np.arange(nd) + 1.0), b * (2.0 * np.arange(nh) + 1.0), indexing="ij")
+    dc, hc = dc.ravel(), hc.ravel()
+
+    kept = np.zeros(K, dtype=bool)
+    pair_cell: List[np.ndarray] = []
+    pair_point: List[np.ndarray] = []
+    chunk = max(1, max_bytes // (6 * K * np.dtype(float).itemsize))
+    for start in range(0, dc.size, chunk):
+        sl = slice(start, start + chunk)
+        s, s_decl, s_hour = _cell_frames(dc[sl], hc[sl])
+        dots = s @ N.T
+        t = np.argmax(dots, axis=1)
+        kept[t] = True
+        rows = np.arange(t.size)[:, None]
+        # Dense form of _dominance_bound against every point at once.
+        lb = dots[rows, t[:, None]] - dots
+        lb -= np.abs(_column_gap(s_decl @ N.T, rows, t)) * a
+        lb -= np.abs(_column_gap(s_hour @ N.T, rows, t)) * b
+        lb -= 0.5 * np.sqrt(np.maximum(0.0, 2.0 - 2.0 * (N[t] @ N.T))) * (a + b) ** 2
+        cells, points = np.nonzero(lb <= _STRICT_MARGIN)
+        pair_cell.append(cells + start)
+        pair_point.append(points)
+    cells = np.concatenate(pair_cell)
+    points = np.concatenate(pair_point)
+
+    for _ in range(max_depth):
+        open_pairs = ~kept[points]
+        cells, points = cells[open_pairs], points[open_pairs]
+        # Out of budget: whatever is still uncertain is simply kept.
+        if cells.size == 0 or cells.size * 64 > max_bytes:
+            break
+        # Dominated points are never the maximiser, so the argmax only needs the rest.
+        undecided = np.zeros(K, dtype=bool)
+        undecided[points] = True
+        candidates = np.flatnonzero(kept | undecided)
+        uniq, inverse = np.unique(cells, return_inverse=True)
+        a /= 2.0
+        b /= 2.0
+        offsets = ((-a, -b), (-a, b), (a, -b), (a, b))
+        child_dc = np.concatenate([dc[uniq] + o[0] for o in offsets])
+        child_hc = np.concatenate([hc[uniq] + o[1] for o in offsets])
+        s, s_decl, s_hour = _cell_frames(child_dc, child_hc)
+        t_child = candidates[np.argmax(s @ N[candidates].T, axis=1)]
+        kept[t_child] = True
+
+        n_uniq = uniq.size
+        child_of_pair = np.concatenate([inverse + k * n_uniq for k in range(4)])
+        pair_u = np.tile(points, 4)
+        lb = _dominance_bound(
+            N,
+            s[child_of_pair],
+            s_decl[child_of_pair],
+            s_hour[child_of_pair],
+            t_child[child_of_pair],
+            pair_u,
+            a,
+            b,
+        )
+        still = (lb <= _STRICT_MARGIN) & ~kept[pair_u]
+        dc, hc = child_dc, child_hc
+        before = np.bincount(points, minlength=K)
+        cells, points = child_of_pair[still], pair_u[still]
+        # Ties over an area (e.g. duplicate points) never certify: every split keeps all four
+        # children. Keep such points now instead of refining them exponentially.
+        stalled = np.bincount(points, minlength=K) > 3 * before
+        kept |= stalled
+
+    kept[points] = True
+    return ~kept
+
+
+def prune_dominated_points(
+    points: Sequence[LatLon],
+    *,
+    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+) -> Tuple[List[LatLon], List[int]]:
+    """Drop points that can never be the best point; returns ``(kept_points, original_indices)``."""
+    pts = list(points)
+    latlon = np.asarray(pts, dtype=float).reshape(-1, 2)
+    N = latlon_to_unit_array(latlon[:, 0], latlon[:, 1])
+    keep = np.flatnonzero(~dominated_mask(N, obliquity_deg=obliquity_deg, max_depth=max_depth))
+    return [pts[i] for i in keep.tolist()], keep.tolist()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from .decide import _passes
+from .geometry import EARTH_OBLIQUITY_DEG, LatLon, SunGrid
+from .point_index import fixed_order_dots
+from .solver import (
+    DEFAULT_MAX_BYTES,
+    _FLOAT_BYTES,
+    _near_min_cells,
+    _parse_limits,
+    _territory_vectors,
+    _validate_grid_options,
+)
+from ..models.country import CountryArrays
+from ..models.result import EnsembleResult
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# Headroom on the candidate-cell bound for rounding in the dots.
+_CANDIDATE_SLACK = 1e-12
+
+
+def _tangent_basis(N: np.ndarray) -> np.ndarray:
+    # (K,2,3) orthonormal tangents at each point: east (z x n), then north (n x east); the
+    # poles, where east is undefined, use x x n instead.
+    e = np.cross(np.array([0.0, 0.0, 1.0]), N)
+    norm = np.linalg.norm(e, axis=1)
+    polar = norm < 1e-12
+    e[polar] = np.cross(np.array([1.0, 0.0, 0.0]), N[polar])
+    e /= np.linalg.norm(e, axis=1)[:, None]
+    return np.stack([e, np.cross(N, e)], axis=1)
+
+
+def _jitter(N: np.ndarray, basis: np.ndarray, radius_deg: float, rng: np.random.Generator, count: int) -> np.ndarray:
+    # `count` replicas of N, each point moved to a uniform random position (by area) in the
+    # spherical cap of radius_deg around it; rows are replica-major, (count*K,3).
+    u = rng.random((count, N.shape[0], 2))
+    azimuth = 2.0 * np.pi * u[..., 0]
+    cos_r = 1.0 - u[..., 1] * (1.0 - math.cos(math.radians(radius_deg)))
+    sin_r = np.sqrt(np.maximum(0.0, 1.0 - cos_r * cos_r))
+    tangent = np.cos(azimuth)[..., None] * basis[:, 0] + np.sin(azimuth)[..., None] * basis[:, 1]
+    return (N * cos_r[..., None] + tangent * sin_r[..., None]).reshape(-1, 3)
+
+
+def jitter_ensemble(
+    territory_points: Union[Iterable[LatLon], CountryArrays],
+    *,
+    radius_deg: float,
+    replicas: int = 1000,
+    seed: int = 0,
+    visibility_limit_deg: Union[float, Sequence[float]] = 0.0,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    decl_step_deg: float = 0.10,
+    hour_angle_step_deg: float = 0.10,
+    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    sun_grid: Optional[SunGrid] = None,
+) -> EnsembleResult:
+    """Margin distribution and PASS probability when every point may be off by ``radius_deg``.
+
+    Each replica moves every point to a uniform random position within ``radius_deg`` of arc
+    of it, and its worst case is taken over the same Sun grid as ``check_never_sets``. Moving
+    a point by an arc R changes any dot by at most the chord c = 2 sin(R/2), so a replica's
+    minimum lies among the cells where the unjittered max dot is within 2c of its minimum.
+    One sweep finds those cells; all replicas are then evaluated there together, as chunked
+    (replica x point) products with the sweep's rounding. The same ``seed`` gives the same
+    replicas, whatever the chunking.
+    """
+    if not (radius_deg >= 0 and math.isfinite(radius_deg)):
+        raise ValueError("radius_deg must be a non-negative number of degrees.")
+    if replicas < 1:
+        raise ValueError("replicas must be at least 1.")
+    levels = tuple(float(q) for q in quantiles)
+    if not all(0.0 <= q <= 1.0 for q in levels):
+        raise ValueError("quantiles must be between 0 and 1.")
+    _validate_grid_options(decl_step_deg, hour_angle_step_deg, obliquity_deg, 0.0, max_bytes, sun_grid)
+    _, limits = _parse_limits(visibility_limit_deg)
+    N = _territory_vectors(territory_points)
+    grid = sun_grid or SunGrid(
+        obliquity_deg=obliquity_deg,
+        decl_step_deg=decl_step_deg,
+        hour_angle_step_deg=hour_angle_step_deg,
+    )
+
+    chord = 2.0 * math.sin(math.radians(min(radius_deg, 180.0)) / 2.0)
+    di, hi = _near_min_cells(N, grid, max_bytes, 2.0 * chord + _CANDIDATE_SLACK)
+    cd = grid.cos_decl[di]
+    S = np.stack([cd * grid.cos_hour[hi], cd * grid.sin_hour[hi], grid.sin_decl[di]], axis=1)
+
+    K = N.shape[0]
+    basis = _tangent_basis(N)
+    rng = np.random.default_rng(seed)
+    # Up to ~1 MiB of replica points per chunk; cells are then chunked to the budget.
+    chunk = max(1, min(replicas, (1 << 17) // (3 * K)))
+    worst = np.full(replicas, np.inf)
+    for r0 in range(0, replicas, chunk):
+        count = min(chunk, replicas - r0)
+        P = _jitter(N, basis, radius_deg, rng, count)
+        step = max(1, max_bytes // (2 * count * K * _FLOAT_BYTES))
+        for c0 in range(0, S.shape[0], step):
+            dots = fixed_order_dots(P, S[c0 : c0 + step])  # (cells, count*K)
+            chunk_min = dots.reshape(dots.shape[0], count, K).max(axis=2).min(axis=0)
+            np.minimum(worst[r0 : r0 + count], chunk_min, out=worst[r0 : r0 + count])
+
+    altitudes = np.degrees(np.arcsin(np.clip(worst, -1.0, 1.0)))
+    margin_quantiles = []
+    pass_probability = []
+    for limit in limits:
+        margin_quantiles.append(tuple(float(v) for v in np.quantile(altitudes - limit, levels)))
+        pass_probability.append(float(_passes(worst, math.sin(math.radians(limit))).mean()))
+    return EnsembleResult(
+        radius_deg=float(radius_deg),
+        seed=seed,
+        limits_deg=tuple(limits),
+        quantile_levels=levels,
+        worst_max_altitudes_deg=altitudes,
+        margin_quantiles_deg=tuple(margin_quantiles),
+        pass_probability=tuple(pass_probability),
+    )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .geometry import EARTH_OBLIQUITY_DEG, LatLon, SunGrid
+from .point_index import fixed_order_dots
+from .solver import (
+    DEFAULT_MAX_BYTES,
+    _FLOAT_BYTES,
+    _build_witness,
+    _parse_limits,
+    _unit_vectors,
+    _validate_grid_options,
+    coverage_result,
+)
+from ..models.country import CountryArrays
+from ..models.result import CoverageResult
+
+
+class TerritorySession:
+    """Grid-engine solve that keeps its max-dot field so points can be added or removed.
+
+    The session holds, per grid cell, the best and second-best dot and the indices of the
+    points attaining them. Adding a point is one pass over the grid; removing one recomputes
+    only the cells where it was best or second best. Results are bitwise identical to
+    ``check_never_sets`` on the current points. Indices follow the current point list, so
+    removing a point shifts the ones after it down by one, as with ``list.pop``.
+    """
+
+    def __init__(
+        self,
+        territory_points: Union[Iterable[LatLon], CountryArrays],
+        *,
+        decl_step_deg: float = 0.10,
+        hour_angle_step_deg: float = 0.10,
+        obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+        return_multiple_best_points: bool = True,
+        tie_tol: float = 1e-12,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        sun_grid: Optional[SunGrid] = None,
+    ) -> None:
+        _validate_grid_options(decl_step_deg, hour_angle_step_deg, obliquity_deg, tie_tol, max_bytes, sun_grid)
+        if isinstance(territory_points, CountryArrays):
+            self._points: List[LatLon] = list(zip(territory_points.lat.tolist(), territory_points.lon.tolist()))
+            # Shared, not copied: add_point/remove_point replace self._N rather than write to it.
+            self._N = territory_points.unit_vectors
+        else:
+            self._points = [(float(lat), float(lon)) for lat, lon in territory_points]
+            self._N = _unit_vectors(self._points)
+        self._tie_tol = tie_tol
+        self._multiple = return_multiple_best_points
+        self._max_bytes = max_bytes
+        self.grid = (
+            sun_grid
+            or SunGrid(
+                obliquity_deg=obliquity_deg,
+                decl_step_deg=decl_step_deg,
+                hour_angle_step_deg=hour_angle_step_deg,
+            )
+        ).materialize()
+        # Flat (D*H,3) Sun directions, row-major over (decl, hour) like the (D,H) fields.
+        self._dirs = np.ascontiguousarray(self.grid.sun_vectors.transpose(0, 2, 1).reshape(-1, 3))
+
+        cells = self._dirs.shape[0]
+        self._top1 = np.empty(cells)
+        self._top2 = np.empty(cells)
+        self._top1_idx = np.empty(cells, dtype=np.intp)
+        self._top2_idx = np.empty(cells, dtype=np.intp)
+        self._recompute(np.arange(cells), keep_top1=False)
+
+    @property
+    def points(self) -> List[LatLon]:
+        return list(self._points)
+
+    @property
+    def size(self) -> int:
+        return len(self._points)
+
+    def _recompute(self, cells: np.ndarray, *, keep_top1: bool) -> None:
+        # Rescan all points at `cells`: top-2 from scratch, or only the runner-up to top1_idx.
+        K = self._N.shape[0]
+        step = max(1, self._max_bytes // (2 * K * _FLOAT_BYTES))
+        for c0 in range(0, cells.size, step):
+            c = cells[c0 : c0 + step]
+            rows = np.arange(c.size)
+            dots = fixed_order_dots(self._N, self._dirs[c])  # (m,K)
+            if keep_top1:
+                i1 = self._top1_idx[c]
+            else:
+                i1 = np.argmax(dots, axis=1)
+                self._top1[c] = dots[rows, i1]
+                self._top1_idx[c] = i1
+            if K == 1:
+                self._top2[c] = -np.inf
+                self._top2_idx[c] = -1
+                continue
+            dots[rows, i1] = -np.inf
+            i2 = np.argmax(dots, axis=1)
+            self._top2[c] = dots[rows, i2]
+            self._top2_idx[c] = i2
+
+    def add_point(self, lat: float, lon: float) -> int:
+        """Add a point and return its index."""
+        n = _unit_vectors([(float(lat), float(lon))])
+        j = len(self._points)
+        dots = fixed_order_dots(n, self._dirs)[:, 0]
+        # Strict comparisons keep the earlier point first on ties, like argmax in a full rescan.
+        new_top1 = dots > self._top1
+        new_top2 = ~new_top1 & (dots > self._top2)
+        self._top2[new_top1] = self._top1[new_top1]
+        self._top2_idx[new_top1] = self._top1_idx[new_top1]
+        self._top1[new_top1] = dots[new_top1]
+        self._top1_idx[new_top1] = j
+        self._top2[new_top2] = dots[new_top2]
+        self._top2_idx[new_top2] = j
+
+        self._points.append((float(lat), float(lon)))
+        self._N = np.vstack([self._N, n])
+        return j
+
+    def remove_point(self, index: int) -> LatLon:
+        """Remove the point at ``index`` and return it."""
+        K = len(self._points)
+        if K == 1:
+            raise ValueError("A session must keep at least one point.")
+        if not (-K <= index < K):
+            raise IndexError("point index out of range.")
+        j = index % K
+
+        was_top1 = self._top1_idx == j
+        affected = np.flatnonzero(was_top1 | (self._top2_idx == j))
+        self._top1[was_top1] = self._top2[was_top1]
+        self._top1_idx[was_top1] = self._top2_idx[was_top1]
+
+        point = self._points.pop(j)
+        self._N = np.delete(self._N, j, axis=0)
+        for idx in (self._top1_idx, self._top2_idx):
+            idx[idx > j] -= 1
+        self._recompute(affected, keep_top1=True)
+        return point
+
+    def result(
+        self, visibility_limit_deg: Union[float, Sequence[float]] = 0.0
+    ) -> Union[CoverageResult, List[CoverageResult]]:
+        """Coverage result(s) for the current points, as ``check_never_sets`` would return."""
+        single_limit, limits = _parse_limits(visibility_limit_deg)
+        # Row-major argmin picks the first declination, then the first hour, at the minimum.
+        cell = int(np.argmin(self._top1))
+        decl_idx, hour_idx = divmod(cell, self.grid.shape[1])
+        witness = _build_witness(
+            self._N,
+            float(self.grid.decls[decl_idx]),
+            float(self.grid.hour_angles[hour_idx]),
+            float(self._top1[cell]),
+            tie_tol=self._tie_tol,
+            return_multiple_best_points=self._multiple,
+        )
+        results = [coverage_result(witness, limit) for limit in limits]
+        return results[0] if single_limit else results
@@ -1,103 +1,617 @@
 from __future__ import annotations
 
 import math
-from typing import Iterable, Optional, Tuple
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
-from .geometry import EARTH_OBLIQUITY_DEG, LatLon, latlon_to_unit
+from .adaptive import DEFAULT_MAX_CELLS, DEFAULT_TOLERANCE_DEG, adaptive_min_max_dot
+from .backends import BACKENDS, NumpyBackend, _block_dots, _row_min, get_backend
+from .decide import _max_dots, decide_min_max_dot
+from .envelope import envelope_min_max_dot
+from .field import FIELD_DTYPES, CoverageField
+from .geometry import EARTH_OBLIQUITY_DEG, LatLon, SunGrid, latlon_to_unit_array, sun_vector_block
+from .point_index import PointIndex
+from .pruning import dominated_mask
+from ..models.country import CountryArrays
 from ..models.result import CoverageResult, Witness
 
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENGINES = ("grid", "adaptive", "envelope")
+MODES = ("solve", "decide")
+PRECISIONS = ("float64", "mixed")
+_FLOAT_BYTES = np.dtype(float).itemsize
+# Per-direction working set of a PointIndex query (seed dots plus a leaf), in points.
+_INDEX_POINTS_PER_DIRECTION = 512
+# Bound on |GEMM dot - fixed-order dot| for unit vectors (a few ulps of 1, with headroom).
+_GEMM_SLACK = 1e-14
+# Bound on |float32 max dot - float64 max dot| for unit vectors: rounding the inputs to float32
+# plus three products and two sums, about 6 float32 ulps of 1, with headroom.
+_FLOAT32_SLACK = 1e-6
+# GEMM blocks past a few MiB only add memory traffic; the fused sweep caps its blocks here.
+_GEMM_BLOCK_BYTES = 4 * 1024 * 1024
 
-def check_never_sets(
-    territory_points: Iterable[LatLon],
-    *,
-    visibility_limit_deg: float = 0.0,
-    decl_step_deg: float = 0.10,
-    hour_angle_step_deg: float = 0.10,
-    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
-    return_multiple_best_points: bool = True,
-    tie_tol: float = 1e-12,
-) -> CoverageResult:
-    pts = list(territory_points)
-    if not pts:
-        raise ValueError("territory_points must contain at least one (lat, lon) pair.")
+
+def _block_shape(D: int, K: int, H: int, max_bytes: int) -> Tuple[int, int]:
+    # Budget covers the (d,K,h) dots block and its one temporary; sun vectors and max rows
+    # are O(d*h) on top.
+    per_cell = 2 * K * _FLOAT_BYTES
+    cells = max(1, max_bytes // per_cell)
+    if cells >= H:
+        return max(1, min(D, cells // H)), H
+    return 1, int(cells)
+
+
+def _iter_sun_blocks(
+    grid: SunGrid,
+    points_per_cell: int,
+    max_bytes: int,
+) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+    # Every sweep walks the grid through here: (ds, hs, (d,3,h) Sun block) in row-major block
+    # order, with blocks sized so points_per_cell float pairs per cell fit in max_bytes.
+    D, H = grid.shape
+    bd, bh = _block_shape(D, points_per_cell, H, max_bytes)
+    for d0 in range(0, D, bd):
+        ds = slice(d0, min(d0 + bd, D))
+        for h0 in range(0, H, bh):
+            hs = slice(h0, min(h0 + bh, H))
+            yield ds, hs, grid.block(ds, hs)
+
+
+def _iter_dot_blocks(N: np.ndarray, grid: SunGrid, max_bytes: int) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+    # (ds, hs, (d,K,h) dots) for sweeps that reduce the dots themselves; Sun blocks are cast
+    # to N's dtype (float32 for the mixed-precision sweep).
+    for ds, hs, sun in _iter_sun_blocks(grid, N.shape[0], max_bytes):
+        yield ds, hs, _block_dots(N, sun.astype(N.dtype, copy=False))
+
+
+def _iter_index_max_dot_blocks(
+    grid: SunGrid,
+    max_bytes: int,
+    point_index: PointIndex,
+) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+    points = min(point_index.size, _INDEX_POINTS_PER_DIRECTION)
+    for ds, hs, sun in _iter_sun_blocks(grid, points, max_bytes):
+        dirs = sun.transpose(0, 2, 1).reshape(-1, 3)
+        yield ds, hs, point_index.max_dot(dirs)[0].reshape(sun.shape[0], sun.shape[2])
+
+
+def _merge_block_min(
+    min_max_per_decl: np.ndarray,
+    hour_idx_per_decl: np.ndarray,
+    ds: slice,
+    hs: slice,
+    local_min: np.ndarray,
+    local_idx: np.ndarray,
+) -> None:
+    # Strict comparison keeps the first occurrence, matching np.argmin over the full row.
+    better = local_min < min_max_per_decl[ds]
+    min_max_per_decl[ds] = np.where(better, local_min, min_max_per_decl[ds])
+    hour_idx_per_decl[ds] = np.where(better, local_idx + hs.start, hour_idx_per_decl[ds])
+
+
+def _fold_row_minima(
+    shape: Union[int, Tuple[int, ...]],
+    blocks: Iterable[Tuple[slice, slice, np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Merge (ds, hs, local_min, local_idx) block results into per-declination minima of the
+    # given shape (D, or (D,T) for stacked territories) and the first hour index attaining them.
+    min_max_per_decl = np.full(shape, np.inf)
+    hour_idx_per_decl = np.zeros(shape, dtype=np.intp)
+    for ds, hs, local_min, local_idx in blocks:
+        _merge_block_min(min_max_per_decl, hour_idx_per_decl, ds, hs, local_min, local_idx)
+    return min_max_per_decl, hour_idx_per_decl
+
+
+def _sweep_min_max(
+    N: np.ndarray,
+    grid: SunGrid,
+    max_bytes: int,
+    point_index: Optional[PointIndex] = None,
+    backend: Optional[NumpyBackend] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Per-declination min over H of max_i n_i·s, plus the first hour index attaining it.
+    D = grid.shape[0]
+    if point_index is not None:
+        blocks = _iter_index_max_dot_blocks(grid, max_bytes, point_index)
+        return _fold_row_minima(D, ((ds, hs, *_row_min(max_dots)) for ds, hs, max_dots in blocks))
+
+    backend = backend or get_backend("numpy")
+    blocks = _iter_sun_blocks(grid, backend.points_per_cell(N.shape[0]), max_bytes)
+    return _fold_row_minima(D, ((ds, hs, *backend.row_min_max(N, sun)) for ds, hs, sun in blocks))
+
+
+def _sweep_min_max_field(
+    N: np.ndarray,
+    grid: SunGrid,
+    max_bytes: int,
+    field: CoverageField,
+    point_ids: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # _sweep_min_max on the NumPy path, also streaming each block's max and argmax into
+    # `field`. The max is read through the argmax, so both fields agree with the reduction.
+    # point_ids maps rows of N back to the caller's point indices (after pruning).
+    def blocks() -> Iterator[Tuple[slice, slice, np.ndarray, np.ndarray]]:
+        for ds, hs, dots in _iter_dot_blocks(N, grid, max_bytes):
+            idx = dots.argmax(axis=1)
+            max_dots = np.take_along_axis(dots, idx[:, None, :], axis=1)[:, 0, :]
+            field.write_block(ds, hs, max_dots, idx if point_ids is None else point_ids[idx])
+            yield (ds, hs, *_row_min(max_dots))
+
+    minima = _fold_row_minima(grid.shape[0], blocks())
+    field.flush()
+    return minima
+
+
+def _near_min_cells(N: np.ndarray, grid: SunGrid, max_bytes: int, width: float) -> Tuple[np.ndarray, np.ndarray]:
+    # (decl_idx, hour_idx) of the cells whose max dot is within `width` of the minimum, in
+    # row-major order. Streamed: cells are kept against the running minimum and re-filtered
+    # as it drops.
+    H = grid.shape[1]
+    best = np.inf
+    cells = np.empty(0, dtype=np.intp)
+    values = np.empty(0, dtype=N.dtype)
+    for ds, hs, dots in _iter_dot_blocks(N, grid, max_bytes):
+        max_dots = dots.max(axis=1)
+        best = min(best, float(max_dots.min()))
+        d, h = np.nonzero(max_dots <= best + width)
+        cells = np.concatenate([cells, (d + ds.start) * H + h + hs.start])
+        values = np.concatenate([values, max_dots[d, h]])
+        keep = values <= best + width
+        cells, values = cells[keep], values[keep]
+    cells.sort()
+    return np.divmod(cells, H)
+
+
+def _sweep_min_mixed(N: np.ndarray, grid: SunGrid, max_bytes: int) -> Tuple[int, int, float]:
+    # Global (decl_idx, hour_idx, min max dot) of the float64 sweep, from a float32 sweep.
+    # Only cells within 2*_FLOAT32_SLACK of the float32 minimum can hold the float64 minimum;
+    # they are re-evaluated in float64 with the sweep's rounding, and the first of them in
+    # row-major order attaining the minimum is the cell the float64 sweep would report.
+    # Half-width floats: the same budget holds blocks of twice as many cells.
+    di, hi = _near_min_cells(N.astype(np.float32), grid, 2 * max_bytes, 2 * _FLOAT32_SLACK)
+    exact = _max_dots(N, grid, di, hi, max_bytes)
+    i = int(np.argmin(exact))
+    return int(di[i]), int(hi[i]), float(exact[i])
+
+
+def _sweep_leave_one_out(
+    N: np.ndarray,
+    grid: SunGrid,
+    max_bytes: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # _sweep_min_max plus, for every point k, the min over the grid of the max dot without k.
+    # Removing k only changes the cells where k is the (first) maximiser, where the max drops
+    # to the runner-up, so per point we keep the min of the best dot over the cells it wins
+    # (m1) and the min of the runner-up there (m2).
+    K = N.shape[0]
+    m1 = np.full(K, np.inf)
+    m2 = np.full(K, np.inf)
+
+    def blocks() -> Iterator[Tuple[slice, slice, np.ndarray, np.ndarray]]:
+        for ds, hs, dots in _iter_dot_blocks(N, grid, max_bytes):  # (d,K,h)
+            i1 = np.argmax(dots, axis=1)[:, None, :]
+            top1 = np.take_along_axis(dots, i1, axis=1)[:, 0, :]
+            np.put_along_axis(dots, i1, -np.inf, axis=1)
+            top2 = dots.max(axis=1)
+            np.minimum.at(m1, i1.ravel(), top1.ravel())
+            np.minimum.at(m2, i1.ravel(), top2.ravel())
+            yield (ds, hs, *_row_min(top1))
+
+    min_max_per_decl, hour_idx_per_decl = _fold_row_minima(grid.shape[0], blocks())
+
+    # Cells won by other points keep their best dot: min over j != k of m1[j].
+    first = int(np.argmin(m1))
+    others = np.full(K, m1[first])
+    others[first] = np.delete(m1, first).min() if K > 1 else np.inf
+    # A territory left without points never sees the Sun: clamp to the nadir.
+    leave_one_out = np.maximum(np.minimum(others, m2), -1.0)
+    return min_max_per_decl, hour_idx_per_decl, leave_one_out
+
+
+def _segment_max_exact(
+    N: np.ndarray, starts: np.ndarray, sizes: np.ndarray, dirs: np.ndarray, seg: np.ndarray
+) -> np.ndarray:
+    # Fixed-order max over territory `seg[c]` for each Sun direction `dirs[c]` (same rounding
+    # as _block_dots), evaluated only for the pairs the GEMM pass could not rule out.
+    counts = sizes[seg]
+    first = np.cumsum(counts) - counts
+    rows = np.arange(counts.sum()) - np.repeat(first - starts[seg], counts)
+    S = np.repeat(dirs, counts, axis=0)
+    P = N[rows]
+    out = np.multiply(P[:, 0], S[:, 0])
+    tmp = np.multiply(P[:, 1], S[:, 1])
+    out += tmp
+    np.multiply(P[:, 2], S[:, 2], out=tmp)
+    out += tmp
+    return np.maximum.reduceat(out, first)
+
+
+def _slab_groups(starts: np.ndarray, sizes: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray, int]]:
+    # Territories grouped by size rounded up to a power of two, P. Within a group, column
+    # p*T + t holds point p (cyclically repeated as padding) of territory t, so a GEMM block
+    # reshaped to (rows, P, T) reduces with a slab-wise max instead of a slow reduceat.
+    P_all = 1 << np.ceil(np.log2(sizes)).astype(int)
+    groups = []
+    for P in np.unique(P_all):
+        members = np.nonzero(P_all == P)[0]
+        rows = starts[members] + np.arange(P)[:, None] % sizes[members]  # (P,T)
+        groups.append((members, rows.ravel(), int(P)))
+    return groups
+
+
+def _sweep_min_max_many(
+    N: np.ndarray,
+    starts: np.ndarray,
+    grid: SunGrid,
+    max_bytes: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # (D,T) version of _sweep_min_max for territories stacked in N from row starts[t].
+    # Each block is one GEMM per size group plus a slab max; GEMM rounding (FMA, blocking)
+    # differs from the fixed order by at most _GEMM_SLACK, so only hours within 2*_GEMM_SLACK
+    # of the block minimum are re-evaluated exactly. The result matches per-territory sweeps
+    # bit for bit.
+    T = starts.size
+    sizes = np.diff(np.append(starts, N.shape[0]))
+    groups = [(members, np.ascontiguousarray(N[rows].T), P) for members, rows, P in _slab_groups(starts, sizes)]
+    points = sum(NT.shape[1] for _, NT, _ in groups)
+
+    def blocks() -> Iterator[Tuple[slice, slice, np.ndarray, np.ndarray]]:
+        for ds, hs, sun in _iter_sun_blocks(grid, points, min(max_bytes, _GEMM_BLOCK_BYTES)):
+            d, h = sun.shape[0], sun.shape[2]
+            dirs = sun.transpose(0, 2, 1).reshape(-1, 3)
+            approx = np.empty((d * h, T))
+            for members, NT, P in groups:
+                approx[:, members] = (dirs @ NT).reshape(-1, P, members.size).max(axis=1)
+            approx = approx.reshape(d, h, T)
+            cand = approx <= approx.min(axis=1, keepdims=True) + 2 * _GEMM_SLACK
+            cd, ch, ct = np.nonzero(cand)
+            exact = np.full((d, h, T), np.inf)
+            exact[cd, ch, ct] = _segment_max_exact(N, starts, sizes, dirs[cd * h + ch], ct)
+            local_idx = np.argmin(exact, axis=1)
+            yield ds, hs, np.take_along_axis(exact, local_idx[:, None, :], axis=1)[:, 0, :], local_idx
+
+    return _fold_row_minima((grid.shape[0], T), blocks())
+
+
+def _sweep_min_max_many_fused(
+    N: np.ndarray,
+    starts: np.ndarray,
+    grid: SunGrid,
+    max_bytes: int,
+    backend: NumpyBackend,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # _sweep_min_max_many through a backend's fused per-territory reduction (the Numba
+    # kernel): no GEMM and no exact re-evaluation, the same rounding as per-territory sweeps.
+    blocks = _iter_sun_blocks(grid, backend.points_per_cell(N.shape[0]), max_bytes)
+    return _fold_row_minima(
+        (grid.shape[0], starts.size), ((ds, hs, *backend.row_min_max_many(N, starts, sun)) for ds, hs, sun in blocks)
+    )
+
+
+def _parse_limits(visibility_limit_deg: Union[float, Sequence[float]]) -> Tuple[bool, List[float]]:
+    # A sequence of limits is evaluated from one sweep and returns one result per limit.
+    single_limit = np.ndim(visibility_limit_deg) == 0
+    limits = [float(visibility_limit_deg)] if single_limit else [float(x) for x in visibility_limit_deg]
+    if not limits:
+        raise ValueError("visibility_limit_deg must contain at least one limit.")
+    if not all(-90.0 <= limit <= 90.0 for limit in limits):
+        raise ValueError("visibility_limit_deg must be between -90 and 90 degrees.")
+    return single_limit, limits
+
+
+def _validate_grid_options(
+    decl_step_deg: float,
+    hour_angle_step_deg: float,
+    obliquity_deg: float,
+    tie_tol: float,
+    max_bytes: Optional[int],
+    sun_grid: Optional[SunGrid],
+) -> None:
     if decl_step_deg <= 0:
         raise ValueError("decl_step_deg must be positive.")
     if hour_angle_step_deg <= 0:
         raise ValueError("hour_angle_step_deg must be positive.")
     if not (0.0 <= obliquity_deg <= 90.0):
         raise ValueError("obliquity_deg must be between 0 and 90 degrees.")
-    if not (-90.0 <= visibility_limit_deg <= 90.0):
-        raise ValueError("visibility_limit_deg must be between -90 and 90 degrees.")
     if tie_tol < 0:
         raise ValueError("tie_tol must be non-negative.")
+    if max_bytes is not None and max_bytes <= 0:
+        raise ValueError("max_bytes must be positive (or None for a single unbounded block).")
+    if sun_grid is not None and not sun_grid.matches(obliquity_deg, decl_step_deg, hour_angle_step_deg):
+        raise ValueError("sun_grid was built for a different obliquity or step sizes.")
 
-    for lat, lon in pts:
-        if not (math.isfinite(lat) and math.isfinite(lon)):
-            raise ValueError("territory_points must contain finite latitude/longitude values.")
-        if not (-90.0 <= lat <= 90.0):
-            raise ValueError("territory_points must have latitude within [-90, 90].")
-        if not (-180.0 <= lon <= 180.0):
-            raise ValueError("territory_points must have longitude within [-180, 180].")
 
-    N = np.vstack([latlon_to_unit(lat, lon) for lat, lon in pts])  # (K,3)
-    limit_dot = math.sin(math.radians(visibility_limit_deg))
+def _unit_vectors(pts: Sequence[LatLon]) -> np.ndarray:
+    if not pts:
+        raise ValueError("territory_points must contain at least one (lat, lon) pair.")
+    latlon = np.asarray(pts, dtype=float)
+    if latlon.ndim != 2 or latlon.shape[1] != 2:
+        raise ValueError("territory_points must be (lat, lon) pairs.")
+    lat, lon = latlon[:, 0], latlon[:, 1]
+    if not (np.isfinite(lat).all() and np.isfinite(lon).all()):
+        raise ValueError("territory_points must contain finite latitude/longitude values.")
+    if (np.abs(lat) > 90.0).any():
+        raise ValueError("territory_points must have latitude within [-90, 90].")
+    if (np.abs(lon) > 180.0).any():
+        raise ValueError("territory_points must have longitude within [-180, 180].")
+    return latlon_to_unit_array(lat, lon)  # (K,3)
+
 
-    decls = np.arange(-obliquity_deg, obliquity_deg + 1e-12, decl_step_deg, dtype=float)
-    Hs = np.arange(0.0, 360.0, hour_angle_step_deg, dtype=float)
-
-    h = np.deg2rad(Hs)
-    cos_h = np.cos(h)
-    sin_h = np.sin(h)
-    d = np.deg2rad(decls)
-    cd = np.cos(d)
-    sd = np.sin(d)
-
-    sun_vectors = np.stack(
-        [
-            cd[:, None] * cos_h[None, :],
-            cd[:, None] * sin_h[None, :],
-            np.broadcast_to(sd[:, None], (decls.size, Hs.size)),
-        ],
-        axis=1,
-    )  # (D,3,H)
-
-    dots = np.einsum("kq,dqh->dkh", N, sun_vectors)  # (D,K,H)
-    max_dots = dots.max(axis=1)  # (D,H)
-    hour_idx_per_decl = np.argmin(max_dots, axis=1)  # (D,)
-    min_max_per_decl = max_dots[np.arange(decls.size), hour_idx_per_decl]
-
-    decl_idx = int(np.argmin(min_max_per_decl))
-    hour_idx = int(hour_idx_per_decl[decl_idx])
-
-    global_min_max_dot = float(min_max_per_decl[decl_idx])
-    w_decl = float(decls[decl_idx])
-    w_H = float(Hs[hour_idx])
-
-    col = dots[decl_idx, :, hour_idx]
+def _territory_vectors(territory_points: Union[Iterable[LatLon], CountryArrays]) -> np.ndarray:
+    # Columnar territories were validated on load and hand over their unit vectors uncopied.
+    if isinstance(territory_points, CountryArrays):
+        return territory_points.unit_vectors
+    return _unit_vectors(list(territory_points))
+
+
+def _build_witness(
+    N: np.ndarray,
+    decl_deg: float,
+    hour_angle_deg: float,
+    worst_max_dot: Optional[float],
+    *,
+    tie_tol: float,
+    return_multiple_best_points: bool,
+    bounds: Optional[Tuple[float, float]] = None,
+    leave_one_out: Optional[np.ndarray] = None,
+) -> Witness:
+    # Recompute the witness column exactly as the sweep did, instead of keeping the (D,K,H) tensor.
+    # A worst_max_dot of None takes the column max (engines that locate, not sample, the minimum).
+    d = np.deg2rad(np.array([decl_deg]))
+    h = np.deg2rad(np.array([hour_angle_deg]))
+    sun = sun_vector_block(np.cos(d), np.sin(d), np.cos(h), np.sin(h))
+    col = _block_dots(N, sun)[0, :, 0]
     best = float(col.max())
+    if worst_max_dot is None:
+        worst_max_dot = best
     if return_multiple_best_points:
         idxs = np.where(col >= best - tie_tol)[0]
         best_indices = tuple(int(i) for i in idxs.tolist())
     else:
         best_indices = (int(np.argmax(col)),)
 
-    worst_alt = math.degrees(math.asin(float(np.clip(global_min_max_dot, -1.0, 1.0))))
-    always = (global_min_max_dot > limit_dot) or math.isclose(global_min_max_dot, limit_dot, abs_tol=1e-15)
-
-    witness = Witness(
-        decl_deg=w_decl,
-        hour_angle_deg=w_H,
-        worst_max_dot=float(global_min_max_dot),
+    worst_alt = math.degrees(math.asin(float(np.clip(worst_max_dot, -1.0, 1.0))))
+    loo_alts = None
+    if leave_one_out is not None:
+        loo_alts = tuple(math.degrees(math.asin(float(np.clip(v, -1.0, 1.0)))) for v in leave_one_out)
+    return Witness(
+        decl_deg=float(decl_deg),
+        hour_angle_deg=float(hour_angle_deg),
+        worst_max_dot=float(worst_max_dot),
         worst_max_altitude_deg=float(worst_alt),
         best_point_indices=best_indices,
+        worst_max_dot_bounds=bounds,
+        leave_one_out_altitude_deg=loo_alts,
     )
 
+
+def coverage_result(witness: Witness, visibility_limit_deg: float) -> CoverageResult:
+    # The witness does not depend on the limit; each limit only changes verdict and margin.
+    limit_dot = math.sin(math.radians(visibility_limit_deg))
+    dot = witness.worst_max_dot
+    always = (dot > limit_dot) or math.isclose(dot, limit_dot, abs_tol=1e-15)
     return CoverageResult(
         always_daylight_somewhere=bool(always),
         limit_altitude_deg=float(visibility_limit_deg),
         limit_dot=float(limit_dot),
         witness=witness,
-        margin_altitude_deg=float(worst_alt - visibility_limit_deg),
+        margin_altitude_deg=float(witness.worst_max_altitude_deg - visibility_limit_deg),
     )
+
+
+def check_never_sets(
+    territory_points: Union[Iterable[LatLon], CountryArrays],
+    *,
+    visibility_limit_deg: Union[float, Sequence[float]] = 0.0,
+    decl_step_deg: float = 0.10,
+    hour_angle_step_deg: float = 0.10,
+    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+    return_multiple_best_points: bool = True,
+    tie_tol: float = 1e-12,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    engine: str = "grid",
+    tolerance_deg: float = DEFAULT_TOLERANCE_DEG,
+    max_cells: int = DEFAULT_MAX_CELLS,
+    prune_dominated: bool = False,
+    point_index: Optional[PointIndex] = None,
+    sun_grid: Optional[SunGrid] = None,
+    criticality: bool = False,
+    mode: str = "solve",
+    backend: str = "auto",
+    precision: str = "float64",
+    field_dir: Optional[str | Path] = None,
+    field_dtype: str = "float64",
+) -> Union[CoverageResult, List[CoverageResult]]:
+    """Check that for every Sun direction some point sees the Sun above each visibility limit.
+
+    With ``field_dir`` the grid sweep also writes the full coverage field there (see
+    ``CoverageField``; ``field_dtype="float32"`` halves the max-dot file), streamed block by
+    block from the NumPy sweep.
+    """
+    single_limit, limits = _parse_limits(visibility_limit_deg)
+    N = _territory_vectors(territory_points)
+    _validate_grid_options(decl_step_deg, hour_angle_step_deg, obliquity_deg, tie_tol, max_bytes, sun_grid)
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}.")
+    if tolerance_deg <= 0:
+        raise ValueError("tolerance_deg must be positive.")
+    if max_cells < 1:
+        raise ValueError("max_cells must be at least 1.")
+
+    if point_index is not None:
+        if engine != "grid":
+            raise ValueError("point_index is only used by the grid engine.")
+        if prune_dominated:
+            raise ValueError("point_index already prunes per query; do not combine it with prune_dominated.")
+        if point_index.size != N.shape[0]:
+            raise ValueError("point_index must be built from the same territory_points.")
+    if criticality and (engine != "grid" or prune_dominated or point_index is not None):
+        raise ValueError("criticality needs the plain grid engine (no pruning or point_index).")
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}.")
+    if mode == "decide" and (engine != "grid" or criticality or point_index is not None):
+        raise ValueError("mode='decide' needs the grid engine without criticality or point_index.")
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}.")
+    # Backends only run the plain grid sweep; elsewhere an explicit choice would be ignored.
+    plain_sweep = engine == "grid" and mode == "solve" and not criticality and point_index is None
+    if backend != "auto" and not plain_sweep:
+        raise ValueError("backend only applies to the plain grid sweep (no decide mode, criticality or point_index).")
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {', '.join(PRECISIONS)}.")
+    if precision == "mixed" and (not plain_sweep or backend == "numba"):
+        raise ValueError("precision='mixed' needs the plain grid sweep on the numpy backend.")
+    if field_dtype not in FIELD_DTYPES:
+        raise ValueError(f"field_dtype must be one of {', '.join(FIELD_DTYPES)}.")
+    if field_dir is not None and (not plain_sweep or precision != "float64" or backend == "numba"):
+        raise ValueError("field_dir needs the plain float64 grid sweep on the numpy backend.")
+
+    # Dominated points are strictly below the max everywhere in the band, so the sweep can skip
+    # them; the witness column below still runs over all points to keep original indices.
+    keep = ~dominated_mask(N, obliquity_deg=obliquity_deg) if prune_dominated else None
+    N_sweep = N[keep] if keep is not None else N
+
+    # The grid is lazy: without a shared (materialised) one, blocks are computed as needed.
+    grid = sun_grid or SunGrid(
+        obliquity_deg=obliquity_deg,
+        decl_step_deg=decl_step_deg,
+        hour_angle_step_deg=hour_angle_step_deg,
+    )
+    if mode == "decide":
+        # Only the verdict is exact: the witness is the first failing cell, or on PASS the
+        # lowest cell evaluated (its margin is then an upper bound). Each limit is decided alone.
+        results = []
+        for limit in limits:
+            _, decl_idx, hour_idx, value = decide_min_max_dot(
+                N_sweep,
+                grid,
+                math.sin(math.radians(limit)),
+                max_bytes=max_bytes if max_bytes is not None else DEFAULT_MAX_BYTES,
+            )
+            witness = _build_witness(
+                N,
+                float(grid.decls[decl_idx]),
+                float(grid.hour_angles[hour_idx]),
+                value,
+                tie_tol=tie_tol,
+                return_multiple_best_points=return_multiple_best_points,
+            )
+            results.append(coverage_result(witness, limit))
+        return results[0] if single_limit else results
+
+    bounds: Optional[Tuple[float, float]] = None
+    leave_one_out: Optional[np.ndarray] = None
+    if engine == "adaptive":
+        w_decl, w_H, global_min_max_dot, bounds = adaptive_min_max_dot(
+            N_sweep,
+            obliquity_deg=obliquity_deg,
+            tolerance_deg=tolerance_deg,
+            max_cells=max_cells,
+            max_bytes=max_bytes if max_bytes is not None else DEFAULT_MAX_BYTES,
+        )
+    elif engine == "envelope":
+        decls = grid.decls
+        min_max_per_decl, hour_per_decl = envelope_min_max_dot(N_sweep, decls, max_bytes)
+        decl_idx = int(np.argmin(min_max_per_decl))
+        w_decl = float(decls[decl_idx])
+        w_H = float(hour_per_decl[decl_idx])
+    else:
+        decls, Hs = grid.decls, grid.hour_angles
+        if max_bytes is None:
+            max_bytes = 2 * decls.size * N_sweep.shape[0] * Hs.size * _FLOAT_BYTES
+        if precision == "mixed":
+            decl_idx, hour_idx, global_min_max_dot = _sweep_min_mixed(N_sweep, grid, max_bytes)
+        else:
+            if criticality:
+                min_max_per_decl, hour_idx_per_decl, leave_one_out = _sweep_leave_one_out(N, grid, max_bytes)
+            elif field_dir is not None:
+                field = CoverageField.create(field_dir, grid, N.shape[0], dtype=field_dtype)
+                point_ids = np.flatnonzero(keep) if keep is not None else None
+                min_max_per_decl, hour_idx_per_decl = _sweep_min_max_field(N_sweep, grid, max_bytes, field, point_ids)
+            else:
+                compute = get_backend(backend) if point_index is None else None
+                min_max_per_decl, hour_idx_per_decl = _sweep_min_max(N_sweep, grid, max_bytes, point_index, compute)
+            decl_idx = int(np.argmin(min_max_per_decl))
+            hour_idx = int(hour_idx_per_decl[decl_idx])
+            global_min_max_dot = float(min_max_per_decl[decl_idx])
+
+        w_decl = float(decls[decl_idx])
+        w_H = float(Hs[hour_idx])
+
+    witness = _build_witness(
+        N,
+        w_decl,
+        w_H,
+        None if engine == "envelope" else global_min_max_dot,
+        tie_tol=tie_tol,
+        return_multiple_best_points=return_multiple_best_points,
+        bounds=bounds,
+        leave_one_out=leave_one_out,
+    )
+    results = [coverage_result(witness, limit) for limit in limits]
+    return results[0] if single_limit else results
+
+
+def check_never_sets_many(
+    territories: Iterable[Union[Iterable[LatLon], CountryArrays]],
+    *,
+    visibility_limit_deg: Union[float, Sequence[float]] = 0.0,
+    decl_step_deg: float = 0.10,
+    hour_angle_step_deg: float = 0.10,
+    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+    return_multiple_best_points: bool = True,
+    tie_tol: float = 1e-12,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    sun_grid: Optional[SunGrid] = None,
+    backend: str = "auto",
+) -> List[Union[CoverageResult, List[CoverageResult]]]:
+    """Grid-engine solve of many territories in one sweep; one result (or list) per territory.
+
+    All unit vectors are stacked and each Sun block is reduced per territory, so results
+    match per-territory ``check_never_sets`` calls exactly. With the Numba backend (the
+    ``"auto"`` default when installed) one kernel reduces every territory, four hours at a
+    time, and beats a loop of Numba ``check_never_sets`` calls by 1.4-2x (300 territories
+    of 20 points at 1°: 0.19 s vs 0.27 s). With ``backend="numpy"`` each block is one GEMM
+    per size group plus a slab max: about 3x faster than a NumPy loop (0.57 s vs 1.85 s),
+    but slower than the Numba loop, so it only pays off when numba is not installed.
+    """
+    single_limit, limits = _parse_limits(visibility_limit_deg)
+    _validate_grid_options(decl_step_deg, hour_angle_step_deg, obliquity_deg, tie_tol, max_bytes, sun_grid)
+    compute = get_backend(backend)
+    Ns = [_territory_vectors(pts) for pts in territories]
+    if not Ns:
+        return []
+
+    sizes = np.array([n.shape[0] for n in Ns])
+    starts = np.cumsum(sizes) - sizes
+    N_all = np.vstack(Ns)
+    grid = sun_grid or SunGrid(
+        obliquity_deg=obliquity_deg,
+        decl_step_deg=decl_step_deg,
+        hour_angle_step_deg=hour_angle_step_deg,
+    )
+    decls, Hs = grid.decls, grid.hour_angles
+    if max_bytes is None:
+        max_bytes = 2 * decls.size * N_all.shape[0] * Hs.size * _FLOAT_BYTES
+    if compute.name == "numba":
+        min_max_per_decl, hour_idx_per_decl = _sweep_min_max_many_fused(N_all, starts, grid, max_bytes, compute)
+    else:
+        min_max_per_decl, hour_idx_per_decl = _sweep_min_max_many(N_all, starts, grid, max_bytes)
+
+    out: List[Union[CoverageResult, List[CoverageResult]]] = []
+    for t, N in enumerate(Ns):
+        decl_idx = int(np.argmin(min_max_per_decl[:, t]))
+        hour_idx = int(hour_idx_per_decl[decl_idx, t])
+        witness = _build_witness(
+            N,
+            float(decls[decl_idx]),
+            float(Hs[hour_idx]),
+            float(min_max_per_decl[decl_idx, t]),
+            tie_tol=tie_tol,
+            return_multiple_best_points=return_multiple_best_points,
+        )
+        results = [coverage_result(witness, limit) for limit in limits]
+        out.append(results[0] if single_limit else results)
+    return out
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .decide import _passes
+from .geometry import EARTH_OBLIQUITY_DEG, LatLon, SunGrid
+from .solver import (
+    DEFAULT_MAX_BYTES,
+    _FLOAT_BYTES,
+    _iter_dot_blocks,
+    _parse_limits,
+    _unit_vectors,
+    _validate_grid_options,
+)
+from ..models.result import ComponentSubset, SubsetAnalysis
+
+# 2^24 subsets is the largest enumeration kept in memory (a 16 MiB pass table).
+MAX_COMPONENTS = 24
+_SUBSET_CHUNK = 1 << 16
+
+
+def _iter_component_blocks(
+    components: Sequence[Sequence[LatLon]],
+    grid: SunGrid,
+    max_bytes: int,
+) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+    # (C,d,h) max dot over each component's points, one grid block at a time.
+    Ns = [_unit_vectors(list(pts)) for pts in components]
+    sizes = np.array([n.shape[0] for n in Ns])
+    starts = np.cumsum(sizes) - sizes
+    N = np.vstack(Ns)
+    for ds, hs, dots in _iter_dot_blocks(N, grid, max_bytes):
+        block = np.maximum.reduceat(dots, starts, axis=1)  # (d,C,h)
+        yield ds, hs, block.transpose(1, 0, 2)
+
+
+def component_fields(
+    components: Sequence[Sequence[LatLon]],
+    grid: SunGrid,
+    *,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> np.ndarray:
+    """(C,D,H) max dot over each component's points at every grid cell, from one sweep.
+
+    The result itself takes ``C*D*H*8`` bytes; ``max_bytes`` only bounds the sweep blocks.
+    """
+    D, H = grid.shape
+    fields = np.empty((len(components), D, H))
+    for ds, hs, block in _iter_component_blocks(components, grid, max_bytes):
+        fields[:, ds, hs] = block
+    return fields
+
+
+def _passing_table(cell_masks: np.ndarray, C: int) -> np.ndarray:
+    # passes[S] for every subset bitmask S: S must share a bit with every cell's mask. A cell
+    # whose mask contains another cell's mask is implied by it, so only the minimal masks
+    # are checked.
+    masks = np.unique(cell_masks)
+    if masks.size and masks[0] == 0:
+        return np.zeros(1 << C, dtype=bool)
+    keep = np.empty(0, dtype=np.int64)
+    for m in sorted(masks.tolist(), key=lambda m: bin(m).count("1")):
+        if not np.any(keep & m == keep):
+            keep = np.append(keep, m)
+    passes = np.empty(1 << C, dtype=bool)
+    for s0 in range(0, 1 << C, _SUBSET_CHUNK):
+        S = np.arange(s0, min(s0 + _SUBSET_CHUNK, 1 << C), dtype=np.int64)
+        ok = np.ones(S.size, dtype=bool)
+        for m in keep:
+            ok &= (S & m) != 0
+        passes[s0 : s0 + S.size] = ok
+    return passes
+
+
+def _minimal(passes: np.ndarray, C: int) -> List[int]:
+    # A passing subset is minimal if dropping any single member fails (passing is monotone).
+    S = np.arange(passes.size, dtype=np.int64)
+    minimal = passes.copy()
+    for c in range(C):
+        bit = 1 << c
+        minimal &= ~(((S & bit) != 0) & passes[S ^ bit])
+    found = np.flatnonzero(minimal)
+    popcount = np.array([bin(int(s)).count("1") for s in found], dtype=int)
+    return [int(s) for s in found[np.lexsort((found, popcount))]]
+
+
+def analyze_component_subsets(
+    components: Mapping[str, Sequence[LatLon]],
+    *,
+    visibility_limit_deg: Union[float, Sequence[float]] = 0.0,
+    decl_step_deg: float = 0.10,
+    hour_angle_step_deg: float = 0.10,
+    obliquity_deg: float = EARTH_OBLIQUITY_DEG,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    sun_grid: Optional[SunGrid] = None,
+) -> Union[SubsetAnalysis, List[SubsetAnalysis]]:
+    """Minimal sets of components that still never see the Sun set, per visibility limit.
+
+    Each component's max-dot field is swept once; any subset's grid result is the min over
+    cells of the elementwise max of its members' fields, so subsets are decided from per-cell
+    bitmasks of passing components without re-sweeping. Verdicts equal ``check_never_sets``
+    on the subset's points. Besides sweep blocks bounded by ``max_bytes``, memory is one int64
+    mask per cell and limit; the ``C*D*H`` fields themselves are cached only within
+    ``max_bytes``, and re-swept once for the minimal sets' worst cases otherwise.
+    """
+    single_limit, limits = _parse_limits(visibility_limit_deg)
+    _validate_grid_options(decl_step_deg, hour_angle_step_deg, obliquity_deg, 0.0, max_bytes, sun_grid)
+    names = tuple(components)
+    C = len(names)
+    if not C:
+        raise ValueError("components must contain at least one component.")
+    if C > MAX_COMPONENTS:
+        raise ValueError(f"At most {MAX_COMPONENTS} components can be enumerated.")
+
+    grid = sun_grid or SunGrid(
+        obliquity_deg=obliquity_deg,
+        decl_step_deg=decl_step_deg,
+        hour_angle_step_deg=hour_angle_step_deg,
+    )
+    point_sets = [components[n] for n in names]
+    D, H = grid.shape
+    limit_dots = [math.sin(math.radians(limit)) for limit in limits]
+    # Per limit, a (D,H) bitmask of the components that pass at each cell. The (C,D,H) fields
+    # are kept for the minimal-set minima only while they fit in max_bytes; otherwise that
+    # second step re-sweeps the blocks.
+    cell_masks = np.zeros((len(limits), D, H), dtype=np.int64)
+    fields = np.empty((C, D, H)) if C * D * H * _FLOAT_BYTES <= max_bytes else None
+    for ds, hs, block in _iter_component_blocks(point_sets, grid, max_bytes):
+        if fields is not None:
+            fields[:, ds, hs] = block
+        for li, limit_dot in enumerate(limit_dots):
+            for c in range(C):
+                cell_masks[li, ds, hs] |= _passes(block[c], limit_dot).astype(np.int64) << c
+
+    member_lists = []
+    for li in range(len(limits)):
+        minimal = _minimal(_passing_table(cell_masks[li], C), C)
+        member_lists.append([[c for c in range(C) if s >> c & 1] for s in minimal])
+    del cell_masks
+
+    # Worst case of each minimal set: min over cells of the max of its members' fields.
+    flat = [members for per_limit in member_lists for members in per_limit]
+    worst = np.full(len(flat), np.inf)
+    blocks: Iterable[np.ndarray] = (
+        [fields] if fields is not None else (b for _, _, b in _iter_component_blocks(point_sets, grid, max_bytes))
+    )
+    for block in blocks:
+        for k, members in enumerate(flat):
+            worst[k] = min(worst[k], float(block[members].max(axis=0).min()))
+
+    analyses = []
+    k = 0
+    for limit, per_limit in zip(limits, member_lists):
+        subsets = []
+        for members in per_limit:
+            subsets.append(
+                ComponentSubset(
+                    components=tuple(names[c] for c in members),
+                    worst_max_altitude_deg=math.degrees(math.asin(float(np.clip(worst[k], -1.0, 1.0)))),
+                )
+            )
+            k += 1
+        analyses.append(
+            SubsetAnalysis(limit_altitude_deg=limit, components=names, minimal_passing_subsets=tuple(subsets))
+        )
+    return analyses[0] if single_limit else analyses
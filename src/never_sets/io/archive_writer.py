@@ -3,23 +3,89 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence, Union
 
-from ..models.country import CountryDef
-from ..models.result import CoverageResult
+from ..core.field import CoverageField
+from ..models.country import AnyCountry
+from ..models.result import CoverageResult, EnsembleResult, SubsetAnalysis, Witness
 
 
-def archive_witness(
-    out_dir: str | Path,
-    country: CountryDef,
-    result: CoverageResult,
+def _result_payload(result: CoverageResult) -> Dict[str, Any]:
+    return {
+        "always_daylight_somewhere": result.always_daylight_somewhere,
+        "limit_altitude_deg": result.limit_altitude_deg,
+        "limit_dot": result.limit_dot,
+        "margin_altitude_deg": result.margin_altitude_deg,
+    }
+
+
+def _criticality_payload(country: AnyCountry, results: Sequence[CoverageResult]) -> list:
+    # Ranked most load-bearing first; margins follow the order of the limits.
+    w = results[0].witness
+    alts = w.leave_one_out_altitude_deg or ()
+    return [
+        {
+            "index": i,
+            "label": country.points[i].label,
+            "worst_max_altitude_deg_without": alts[i],
+            "altitude_loss_deg": w.worst_max_altitude_deg - alts[i],
+            "margin_deg_without": [alts[i] - r.limit_altitude_deg for r in results],
+        }
+        for i in sorted(range(len(alts)), key=lambda i: (alts[i], i))
+    ]
+
+
+def _witness_payload(country: AnyCountry, w: Witness, *, decide: bool) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "decl_deg": w.decl_deg,
+        "hour_angle_deg": w.hour_angle_deg,
+        "worst_max_dot": w.worst_max_dot,
+        "worst_max_altitude_deg": w.worst_max_altitude_deg,
+        "best_point_indices": list(w.best_point_indices),
+        "best_point_labels": [country.points[i].label for i in w.best_point_indices],
+    }
+    if decide:
+        # Decide mode stops early: its cell settles the verdict and its value only bounds the
+        # worst case from above.
+        payload = {
+            "kind": "decision witness / bound",
+            **{k: v for k, v in payload.items() if not k.startswith("worst_")},
+            "max_dot_upper_bound": w.worst_max_dot,
+            "max_altitude_upper_bound_deg": w.worst_max_altitude_deg,
+        }
+    return payload
+
+
+def ensemble_payload(ensemble: EnsembleResult) -> Dict[str, Any]:
+    return {
+        "radius_deg": ensemble.radius_deg,
+        "replicas": int(ensemble.worst_max_altitudes_deg.size),
+        "seed": ensemble.seed,
+        "quantile_levels": list(ensemble.quantile_levels),
+        "limits": [
+            {
+                "limit_altitude_deg": limit,
+                "pass_probability": probability,
+                "margin_quantiles_deg": list(quantiles),
+            }
+            for limit, probability, quantiles in zip(
+                ensemble.limits_deg, ensemble.pass_probability, ensemble.margin_quantiles_deg
+            )
+        ],
+    }
+
+
+def witness_payload(
+    country: AnyCountry,
+    result: Union[CoverageResult, Sequence[CoverageResult]],
     *,
     extra: Optional[Dict[str, Any]] = None,
-) -> Path:
-    out_dir = Path(out_dir)
-    cdir = out_dir / country.id
-    cdir.mkdir(parents=True, exist_ok=True)
-
+    decide: bool = False,
+    field: Optional[CoverageField] = None,
+    ensemble: Optional[EnsembleResult] = None,
+) -> Dict[str, Any]:
+    results = [result] if isinstance(result, CoverageResult) else list(result)
+    result = results[0]
     payload: Dict[str, Any] = {
         "timestamp_utc": datetime.now(timezone.utc).isoformat(),
         "country": {
@@ -28,24 +94,80 @@ def archive_witness(
             "notes": country.notes,
             "points": [{"label": p.label, "lat": p.lat, "lon": p.lon} for p in country.points],
         },
-        "result": {
-            "always_daylight_somewhere": result.always_daylight_somewhere,
-            "limit_altitude_deg": result.limit_altitude_deg,
-            "limit_dot": result.limit_dot,
-            "margin_altitude_deg": result.margin_altitude_deg,
-        },
-        "witness": {
-            "decl_deg": result.witness.decl_deg,
-            "hour_angle_deg": result.witness.hour_angle_deg,
-            "worst_max_dot": result.witness.worst_max_dot,
-            "worst_max_altitude_deg": result.witness.worst_max_altitude_deg,
-            "best_point_indices": list(result.witness.best_point_indices),
-            "best_point_labels": [country.points[i].label for i in result.witness.best_point_indices],
-        },
+        "result": _result_payload(result),
+        "witness": _witness_payload(country, result.witness, decide=decide),
     }
+    if len(results) > 1:
+        payload["results"] = [_result_payload(r) for r in results]
+        del payload["result"]
+    if decide:
+        # Each limit is decided separately, so each keeps its own witness, and margins are
+        # upper bounds like the values they come from.
+        payload["mode"] = "decide"
+        del payload["witness"]
+        for r, p in zip(results, payload.get("results") or [payload["result"]]):
+            p["margin_altitude_upper_bound_deg"] = p.pop("margin_altitude_deg")
+            p["witness"] = _witness_payload(country, r.witness, decide=True)
+    else:
+        # In solve mode all limits share one witness; only the verdict and margin differ.
+        if result.witness.worst_max_dot_bounds is not None:
+            payload["witness"]["worst_max_dot_bounds"] = list(result.witness.worst_max_dot_bounds)
+        if result.witness.leave_one_out_altitude_deg is not None:
+            payload["witness"]["criticality"] = _criticality_payload(country, results)
+    if field is not None:
+        payload["coverage_field"] = {
+            "directory": str(field.directory),
+            **field.params,
+            "max_dot_dtype": str(field.max_dot.dtype),
+            "argmax_dtype": str(field.argmax.dtype),
+        }
+    if ensemble is not None:
+        payload["robustness"] = ensemble_payload(ensemble)
     if extra:
         payload["extra"] = extra
+    return payload
+
 
+def archive_witness(
+    out_dir: str | Path,
+    country: AnyCountry,
+    result: Union[CoverageResult, Sequence[CoverageResult]],
+    *,
+    extra: Optional[Dict[str, Any]] = None,
+    decide: bool = False,
+    field: Optional[CoverageField] = None,
+    ensemble: Optional[EnsembleResult] = None,
+) -> Path:
+    cdir = Path(out_dir) / country.id
+    cdir.mkdir(parents=True, exist_ok=True)
     out_path = cdir / "witness.json"
+    payload = witness_payload(country, result, extra=extra, decide=decide, field=field, ensemble=ensemble)
+    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return out_path
+
+
+def subsets_payload(country: AnyCountry, analyses: Sequence[SubsetAnalysis]) -> Dict[str, Any]:
+    return {
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "country_id": country.id,
+        "components": list(analyses[0].components) if analyses else [],
+        "limits": [
+            {
+                "limit_altitude_deg": a.limit_altitude_deg,
+                "minimal_passing_subsets": [
+                    {"components": list(s.components), "worst_max_altitude_deg": s.worst_max_altitude_deg}
+                    for s in a.minimal_passing_subsets
+                ],
+            }
+            for a in analyses
+        ],
+    }
+
+
+def archive_subsets(out_dir: str | Path, country: AnyCountry, analyses: Sequence[SubsetAnalysis]) -> Path:
+    cdir = Path(out_dir) / country.id
+    cdir.mkdir(parents=True, exist_ok=True)
+    payload = subsets_payload(country, analyses)
+    out_path = cdir / "subsets.json"
     out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     return out_path
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import json
 import math
+import sys
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, NoReturn, Optional, Tuple, Union
 
-from ..models.country import CountryDef, CountryPoint
+import numpy as np
+
+from ..core.geometry import latlon_to_unit_array
+from ..models.country import CountryArrays, CountryDef, CountryPoint
 
 LatLon = Tuple[float, float]
 
@@ -16,6 +20,7 @@ def _parse_point_list(
     path: Path,
     label_required: bool,
     label_prefix: str,
+    component: Optional[str] = None,
 ) -> List[CountryPoint]:
     if not isinstance(raw_points, list) or not raw_points:
         raise ValueError(f"Country file {path} must contain a non-empty list of points.")
@@ -47,12 +52,11 @@ def _parse_point_list(
         if not (-180.0 <= lon <= 180.0):
             raise ValueError(f"Point {idx} in {path} has longitude outside [-180, 180].")
 
-        points.append(CountryPoint(label=label, lat=lat, lon=lon))
+        points.append(CountryPoint(label=label, lat=lat, lon=lon, component=component))
     return points
 
 
-def load_country(path: str | Path) -> CountryDef:
-    p = Path(path)
+def _read_country_json(p: Path) -> Dict[str, Any]:
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
@@ -64,6 +68,29 @@ def load_country(path: str | Path) -> CountryDef:
         raise ValueError(f"Country file {p} is missing required field 'id'.")
     if "points" not in data and "components" not in data:
         raise ValueError(f"Country file {p} must contain 'points' or 'components'.")
+    return data
+
+
+def _component_entries(data: Dict[str, Any], p: Path) -> List[Tuple[str, object]]:
+    raw_components = data["components"]
+    if not isinstance(raw_components, list) or not raw_components:
+        raise ValueError(f"Country file {p} must contain a non-empty list of components.")
+    entries = []
+    for c_idx, component in enumerate(raw_components):
+        if not isinstance(component, dict):
+            raise ValueError(f"Component {c_idx} in {p} must be an object.")
+        comp_name = component.get("name", f"component-{c_idx + 1}")
+        if not isinstance(comp_name, str):
+            raise ValueError(f"Component {c_idx} in {p} has non-string name.")
+        if "points" not in component:
+            raise ValueError(f"Component {c_idx} in {p} is missing required field 'points'.")
+        entries.append((comp_name, component["points"]))
+    return entries
+
+
+def load_country(path: str | Path) -> CountryDef:
+    p = Path(path)
+    data = _read_country_json(p)
 
     points: List[CountryPoint] = []
     if "points" in data:
@@ -77,23 +104,14 @@ def load_country(path: str | Path) -> CountryDef:
         )
 
     if "components" in data:
-        raw_components = data["components"]
-        if not isinstance(raw_components, list) or not raw_components:
-            raise ValueError(f"Country file {p} must contain a non-empty list of components.")
-        for c_idx, component in enumerate(raw_components):
-            if not isinstance(component, dict):
-                raise ValueError(f"Component {c_idx} in {p} must be an object.")
-            comp_name = component.get("name", f"component-{c_idx + 1}")
-            if not isinstance(comp_name, str):
-                raise ValueError(f"Component {c_idx} in {p} has non-string name.")
-            if "points" not in component:
-                raise ValueError(f"Component {c_idx} in {p} is missing required field 'points'.")
+        for comp_name, raw_points in _component_entries(data, p):
             points.extend(
                 _parse_point_list(
-                    component["points"],
+                    raw_points,
                     path=p,
                     label_required=False,
                     label_prefix=comp_name,
+                    component=comp_name,
                 )
             )
 
@@ -108,11 +126,127 @@ def load_country(path: str | Path) -> CountryDef:
     )
 
 
+def _point_columns(
+    raw_points: object,
+    *,
+    path: Path,
+    label_required: bool,
+    label_prefix: str,
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    # Vectorised _parse_point_list. Any invalid input is re-parsed point by point, so the
+    # error names the first offending point exactly as load_country would.
+    def strict() -> NoReturn:
+        _parse_point_list(raw_points, path=path, label_required=label_required, label_prefix=label_prefix)
+        raise ValueError(f"Country file {path} has invalid points.")
+
+    if not isinstance(raw_points, list) or not raw_points:
+        strict()
+    try:
+        lat = np.array([pt["lat"] for pt in raw_points], dtype=float)
+        lon = np.array([pt["lon"] for pt in raw_points], dtype=float)
+        labels = [pt.get("label") for pt in raw_points]
+    except (TypeError, ValueError, KeyError, AttributeError):
+        strict()
+    if lat.ndim != 1 or lon.ndim != 1:
+        strict()
+    if not (np.isfinite(lat).all() and np.isfinite(lon).all()):
+        strict()
+    if (np.abs(lat) > 90.0).any() or (np.abs(lon) > 180.0).any():
+        strict()
+    for idx, label in enumerate(labels):
+        if label is None and not label_required:
+            labels[idx] = f"{label_prefix} {idx + 1}"
+        elif not isinstance(label, str):
+            strict()
+    return lat, lon, labels
+
+
+def _country_arrays(
+    data: Dict[str, Any],
+    columns: List[Tuple[Optional[str], np.ndarray, np.ndarray, Union[List[str], str]]],
+) -> CountryArrays:
+    # Assemble a CountryArrays from (component, lat, lon, labels) column groups; a single
+    # string labels every point of its group.
+    label_table: Dict[str, int] = {}
+
+    def ids(labels: Union[List[str], str], n: int) -> np.ndarray:
+        if isinstance(labels, str):
+            return np.full(n, label_table.setdefault(sys.intern(labels), len(label_table)), dtype=np.int32)
+        return np.array([label_table.setdefault(sys.intern(x), len(label_table)) for x in labels], dtype=np.int32)
+
+    components = tuple(dict.fromkeys(c for c, *_ in columns if c is not None))
+    comp_index = {c: i for i, c in enumerate(components)}
+    label_ids = np.concatenate([ids(labels, lat.size) for _, lat, _, labels in columns])
+    component_ids = np.concatenate(
+        [np.full(lat.size, comp_index[c] if c is not None else -1, dtype=np.int32) for c, lat, _, _ in columns]
+    )
+    lat = np.concatenate([lat for _, lat, _, _ in columns])
+    lon = np.concatenate([lon for _, _, lon, _ in columns])
+    return CountryArrays(
+        id=str(data["id"]),
+        name=str(data.get("name", data["id"])),
+        lat=lat,
+        lon=lon,
+        unit_vectors=latlon_to_unit_array(lat, lon),
+        label_ids=label_ids,
+        labels=tuple(label_table),
+        component_ids=component_ids,
+        components=components,
+        notes=str(data.get("notes", "")),
+    )
+
+
+def load_country_arrays(path: str | Path) -> CountryArrays:
+    """Load a country file into the columnar ``CountryArrays`` (same validation as ``load_country``)."""
+    p = Path(path)
+    data = _read_country_json(p)
+    columns: List[Tuple[Optional[str], np.ndarray, np.ndarray, List[str]]] = []
+    if "points" in data:
+        columns.append((None, *_point_columns(data["points"], path=p, label_required=True, label_prefix="point")))
+    if "components" in data:
+        for comp_name, raw_points in _component_entries(data, p):
+            columns.append(
+                (comp_name, *_point_columns(raw_points, path=p, label_required=False, label_prefix=comp_name))
+            )
+    return _country_arrays(data, columns)
+
+
+def to_country_arrays(country: Union[CountryDef, CountryArrays]) -> CountryArrays:
+    """Columnar copy of a ``CountryDef`` (returned unchanged if already columnar)."""
+    if isinstance(country, CountryArrays):
+        return country
+    # Consecutive points of one component form one column group, preserving point order.
+    columns: List[Tuple[Optional[str], np.ndarray, np.ndarray, List[str]]] = []
+    for pt in country.points:
+        if not columns or columns[-1][0] != pt.component:
+            columns.append((pt.component, [], [], []))
+        columns[-1][1].append(pt.lat)
+        columns[-1][2].append(pt.lon)
+        columns[-1][3].append(pt.label)
+    columns = [(c, np.array(lat, dtype=float), np.array(lon, dtype=float), labels) for c, lat, lon, labels in columns]
+    data = {"id": country.id, "name": country.name, "notes": country.notes}
+    return _country_arrays(data, columns)
+
+
+def country_files(data_dir: str | Path) -> List[Path]:
+    return sorted(Path(data_dir).glob("*.json"))
+
+
 def iter_countries(data_dir: str | Path) -> Iterable[CountryDef]:
-    d = Path(data_dir)
-    for p in sorted(d.glob("*.json")):
+    for p in country_files(data_dir):
         yield load_country(p)
 
 
-def to_latlon_list(country: CountryDef) -> List[LatLon]:
+def to_latlon_list(country: Union[CountryDef, CountryArrays]) -> List[LatLon]:
+    if isinstance(country, CountryArrays):
+        return list(zip(country.lat.tolist(), country.lon.tolist()))
     return [(pt.lat, pt.lon) for pt in country.points]
+
+
+def country_components(country: CountryDef) -> Dict[str, List[LatLon]]:
+    # Points of each `components` entry, in file order; top-level points are one component
+    # each, named by their label (e.g. the overseas anchors of a points-only file).
+    groups: Dict[str, List[LatLon]] = {}
+    for pt in country.points:
+        groups.setdefault(pt.component if pt.component is not None else pt.label, []).append((pt.lat, pt.lon))
+    return groups
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+LAYOUTS = ("files", "jsonl", "zip")
+DEFAULT_MAX_PENDING = 64
+
+Outputs = Dict[str, Union[str, Dict[str, Any]]]
+
+
+def _encode(value: Union[str, Dict[str, Any]], *, indent: Optional[int]) -> str:
+    return value if isinstance(value, str) else json.dumps(value, indent=indent)
+
+
+class OutputWriter:
+    """Writes per-country outputs on a background thread, so solving and I/O overlap.
+
+    ``layout="files"`` writes ``<out>/<id>/<name>`` as before; ``"jsonl"`` appends one compact
+    record per country to ``results.jsonl`` and ``"zip"`` stores ``<id>/<name>`` members in
+    ``results.zip``. Summary entries are appended to ``summary.jsonl`` as they arrive, in
+    completion order. At most ``max_pending`` countries wait in the queue, so memory stays
+    flat; ``submit`` blocks while it is full. The first write error is raised by ``submit`` or
+    ``close``.
+    """
+
+    def __init__(
+        self, out_dir: str | Path, *, layout: str = "files", max_pending: int = DEFAULT_MAX_PENDING
+    ) -> None:
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be one of {', '.join(LAYOUTS)}.")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1.")
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.layout = layout
+        self._summary = (self.out_dir / "summary.jsonl").open("w", encoding="utf-8")
+        self._results = (self.out_dir / "results.jsonl").open("w", encoding="utf-8") if layout == "jsonl" else None
+        self._zip = zipfile.ZipFile(self.out_dir / "results.zip", "w", zipfile.ZIP_DEFLATED) if layout == "zip" else None
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="never-sets-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def submit(self, country_id: str, outputs: Optional[Outputs], summary_entry: Optional[Dict[str, Any]] = None) -> None:
+        """Queue a country's outputs (file name -> text or JSON payload) and summary entry.
+
+        ``outputs=None`` records only the summary entry (e.g. an incremental skip).
+        """
+        if self._closed:
+            raise ValueError("OutputWriter is closed.")
+        if self._error is not None:
+            raise self._error
+        self._queue.put((country_id, outputs, summary_entry))
+
+    def close(self) -> None:
+        """Drain the queue, close the consolidated files and re-raise the first write error."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+            self._summary.close()
+            if self._results is not None:
+                self._results.close()
+            if self._zip is not None:
+                self._zip.close()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            # After a failure keep draining, so producers blocked on a full queue are released.
+            if self._error is not None:
+                continue
+            try:
+                self._write(*item)
+            except BaseException as exc:
+                self._error = exc
+
+    def _write(self, country_id: str, outputs: Optional[Outputs], summary_entry: Optional[Dict[str, Any]]) -> None:
+        if outputs:
+            if self.layout == "files":
+                cdir = self.out_dir / country_id
+                cdir.mkdir(parents=True, exist_ok=True)
+                for name, value in outputs.items():
+                    (cdir / name).write_text(_encode(value, indent=2), encoding="utf-8")
+            elif self.layout == "jsonl":
+                self._results.write(json.dumps({"id": country_id, "outputs": outputs}) + "\n")
+            else:
+                for name, value in outputs.items():
+                    self._zip.writestr(f"{country_id}/{name}", _encode(value, indent=None))
+        if summary_entry is not None:
+            # One line per country, flushed, so a long run's progress is readable while it runs.
+            self._summary.write(json.dumps(summary_entry) + "\n")
+            self._summary.flush()
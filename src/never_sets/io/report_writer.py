@@ -1,23 +1,118 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import List, Optional, Sequence, Union
 
-from ..models.country import CountryDef
-from ..models.result import CoverageResult
+import numpy as np
 
+from ..core.decide import _passes
+from ..models.country import AnyCountry
+from ..models.result import CoverageResult, EnsembleResult
 
-def render_markdown_report(country: CountryDef, result: CoverageResult) -> str:
-    status = "PASS" if result.always_daylight_somewhere else "FAIL"
-    verdict_icon = "✅" if result.always_daylight_somewhere else "❌"
-    w = result.witness
-    limit = result.limit_altitude_deg
-    limit_desc = (
+
+def _limit_description(limit: float) -> str:
+    return (
         "0.000° = geometric sunrise (Sun center above horizon)."
         if abs(limit) < 1e-9
         else "-0.833° ≈ common visible sunrise (refraction + solar radius)."
         if abs(limit + 0.833) < 1e-9
         else "Custom threshold for visible Sun altitude."
     )
+
+
+def _limits_table(results: Sequence[CoverageResult]) -> List[str]:
+    lines = [
+        "## Verdict per visibility limit",
+        "| Visibility limit | Verdict | Margin |",
+        "|---:|:---:|---:|",
+    ]
+    for r in results:
+        status = "PASS ✅" if r.always_daylight_somewhere else "FAIL ❌"
+        lines.append(f"| `{r.limit_altitude_deg:.3f}°` | {status} | `{r.margin_altitude_deg:.3f}°` |")
+    return lines
+
+
+def _decision_table(results: Sequence[CoverageResult]) -> List[str]:
+    # Decide mode settles each limit separately and stops early, so every limit has its own
+    # witness and its values only bound the worst case from above.
+    lines = [
+        "## Decision witness / bound (per limit)",
+        "Decide mode stops as soon as the verdict is settled. On FAIL the witness is a failing Sun "
+        "direction; on PASS it is the lowest direction evaluated. Either way its altitude is an "
+        "**upper bound** on the worst-case max altitude, not the worst case itself.",
+        "",
+        "| Visibility limit | Verdict | Declination | Hour angle | Max altitude (upper bound) | Margin (upper bound) |",
+        "|---:|:---:|---:|---:|---:|---:|",
+    ]
+    for r in results:
+        w = r.witness
+        status = "PASS ✅" if r.always_daylight_somewhere else "FAIL ❌"
+        lines.append(
+            f"| `{r.limit_altitude_deg:.3f}°` | {status} | `{w.decl_deg:.3f}°` | `{w.hour_angle_deg:.3f}°` "
+            f"| `{w.worst_max_altitude_deg:.3f}°` | `{r.margin_altitude_deg:.3f}°` |"
+        )
+    return lines
+
+
+def _criticality_table(country: AnyCountry, result: CoverageResult) -> List[str]:
+    # Most load-bearing first: the lower the worst case without a point, the more it matters.
+    w = result.witness
+    alts = w.leave_one_out_altitude_deg or ()
+    lines = [
+        "## Point criticality (leave one out)",
+        f"Verdicts are for the `{result.limit_altitude_deg:.3f}°` limit; a point is **load-bearing** "
+        "if removing it turns a PASS into a FAIL.",
+        "",
+        "| Rank | Point | Worst-case max altitude without it | Altitude loss | Verdict without it |",
+        "|---:|:---|---:|---:|:---:|",
+    ]
+    # The overall verdict's test (coverage_result), applied to the dots rather than comparing
+    # raw altitudes, so a point at the limit gets the same verdict as the territory would.
+    passes = _passes(np.sin(np.radians(np.asarray(alts, dtype=float))), result.limit_dot)
+    for rank, i in enumerate(sorted(range(len(alts)), key=lambda i: (alts[i], i)), start=1):
+        status = "PASS ✅" if passes[i] else "FAIL ❌"
+        if result.always_daylight_somewhere and not passes[i]:
+            status += " (load-bearing)"
+        lines.append(
+            f"| {rank} | {i:02d}. **{country.points[i].label}** | `{alts[i]:.3f}°` "
+            f"| `{w.worst_max_altitude_deg - alts[i]:.3f}°` | {status} |"
+        )
+    return lines
+
+
+def _robustness_table(ensemble: EnsembleResult) -> List[str]:
+    replicas = ensemble.worst_max_altitudes_deg.size
+    headers = " | ".join(f"q{q * 100:g}" for q in ensemble.quantile_levels)
+    lines = [
+        "## Robustness under coordinate uncertainty",
+        f"- Every point moved uniformly within `{ensemble.radius_deg:g}°` of arc, "
+        f"`{replicas}` replicas (seed `{ensemble.seed}`)",
+        "- `qN` columns: N-th percentile of the margin over replicas",
+        "",
+        f"| Limit | PASS probability | {headers} |",
+        "|---:|---:|" + "---:|" * len(ensemble.quantile_levels),
+    ]
+    for limit, probability, quantiles in zip(
+        ensemble.limits_deg, ensemble.pass_probability, ensemble.margin_quantiles_deg
+    ):
+        cells = " | ".join(f"{v:+.3f}°" for v in quantiles)
+        lines.append(f"| {limit:.3f}° | {probability:.1%} | {cells} |")
+    return lines
+
+
+def render_markdown_report(
+    country: AnyCountry,
+    result: Union[CoverageResult, Sequence[CoverageResult]],
+    *,
+    decide: bool = False,
+    ensemble: Optional[EnsembleResult] = None,
+) -> str:
+    results = [result] if isinstance(result, CoverageResult) else list(result)
+    result = results[0]
+    status = "PASS" if result.always_daylight_somewhere else "FAIL"
+    verdict_icon = "✅" if result.always_daylight_somewhere else "❌"
+    w = result.witness
+    limit_desc = _limit_description(result.limit_altitude_deg)
     interpretation = (
         "If the margin is **≥ 0°**, then *at least one point* in the territory keeps the Sun above the "
         "visibility limit for **every achievable Sun direction**. If the margin is **< 0°**, there exists "
@@ -29,18 +124,38 @@ def render_markdown_report(country: CountryDef, result: CoverageResult) -> str:
         else "❌ There exists at least one achievable Sun direction where all points are below the visibility limit."
     )
 
+    verdict_line = f"- **Verdict:** **{status}** {verdict_icon}"
+    if len(results) > 1:
+        passed = sum(r.always_daylight_somewhere for r in results)
+        verdict_line = f"- **Verdict:** **{passed}/{len(results)} limits PASS** (first limit: **{status}** {verdict_icon})"
+
     lines = [
         f"# Report: {country.name}",
         "",
         f"- **ID:** `{country.id}`",
-        f"- **Verdict:** **{status}** {verdict_icon}",
+        verdict_line,
         f"- **Plain-language verdict:** {plain_verdict}",
         "",
         "## At a glance",
         f"- **Visibility limit (what counts as “Sun visible”):** `{result.limit_altitude_deg:.3f}°` ({limit_desc})",
-        f"- **Worst-case max altitude:** `{w.worst_max_altitude_deg:.3f}°` (highest Sun altitude achievable at the *hardest* Sun direction)",
-        f"- **Margin:** `{result.margin_altitude_deg:.3f}°` (worst-case max altitude − visibility limit)",
-        "",
+    ]
+    if decide:
+        lines += [
+            f"- **Max altitude at decision witness:** `{w.worst_max_altitude_deg:.3f}°` "
+            "(decision bound: an upper bound on the worst-case max altitude, not the worst case)",
+            f"- **Margin bound:** `{result.margin_altitude_deg:.3f}°` (upper bound on the margin)",
+            "",
+        ]
+        lines += _decision_table(results) + [""]
+    else:
+        lines += [
+            f"- **Worst-case max altitude:** `{w.worst_max_altitude_deg:.3f}°` (highest Sun altitude achievable at the *hardest* Sun direction)",
+            f"- **Margin:** `{result.margin_altitude_deg:.3f}°` (worst-case max altitude − visibility limit)",
+            "",
+        ]
+    if not decide and len(results) > 1:
+        lines += _limits_table(results) + [""]
+    lines += [
         "## How to read this report",
         "- Imagine sweeping the Sun across all physically achievable directions.",
         "- At each direction, find the **single best point** in the territory (highest Sun altitude).",
@@ -64,19 +179,36 @@ def render_markdown_report(country: CountryDef, result: CoverageResult) -> str:
         "        | worst-case max altitude (lowest of the best points)\n"
         "```\n",
         "",
-        "## Witness (worst case on sampled grid)",
-        f"- Declination: `{w.decl_deg:.3f}°` (tilt of the Sun relative to Earth's equator for this direction)",
-        f"- Hour angle: `{w.hour_angle_deg:.3f}°` (Sun direction relative to local noon)",
-        f"- min over grid of max dot: `{w.worst_max_dot:.6f}` (minimum across sampled directions of the max dot)",
+    ]
+    if not decide:
+        lines += [
+            "## Witness (worst case on sampled grid)",
+            f"- Declination: `{w.decl_deg:.3f}°` (tilt of the Sun relative to Earth's equator for this direction)",
+            f"- Hour angle: `{w.hour_angle_deg:.3f}°` (Sun direction relative to local noon)",
+            f"- min over grid of max dot: `{w.worst_max_dot:.6f}` (minimum across sampled directions of the max dot)",
+        ]
+    if w.worst_max_dot_bounds is not None:
+        lo, hi = w.worst_max_dot_bounds
+        lines.append(
+            f"- Certified interval: `[{lo:.9f}, {hi:.9f}]` (continuous minimum of the max dot, "
+            "enclosed by branch-and-bound rather than sampled)"
+        )
+    lines += [
         "",
         "## Territory coverage (sampled points)",
         f"- Input points: `{len(country.points)}` (add extreme boundary points for higher confidence)",
     ]
     best_indices_set = set(w.best_point_indices)
     for i, pt in enumerate(country.points):
-        mark = " ← best at witness" if i in best_indices_set else ""
+        mark = f" ← best at {'first decision ' if decide else ''}witness" if i in best_indices_set else ""
         lines.append(f"- {i:02d}. **{pt.label}** (lat `{pt.lat:.4f}`, lon `{pt.lon:.4f}`){mark}")
 
+    if w.leave_one_out_altitude_deg is not None:
+        lines += [""] + _criticality_table(country, result)
+
+    if ensemble is not None:
+        lines += [""] + _robustness_table(ensemble)
+
     if country.notes:
         lines += ["", "## Notes", country.notes]
 
@@ -95,10 +227,17 @@ def render_markdown_report(country: CountryDef, result: CoverageResult) -> str:
     return "\n".join(lines)
 
 
-def write_report(out_dir: str | Path, country: CountryDef, result: CoverageResult) -> Path:
+def write_report(
+    out_dir: str | Path,
+    country: AnyCountry,
+    result: Union[CoverageResult, Sequence[CoverageResult]],
+    *,
+    decide: bool = False,
+    ensemble: Optional[EnsembleResult] = None,
+) -> Path:
     out_dir = Path(out_dir)
     cdir = out_dir / country.id
     cdir.mkdir(parents=True, exist_ok=True)
     p = cdir / "report.md"
-    p.write_text(render_markdown_report(country, result), encoding="utf-8")
+    p.write_text(render_markdown_report(country, result, decide=decide, ensemble=ensemble), encoding="utf-8")
     return p
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..core.geometry import LatLon
+from ..models.result import Witness
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Bump whenever a solver change can alter a witness for the same inputs.
+ENGINE_VERSION = "1"
+
+
+def cache_key(points: Sequence[LatLon], params: Mapping[str, Any]) -> str:
+    # Points are hashed as their float64 bytes in input order (witness indices depend on it);
+    # params are the solver settings that determine the witness.
+    h = hashlib.sha256()
+    h.update(ENGINE_VERSION.encode("ascii"))
+    h.update(json.dumps(dict(params), sort_keys=True).encode("utf-8"))
+    h.update(np.asarray(points, dtype=np.float64).reshape(-1, 2).tobytes())
+    return h.hexdigest()
+
+
+def _witness_to_json(w: Witness) -> Dict[str, Any]:
+    return {
+        "decl_deg": w.decl_deg,
+        "hour_angle_deg": w.hour_angle_deg,
+        "worst_max_dot": w.worst_max_dot,
+        "worst_max_altitude_deg": w.worst_max_altitude_deg,
+        "best_point_indices": list(w.best_point_indices),
+        "worst_max_dot_bounds": list(w.worst_max_dot_bounds) if w.worst_max_dot_bounds is not None else None,
+        "leave_one_out_altitude_deg": (
+            list(w.leave_one_out_altitude_deg) if w.leave_one_out_altitude_deg is not None else None
+        ),
+    }
+
+
+def _witness_from_json(d: Mapping[str, Any]) -> Witness:
+    bounds = d.get("worst_max_dot_bounds")
+    loo = d.get("leave_one_out_altitude_deg")
+    return Witness(
+        decl_deg=float(d["decl_deg"]),
+        hour_angle_deg=float(d["hour_angle_deg"]),
+        worst_max_dot=float(d["worst_max_dot"]),
+        worst_max_altitude_deg=float(d["worst_max_altitude_deg"]),
+        best_point_indices=tuple(int(i) for i in d["best_point_indices"]),
+        worst_max_dot_bounds=(float(bounds[0]), float(bounds[1])) if bounds is not None else None,
+        leave_one_out_altitude_deg=tuple(float(v) for v in loo) if loo is not None else None,
+    )
+
+
+class ResultCache:
+    """On-disk, content-addressed store of solved witnesses.
+
+    The witness is what the sweep produces and it does not depend on the visibility limit, so
+    one entry serves every limit. Entries are small JSON files fanned out by key prefix;
+    reads refresh the file's mtime and :meth:`evict` drops least-recently-used entries once
+    the store exceeds ``max_bytes``. Writes are atomic, so pool workers can share a cache.
+    """
+
+    def __init__(self, cache_dir: str | Path, *, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Witness]:
+        p = self._path(key)
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return _witness_from_json(data["witness"])
+
+    def put(self, key: str, witness: Witness) -> None:
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=p.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"key": key, "witness": _witness_to_json(witness)}, fh)
+        os.replace(tmp, p)
+
+    def evict(self) -> int:
+        entries = []
+        total = 0
+        for p in self.cache_dir.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        removed = 0
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+import re
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..core.geometry import latlon_to_unit_array
+from ..models.country import CountryArrays
+from .country_loader import _country_arrays, load_country_arrays
+
+TERRITORY_SUFFIXES = (".json", ".geojson", ".csv")
+_CHUNK_CHARS = 1 << 20
+_CSV_CHUNK_ROWS = 1 << 16
+_FEATURES = re.compile(r'"features"\s*:\s*\[')
+_SEPARATORS = re.compile(r"[\s,]*")
+_LAT_NAMES = ("lat", "latitude")
+_LON_NAMES = ("lon", "lng", "long", "longitude")
+
+Column = Tuple[Optional[str], np.ndarray, np.ndarray, Union[List[str], str]]
+
+
+def _decimation_mask(lat: np.ndarray, lon: np.ndarray, tolerance_deg: Optional[float]) -> np.ndarray:
+    # Keep the first vertex of every tolerance_deg of arc length along the path. A dropped
+    # vertex is then less than tolerance_deg (great circle) from a kept one, so no Sun altitude
+    # at any point, and hence the worst-case max altitude, drops by more than tolerance_deg.
+    keep = np.ones(lat.size, dtype=bool)
+    if not tolerance_deg or lat.size <= 2:
+        return keep
+    N = latlon_to_unit_array(lat, lon)
+    chord = np.linalg.norm(np.diff(N, axis=0), axis=1)
+    arc = np.degrees(2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0)))
+    bucket = np.floor(np.concatenate([[0.0], np.cumsum(arc)]) / tolerance_deg)
+    keep[1:] = bucket[1:] != bucket[:-1]
+    return keep
+
+
+def decimate_country(country: CountryArrays, tolerance_deg: float) -> CountryArrays:
+    """Drop points within ``tolerance_deg`` of arc length of a kept one, per run of a component.
+
+    The worst-case max altitude of the result is at most ``tolerance_deg`` below the original's.
+    """
+    if tolerance_deg <= 0:
+        raise ValueError("tolerance_deg must be positive.")
+    keep = np.ones(country.lat.size, dtype=bool)
+    starts = np.flatnonzero(np.r_[True, country.component_ids[1:] != country.component_ids[:-1]])
+    for a, b in zip(starts, np.r_[starts[1:], country.lat.size]):
+        keep[a:b] = _decimation_mask(country.lat[a:b], country.lon[a:b], tolerance_deg)
+    return CountryArrays(
+        id=country.id,
+        name=country.name,
+        lat=country.lat[keep],
+        lon=country.lon[keep],
+        unit_vectors=np.ascontiguousarray(country.unit_vectors[keep]),
+        label_ids=country.label_ids[keep],
+        labels=country.labels,
+        component_ids=country.component_ids[keep],
+        components=country.components,
+        notes=country.notes,
+    )
+
+
+def _iter_features(path: Path) -> Iterator[Dict[str, Any]]:
+    # Yields the members of a FeatureCollection's "features" array one at a time, decoding from
+    # a sliding text buffer, so only the current feature is held in memory. Anything else (a
+    # bare Feature or geometry) is small enough to load whole.
+    decoder = json.JSONDecoder()
+    with path.open(encoding="utf-8") as f:
+        buf, chunk = "", _CHUNK_CHARS
+        while (m := _FEATURES.search(buf)) is None:
+            text = f.read(chunk)
+            if not text:
+                break
+            buf += text
+        if m is None:
+            try:
+                data = json.loads(buf)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"GeoJSON file {path} contains invalid JSON.") from exc
+            if not isinstance(data, dict):
+                raise ValueError(f"GeoJSON file {path} must contain a JSON object.")
+            yield data if data.get("type") == "Feature" else {"type": "Feature", "geometry": data}
+            return
+
+        pos = m.end()
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            end = None
+            if pos < len(buf):
+                if buf[pos] == "]":
+                    return
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    pass
+            if end is None:
+                # Incomplete feature: read more. Reads grow with the buffer, so a feature larger
+                # than a chunk is decoded O(log size) times rather than once per chunk.
+                text = f.read(max(chunk, len(buf) - pos))
+                if not text:
+                    raise ValueError(f"GeoJSON file {path} contains invalid JSON.")
+                buf, pos = buf[pos:] + text, 0
+                continue
+            yield obj
+            pos = end
+            if pos > len(buf) // 2:
+                buf, pos = buf[pos:], 0
+
+
+def _ring_columns(coords: Any, *, path: Path, where: str) -> Tuple[np.ndarray, np.ndarray]:
+    # GeoJSON positions are [lon, lat(, alt)]; a closed ring's repeated last vertex is dropped.
+    try:
+        xy = np.asarray(coords, dtype=float)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{where} in {path} has non-numeric coordinates.") from exc
+    if xy.ndim == 1:
+        xy = xy[None, :]
+    if xy.ndim != 2 or xy.shape[0] == 0 or xy.shape[1] < 2:
+        raise ValueError(f"{where} in {path} must be a non-empty list of [lon, lat] positions.")
+    if xy.shape[0] > 1 and np.array_equal(xy[0, :2], xy[-1, :2]):
+        xy = xy[:-1]
+    lon, lat = np.ascontiguousarray(xy[:, 0]), np.ascontiguousarray(xy[:, 1])
+    if not (np.isfinite(lat).all() and np.isfinite(lon).all()):
+        raise ValueError(f"{where} in {path} has non-finite coordinates.")
+    if (np.abs(lat) > 90.0).any():
+        raise ValueError(f"{where} in {path} has latitude outside [-90, 90].")
+    if (np.abs(lon) > 180.0).any():
+        raise ValueError(f"{where} in {path} has longitude outside [-180, 180].")
+    return lat, lon
+
+
+def _feature_parts(feature: Any, idx: int, path: Path) -> Iterator[Tuple[str, Any]]:
+    # (component name, positions) per part: a polygon's exterior ring (holes add no extreme
+    # points), each MultiPolygon part as its own component, or point positions as they are.
+    if not isinstance(feature, dict):
+        raise ValueError(f"Feature {idx} in {path} must be an object.")
+    geometry = feature.get("geometry")
+    props = feature.get("properties") or {}
+    name = str(props.get("name") or feature.get("id") or f"feature-{idx + 1}")
+    if not isinstance(geometry, dict):
+        raise ValueError(f"Feature {idx} in {path} has no geometry.")
+    kind, coords = geometry.get("type"), geometry.get("coordinates")
+    if kind == "Polygon":
+        polygons = [coords]
+    elif kind == "MultiPolygon":
+        polygons = coords
+    elif kind in ("Point", "MultiPoint", "LineString"):
+        yield name, coords
+        return
+    else:
+        raise ValueError(f"Feature {idx} in {path} has unsupported geometry type {kind!r}.")
+    if not isinstance(polygons, list) or not polygons:
+        raise ValueError(f"Feature {idx} in {path} has no polygon coordinates.")
+    for k, rings in enumerate(polygons):
+        if not isinstance(rings, list) or not rings:
+            raise ValueError(f"Feature {idx} in {path} has an empty polygon.")
+        yield (name if len(polygons) == 1 else f"{name} #{k + 1}"), rings[0]
+
+
+def load_geojson(path: str | Path, *, decimate_deg: Optional[float] = None) -> CountryArrays:
+    """Stream a GeoJSON territory into ``CountryArrays``; each polygon (part) is one component.
+
+    Vertices are labelled with their component. With ``decimate_deg``, each ring keeps one
+    vertex per that much arc length (see ``decimate_country``).
+    """
+    p = Path(path)
+    columns: List[Column] = []
+    for idx, feature in enumerate(_iter_features(p)):
+        for name, coords in _feature_parts(feature, idx, p):
+            lat, lon = _ring_columns(coords, path=p, where=f"Feature {idx} ({name})")
+            keep = _decimation_mask(lat, lon, decimate_deg)
+            columns.append((name, lat[keep], lon[keep], name))
+    if not columns:
+        raise ValueError(f"GeoJSON file {p} must contain at least one feature.")
+    return _country_arrays({"id": p.stem}, columns)
+
+
+def _header_index(header: List[str], names: Tuple[str, ...]) -> Optional[int]:
+    lowered = [h.strip().lower() for h in header]
+    return next((lowered.index(n) for n in names if n in lowered), None)
+
+
+def load_csv_points(path: str | Path, *, decimate_deg: Optional[float] = None) -> CountryArrays:
+    """Stream a CSV point file (header with lat/lon, optional label and component columns).
+
+    Rows are parsed in chunks into compact columns and grouped by component in order of first
+    appearance; without a label column points are labelled by their component (or the file
+    name). ``decimate_deg`` decimates each component's points in row order.
+    """
+    p = Path(path)
+    groups: Dict[Optional[str], Tuple[array, array, List[str]]] = {}
+    with p.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"CSV file {p} is empty.")
+        i_lat, i_lon = _header_index(header, _LAT_NAMES), _header_index(header, _LON_NAMES)
+        if i_lat is None or i_lon is None:
+            raise ValueError(f"CSV file {p} must have 'lat' and 'lon' columns.")
+        i_label, i_comp = _header_index(header, ("label", "name")), _header_index(header, ("component",))
+        row_no = 1  # header
+        while True:
+            rows = [row for _, row in zip(range(_CSV_CHUNK_ROWS), reader) if row]
+            if not rows:
+                break
+            try:
+                lat = np.array([row[i_lat] for row in rows], dtype=float)
+                lon = np.array([row[i_lon] for row in rows], dtype=float)
+                comps = [row[i_comp] or None for row in rows] if i_comp is not None else [None] * len(rows)
+                labels = [row[i_label] for row in rows] if i_label is not None else None
+            except (IndexError, ValueError) as exc:
+                raise ValueError(f"CSV file {p} has a short or non-numeric row among rows {row_no + 1}-{row_no + len(rows)}.") from exc
+            bad = ~np.isfinite(lat) | ~np.isfinite(lon) | (np.abs(lat) > 90.0) | (np.abs(lon) > 180.0)
+            if bad.any():
+                raise ValueError(f"CSV file {p} row {row_no + int(np.argmax(bad)) + 1} has lat/lon out of range.")
+            row_no += len(rows)
+
+            # Split the chunk by component, keeping row order within each.
+            order: Dict[Optional[str], List[int]] = {}
+            for j, comp in enumerate(comps):
+                order.setdefault(comp, []).append(j)
+            for comp, idx in order.items():
+                g = groups.setdefault(comp, (array("d"), array("d"), []))
+                g[0].frombytes(lat[idx].tobytes())
+                g[1].frombytes(lon[idx].tobytes())
+                if labels is not None:
+                    g[2].extend(labels[j] or comp or p.stem for j in idx)
+    if not groups:
+        raise ValueError(f"CSV file {p} must contain at least one point.")
+
+    columns: List[Column] = []
+    for comp, (lat_a, lon_a, labels) in groups.items():
+        lat, lon = np.frombuffer(lat_a, dtype=float), np.frombuffer(lon_a, dtype=float)
+        keep = _decimation_mask(lat, lon, decimate_deg)
+        if labels:
+            labels = [x for x, k in zip(labels, keep.tolist()) if k]
+        columns.append((comp, lat[keep], lon[keep], labels or comp or p.stem))
+    return _country_arrays({"id": p.stem}, columns)
+
+
+def territory_files(data_dir: str | Path) -> List[Path]:
+    return sorted(p for p in Path(data_dir).iterdir() if p.suffix.lower() in TERRITORY_SUFFIXES)
+
+
+def load_territory(path: str | Path, *, decimate_deg: Optional[float] = None) -> CountryArrays:
+    """Load any supported territory file (.json, .geojson, .csv) into ``CountryArrays``."""
+    if decimate_deg is not None and not (decimate_deg > 0 and math.isfinite(decimate_deg)):
+        raise ValueError("decimate_deg must be a positive number of degrees.")
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix == ".geojson":
+        return load_geojson(p, decimate_deg=decimate_deg)
+    if suffix == ".csv":
+        return load_csv_points(p, decimate_deg=decimate_deg)
+    country = load_country_arrays(p)
+    return decimate_country(country, decimate_deg) if decimate_deg else country
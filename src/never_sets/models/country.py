@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -9,6 +11,8 @@ class CountryPoint:
     label: str
     lat: float
     lon: float
+    # Name of the `components` entry the point came from; None for top-level points.
+    component: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -17,3 +21,63 @@ class CountryDef:
     name: str
     points: List[CountryPoint]
     notes: str = ""
+
+
+class _PointsView(Sequence[CountryPoint]):
+    # Read-only list of CountryPoint built on demand from a CountryArrays' columns.
+    def __init__(self, country: "CountryArrays") -> None:
+        self._c = country
+
+    def __len__(self) -> int:
+        return self._c.lat.shape[0]
+
+    @overload
+    def __getitem__(self, i: int) -> CountryPoint: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[CountryPoint]: ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[CountryPoint, List[CountryPoint]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        c = self._c
+        comp = int(c.component_ids[i])
+        return CountryPoint(
+            label=c.labels[c.label_ids[i]],
+            lat=float(c.lat[i]),
+            lon=float(c.lon[i]),
+            component=c.components[comp] if comp >= 0 else None,
+        )
+
+    def __iter__(self) -> Iterator[CountryPoint]:
+        return (self[i] for i in range(len(self)))
+
+
+@dataclass(frozen=True, eq=False)
+class CountryArrays:
+    """Columnar ``CountryDef``: contiguous coordinates, interned labels and unit vectors.
+
+    ``points`` is a lazy read-only view of ``CountryPoint`` objects, so code written for
+    ``CountryDef`` keeps working; the solvers read ``unit_vectors`` directly.
+    """
+
+    id: str
+    name: str
+    lat: np.ndarray  # (K,) degrees
+    lon: np.ndarray  # (K,) degrees
+    unit_vectors: np.ndarray  # (K,3), C-contiguous
+    # Per point, an index into `labels` (distinct labels, interned) and into `components`
+    # (-1 for top-level points).
+    label_ids: np.ndarray
+    labels: Tuple[str, ...]
+    component_ids: np.ndarray
+    components: Tuple[str, ...] = ()
+    notes: str = ""
+
+    @property
+    def points(self) -> Sequence[CountryPoint]:
+        return _PointsView(self)
+
+
+# Either territory model; report and archive writers only use id/name/notes and `points`.
+AnyCountry = Union[CountryDef, CountryArrays]
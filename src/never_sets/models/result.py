@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -11,6 +14,10 @@ class Witness:
     worst_max_dot: float
     worst_max_altitude_deg: float
     best_point_indices: Tuple[int, ...]
+    # Certified [lower, upper] enclosure of the continuous minimum (adaptive engine only).
+    worst_max_dot_bounds: Optional[Tuple[float, float]] = None
+    # Per input point, the worst-case max altitude with that point removed (criticality mode).
+    leave_one_out_altitude_deg: Optional[Tuple[float, ...]] = None
 
 
 @dataclass(frozen=True)
@@ -20,3 +27,62 @@ class CoverageResult:
     limit_dot: float
     witness: Witness
     margin_altitude_deg: float
+
+
+@dataclass(frozen=True)
+class ComponentSubset:
+    components: Tuple[str, ...]
+    worst_max_altitude_deg: float
+
+
+@dataclass(frozen=True)
+class SubsetAnalysis:
+    limit_altitude_deg: float
+    components: Tuple[str, ...]
+    # Passing sets of components none of whose proper subsets pass, smallest first.
+    minimal_passing_subsets: Tuple[ComponentSubset, ...]
+
+
+@dataclass(frozen=True)
+class DensifiedResult:
+    result: Union[CoverageResult, List[CoverageResult]]
+    # Boundary vertices followed by the samples added, as (lat, lon).
+    points: Tuple[Tuple[float, float], ...]
+    rounds: int
+    converged: bool
+    # Sampled worst-case max altitude and an upper bound for the continuous boundary (same grid).
+    worst_max_altitude_bounds_deg: Tuple[float, float]
+
+
+@dataclass(frozen=True, eq=False)
+class ParameterSweep:
+    obliquities_deg: Tuple[float, ...]
+    limits_deg: Tuple[float, ...]
+    # One worst-case witness per obliquity; the limits only change verdicts and margins.
+    witnesses: Tuple[Witness, ...]
+    # (obliquity, limit) verdicts and altitude margins, as coverage_result would give them.
+    passes: np.ndarray
+    margins_deg: np.ndarray
+
+
+@dataclass(frozen=True)
+class EphemerisResult:
+    result: Union[CoverageResult, List[CoverageResult]]
+    # Earliest evaluated instant attaining the worst case.
+    worst_time_utc: datetime
+    instants: int
+    step_seconds: float
+
+
+@dataclass(frozen=True, eq=False)
+class EnsembleResult:
+    radius_deg: float
+    seed: int
+    limits_deg: Tuple[float, ...]
+    quantile_levels: Tuple[float, ...]
+    # Per replica, the worst-case max altitude of its jittered point set.
+    worst_max_altitudes_deg: np.ndarray
+    # margin_quantiles_deg[j][q]: margin quantile at quantile_levels[q] for limits_deg[j].
+    margin_quantiles_deg: Tuple[Tuple[float, ...], ...]
+    # Share of replicas that PASS, per limit.
+    pass_probability: Tuple[float, ...]
@@ -1,13 +1,44 @@
 import json
 import math
+import os
 import sys
 import tempfile
 import unittest
+from unittest import mock
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from never_sets import check_never_sets, load_country, to_latlon_list
+from never_sets import (
+    PointIndex,
+    TerritorySession,
+    check_never_sets,
+    check_never_sets_many,
+    load_country,
+    load_country_arrays,
+    load_csv_points,
+    load_geojson,
+    load_territory,
+    to_country_arrays,
+    to_latlon_list,
+)
+from never_sets.cli.batch import run_batch
+from never_sets.core.solver import DEFAULT_MAX_BYTES
+from never_sets.core.backends import get_backend
+from never_sets.core.densify import densify_boundary
+from never_sets.core.envelope import envelope_min_over_hour
+from never_sets.core.geometry import SunGrid, latlon_to_unit
+from never_sets.core.parameter_sweep import parameter_sweep
+from never_sets.core.pruning import prune_dominated_points
+from never_sets.core.subsets import analyze_component_subsets
+from never_sets.io.country_loader import country_components
+
+try:
+    import numba  # noqa: F401
+except ImportError:
+    numba = None
 
 DATA = Path(__file__).resolve().parents[1] / "data" / "countries"
 
@@ -74,6 +105,433 @@ class TestNeverSets(unittest.TestCase):
         with self.assertRaises(ValueError):
             check_never_sets(pts)
 
+    def test_chunked_sweep_matches_single_block(self):
+        c = load_country(DATA / "usa.json")
+        pts = to_latlon_list(c)
+        ref = check_never_sets(pts, decl_step_deg=2.0, hour_angle_step_deg=2.0, max_bytes=None)
+        for max_bytes in (1, 4096, 10**6):
+            res = check_never_sets(pts, decl_step_deg=2.0, hour_angle_step_deg=2.0, max_bytes=max_bytes)
+            self.assertEqual(res, ref)
+
+    def test_rejects_invalid_max_bytes(self):
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], max_bytes=0)
+
+    def test_adaptive_engine_certifies_grid_minimum(self):
+        c = load_country(DATA / "france.json")
+        pts = to_latlon_list(c)
+        grid = check_never_sets(pts, decl_step_deg=0.25, hour_angle_step_deg=0.25)
+        res = check_never_sets(pts, engine="adaptive", tolerance_deg=1e-6)
+        lower, upper = res.witness.worst_max_dot_bounds
+        self.assertLessEqual(lower, upper)
+        self.assertEqual(res.witness.worst_max_dot, upper)
+        self.assertLessEqual(lower, grid.witness.worst_max_dot)
+        self.assertLess(math.degrees(math.asin(upper)) - math.degrees(math.asin(lower)), 1e-6)
+        self.assertTrue(res.always_daylight_somewhere)
+        self.assertIsNone(grid.witness.worst_max_dot_bounds)
+
+    def test_adaptive_engine_matches_single_point_closed_form(self):
+        # One point at latitude φ: the worst direction is local midnight at the opposite solstice.
+        res = check_never_sets([(45.0, 10.0)], engine="adaptive", tolerance_deg=1e-6)
+        self.assertAlmostEqual(res.witness.worst_max_altitude_deg, 45.0 - 23.439281 - 90.0, places=5)
+        self.assertAlmostEqual(res.witness.hour_angle_deg, 190.0, places=3)
+
+    def test_envelope_engine_is_exact_in_hour_angle(self):
+        c = load_country(DATA / "usa.json")
+        pts = to_latlon_list(c)
+        grid = check_never_sets(pts, decl_step_deg=1.0, hour_angle_step_deg=0.05)
+        res = check_never_sets(pts, engine="envelope", decl_step_deg=1.0)
+        # Same declinations, exact hour angle: never above the sampled value, and close to it.
+        self.assertLessEqual(res.witness.worst_max_dot, grid.witness.worst_max_dot)
+        self.assertLess(grid.witness.worst_max_dot - res.witness.worst_max_dot, 1e-3)
+        self.assertEqual(res.always_daylight_somewhere, grid.always_daylight_somewhere)
+        # The minimum of the envelope sits on a kink, so two points tie at the witness.
+        self.assertGreaterEqual(len(res.witness.best_point_indices), 2)
+
+    def test_envelope_engine_single_point_midnight(self):
+        res = check_never_sets([(45.0, 10.0)], engine="envelope", decl_step_deg=1.0)
+        self.assertAlmostEqual(res.witness.hour_angle_deg, 190.0, places=9)
+        self.assertEqual(res.witness.best_point_indices, (0,))
+
+    def test_envelope_chunks_match_single_walk(self):
+        from never_sets.core.envelope import envelope_min_max_dot
+
+        N = to_country_arrays(load_country(DATA / "usa.json")).unit_vectors
+        decls = np.arange(-23.0, 23.5, 0.5)
+        ref = envelope_min_max_dot(N, decls)
+        for max_bytes in (1, 10**5):
+            values, hours = envelope_min_max_dot(N, decls, max_bytes)
+            np.testing.assert_array_equal(values, ref[0])
+            np.testing.assert_array_equal(hours, ref[1])
+        # Each declination on its own gives the same exact minimum.
+        for k in (0, 40, 92):
+            H, v = envelope_min_over_hour(N, math.radians(decls[k]))
+            self.assertEqual(v, ref[0][k])
+            self.assertAlmostEqual(math.degrees(H), ref[1][k], places=9)
+
+    def test_envelope_walk_refuses_partial_circle(self):
+        # A walk that stalls (here: forced tiny steps) must not report a partial-interval minimum.
+        with mock.patch("never_sets.core.envelope._next_upcrossing", return_value=1e-9):
+            with self.assertRaises(RuntimeError):
+                envelope_min_over_hour(np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]), 0.1)
+
+    def test_pruning_dominated_points_keeps_result(self):
+        # A dense high-latitude cluster: only its most sunward edge can ever be the best point.
+        pts = [(60.0 + 0.5 * i, 10.0 + 0.5 * j) for i in range(10) for j in range(10)]
+        kept, index_map = prune_dominated_points(pts)
+        self.assertLess(len(kept), len(pts))
+        self.assertEqual(kept, [pts[i] for i in index_map])
+        ref = check_never_sets(pts, decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        res = check_never_sets(pts, decl_step_deg=1.0, hour_angle_step_deg=1.0, prune_dominated=True)
+        self.assertEqual(res, ref)
+
+    def test_pruning_keeps_duplicate_points(self):
+        pts = [(0.0, 0.0), (0.0, 0.0)]
+        kept, index_map = prune_dominated_points(pts)
+        self.assertEqual(index_map, [0, 1])
+
+    def test_point_index_sweep_matches_brute_force(self):
+        c = load_country(DATA / "russia.json")
+        pts = to_latlon_list(c)
+        ref = check_never_sets(pts, decl_step_deg=2.0, hour_angle_step_deg=2.0)
+        index = PointIndex.from_country(c, leaf_size=2)
+        res = check_never_sets(pts, decl_step_deg=2.0, hour_angle_step_deg=2.0, point_index=index)
+        self.assertEqual(res, ref)
+
+    def test_point_index_max_dot_matches_brute_force(self):
+        pts = [(lat, lon) for lat in range(-80, 81, 7) for lon in range(-180, 180, 11)]
+        index = PointIndex.from_points(pts, leaf_size=4)
+        N = np.vstack([latlon_to_unit(lat, lon) for lat, lon in pts])
+        rng = np.random.default_rng(0)
+        S = rng.normal(size=(200, 3))
+        S /= np.linalg.norm(S, axis=1)[:, None]
+        values, indices = index.max_dot(S)
+        brute = (S @ N.T).max(axis=1)
+        np.testing.assert_allclose(values, brute, rtol=0, atol=1e-15)
+        np.testing.assert_allclose(np.einsum("mq,mq->m", N[indices], S), values, rtol=0, atol=1e-15)
+
+    def test_point_index_must_match_points(self):
+        index = PointIndex.from_points([(0.0, 0.0)])
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0), (1.0, 1.0)], point_index=index)
+
+    def test_multiple_limits_share_one_sweep(self):
+        c = load_country(DATA / "usa.json")
+        pts = to_latlon_list(c)
+        limits = [0.0, -0.833, -6.0, -12.0, -18.0, -30.0]
+        results = check_never_sets(pts, visibility_limit_deg=limits, decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        self.assertEqual([r.limit_altitude_deg for r in results], limits)
+        for limit, res in zip(limits, results):
+            single = check_never_sets(pts, visibility_limit_deg=limit, decl_step_deg=1.0, hour_angle_step_deg=1.0)
+            self.assertEqual(res, single)
+        self.assertFalse(results[0].always_daylight_somewhere)
+        self.assertTrue(results[-1].always_daylight_somewhere)
+
+    def test_rejects_empty_limit_list(self):
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], visibility_limit_deg=[])
+
+    def test_shared_sun_grid_matches_private_grid(self):
+        c = load_country(DATA / "uk_no_biot.json")
+        pts = to_latlon_list(c)
+        ref = check_never_sets(pts, decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        grid = SunGrid(decl_step_deg=1.0, hour_angle_step_deg=1.0).materialize()
+        self.assertEqual(check_never_sets(pts, decl_step_deg=1.0, hour_angle_step_deg=1.0, sun_grid=grid), ref)
+        with tempfile.TemporaryDirectory() as tmp:
+            mapped = SunGrid.load(grid.save(tmp), mmap=True)
+            self.assertIsInstance(mapped.sun_vectors, np.memmap)
+            res = check_never_sets(pts, decl_step_deg=1.0, hour_angle_step_deg=1.0, sun_grid=mapped, max_bytes=4096)
+            self.assertEqual(res, ref)
+            del mapped
+
+    def test_rejects_mismatched_sun_grid(self):
+        grid = SunGrid(decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], decl_step_deg=0.5, hour_angle_step_deg=1.0, sun_grid=grid)
+
+    def test_fused_many_matches_per_territory_calls(self):
+        territories = [to_latlon_list(load_country(DATA / name)) for name in ("france.json", "uk_no_biot.json")]
+        territories += [[(90.0, 0.0)], [(10.0, 20.0)] * 3, [(-45.0, 170.0), (-44.0, -175.0)]]
+        backends = ["numpy"] + (["numba"] if numba else [])
+        # 0.7° hour steps leave a ragged tail of hours for the Numba kernel's 4-hour lanes.
+        for hour_step in (1.0, 0.7):
+            kwargs = dict(decl_step_deg=1.0, hour_angle_step_deg=hour_step, visibility_limit_deg=[0.0, -0.833])
+            ref = [check_never_sets(pts, **kwargs) for pts in territories]
+            for backend in backends:
+                self.assertEqual(check_never_sets_many(territories, backend=backend, **kwargs), ref)
+                self.assertEqual(check_never_sets_many(territories, max_bytes=4096, backend=backend, **kwargs), ref)
+        self.assertEqual(check_never_sets_many([]), [])
+
+    def test_session_edits_match_fresh_solve(self):
+        pts = to_latlon_list(load_country(DATA / "uk_no_biot.json"))
+        kwargs = dict(decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        session = TerritorySession(pts, **kwargs)
+        self.assertEqual(session.result([0.0, -0.833]), check_never_sets(pts, visibility_limit_deg=[0.0, -0.833], **kwargs))
+        current = list(pts)
+        for edit in (0, (-25.07, -130.1), 3, (36.14, -5.35), (36.14, -5.35), -1, 0):
+            if isinstance(edit, tuple):
+                self.assertEqual(session.add_point(*edit), len(current))
+                current.append(edit)
+            else:
+                self.assertEqual(session.remove_point(edit), current.pop(edit))
+            self.assertEqual(session.result(), check_never_sets(current, **kwargs))
+
+    def test_session_keeps_one_point(self):
+        session = TerritorySession([(0.0, 0.0)], decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        with self.assertRaises(ValueError):
+            session.remove_point(0)
+        with self.assertRaises(ValueError):
+            session.add_point(95.0, 0.0)
+
+    def test_criticality_matches_leave_one_out_solves(self):
+        pts = to_latlon_list(load_country(DATA / "france.json"))
+        kwargs = dict(decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        res = check_never_sets(pts, criticality=True, max_bytes=4096, **kwargs)
+        self.assertEqual(res.witness.worst_max_dot, check_never_sets(pts, **kwargs).witness.worst_max_dot)
+        expected = tuple(
+            check_never_sets(pts[:k] + pts[k + 1 :], **kwargs).witness.worst_max_altitude_deg for k in range(len(pts))
+        )
+        self.assertEqual(res.witness.leave_one_out_altitude_deg, expected)
+        single = check_never_sets([(10.0, 20.0)], criticality=True, **kwargs)
+        self.assertEqual(single.witness.leave_one_out_altitude_deg, (-90.0,))
+        with self.assertRaises(ValueError):
+            check_never_sets(pts, criticality=True, engine="envelope")
+
+    def test_criticality_verdict_matches_overall_at_the_limit(self):
+        from never_sets.io.report_writer import render_markdown_report
+
+        country = load_country(DATA / "france.json")
+        # A duplicated point: leaving one copy out keeps the worst case exactly as it is.
+        country = type(country)(country.id, country.name, [country.points[0]] + list(country.points))
+        kwargs = dict(decl_step_deg=2.0, hour_angle_step_deg=2.0)
+        worst = check_never_sets(to_latlon_list(country), **kwargs).witness.worst_max_altitude_deg
+        # The limit sits on the worst case up to rounding: the verdict is a PASS.
+        res = check_never_sets(to_latlon_list(country), visibility_limit_deg=worst + 1e-10, criticality=True, **kwargs)
+        self.assertTrue(res.always_daylight_somewhere)
+        self.assertEqual(res.witness.leave_one_out_altitude_deg[0], worst)
+        table = render_markdown_report(country, res).split("## Point criticality")[1]
+        row = next(line for line in table.splitlines() if "00. **" in line)
+        self.assertIn("PASS", row)
+        self.assertNotIn("load-bearing", row)
+
+    def test_minimal_component_subsets_match_brute_force(self):
+        comps = country_components(load_country(DATA / "france.json"))
+        kwargs = dict(decl_step_deg=2.0, hour_angle_step_deg=2.0)
+        analysis = analyze_component_subsets(comps, **kwargs)
+        # A budget too small to cache the fields re-sweeps them instead, with the same result.
+        self.assertEqual(analyze_component_subsets(comps, max_bytes=4096, **kwargs), analysis)
+        found = {s.components: s.worst_max_altitude_deg for s in analysis.minimal_passing_subsets}
+        self.assertTrue(found)
+        for subset, worst in found.items():
+            pts = [p for n in subset for p in comps[n]]
+            self.assertEqual(check_never_sets(pts, **kwargs).witness.worst_max_altitude_deg, worst)
+            for n in subset:
+                rest = [p for m in subset if m != n for p in comps[m]]
+                self.assertFalse(rest and check_never_sets(rest, **kwargs).always_daylight_somewhere)
+
+    def test_decide_mode_matches_full_sweep_verdict(self):
+        kwargs = dict(decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        for name in ("france.json", "uk_no_biot.json", "usa.json"):
+            pts = to_latlon_list(load_country(DATA / name))
+            worst = check_never_sets(pts, **kwargs).witness.worst_max_altitude_deg
+            limits = [0.0, -18.0, worst, worst + 1e-6]
+            full = check_never_sets(pts, visibility_limit_deg=limits, **kwargs)
+            decided = check_never_sets(pts, visibility_limit_deg=limits, mode="decide", **kwargs)
+            self.assertEqual(
+                [r.always_daylight_somewhere for r in decided], [r.always_daylight_somewhere for r in full]
+            )
+            for r in decided:
+                if r.always_daylight_somewhere:
+                    self.assertGreaterEqual(r.witness.worst_max_dot, full[0].witness.worst_max_dot)
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], mode="decide", engine="adaptive")
+
+    @unittest.skipUnless(numba, "numba not installed")
+    def test_numba_backend_matches_numpy_bitwise(self):
+        self.assertEqual(get_backend("numba").name, "numba")
+        # Compiled from a module-level function, so Numba's cache is not keyed to a closure.
+        kernel = get_backend("numba")._kernel.py_func
+        self.assertEqual(kernel.__qualname__, kernel.__name__)
+        pts = to_latlon_list(load_country(DATA / "usa.json"))
+        kwargs = dict(visibility_limit_deg=[0.0, -0.833], decl_step_deg=0.5, hour_angle_step_deg=0.5)
+        for max_bytes in (4096, 1 << 16, 1 << 20, None):
+            fast = check_never_sets(pts, backend="numba", max_bytes=max_bytes, **kwargs)
+            ref = check_never_sets(pts, backend="numpy", max_bytes=max_bytes, **kwargs)
+            self.assertEqual(fast, ref)
+
+    def test_backend_option_is_validated(self):
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], backend="bogus")
+        with self.assertRaises(ValueError):
+            get_backend("bogus")
+        for kwargs in (dict(engine="adaptive"), dict(engine="envelope"), dict(mode="decide"), dict(criticality=True)):
+            with self.assertRaises(ValueError):
+                check_never_sets([(0.0, 0.0)], backend="numpy", **kwargs)
+        pts = [(0.0, 0.0), (10.0, 90.0)]
+        with self.assertRaises(ValueError):
+            check_never_sets(pts, backend="numpy", point_index=PointIndex.from_points(pts))
+
+    def test_mixed_precision_matches_float64_exactly(self):
+        kwargs = dict(visibility_limit_deg=[0.0, -0.833, -18.0], decl_step_deg=0.7, hour_angle_step_deg=0.7)
+        for name in ("france.json", "uk_no_biot.json", "usa.json"):
+            pts = to_latlon_list(load_country(DATA / name))
+            for max_bytes in (4096, None):
+                ref = check_never_sets(pts, backend="numpy", max_bytes=max_bytes, **kwargs)
+                self.assertEqual(check_never_sets(pts, precision="mixed", max_bytes=max_bytes, **kwargs), ref)
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], precision="float16")
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], precision="mixed", engine="adaptive")
+
+    def test_coverage_field_export_matches_full_sweep(self):
+        from never_sets.core.field import CoverageField
+
+        pts = to_latlon_list(load_country(DATA / "usa.json"))
+        kwargs = dict(decl_step_deg=1.5, hour_angle_step_deg=1.5)
+        ref = check_never_sets(pts, **kwargs)
+        N = np.array([latlon_to_unit(lat, lon) for lat, lon in pts])
+        with tempfile.TemporaryDirectory() as tmp:
+            res = check_never_sets(pts, field_dir=tmp, max_bytes=8192, **kwargs)
+            self.assertEqual(res, ref)
+            field = CoverageField.load(tmp)
+            dots = np.einsum("kc,dch->dkh", N, field.grid.materialize().sun_vectors)
+            self.assertTrue(np.array_equal(field.argmax, dots.argmax(axis=1)))
+            self.assertEqual(field.argmax.dtype, np.uint16)
+            np.testing.assert_allclose(field.max_dot, dots.max(axis=1), rtol=0, atol=1e-15)
+            self.assertEqual(float(field.max_dot.min()), ref.witness.worst_max_dot)
+
+            pruned = Path(tmp) / "pruned"
+            check_never_sets(pts, field_dir=pruned, field_dtype="float32", prune_dominated=True, **kwargs)
+            small = CoverageField.load(pruned)
+            self.assertEqual(small.max_dot.dtype, np.float32)
+            self.assertTrue(np.array_equal(small.argmax, field.argmax))
+        with self.assertRaises(ValueError):
+            check_never_sets(pts, field_dir="unused", engine="envelope")
+
+    def test_parameter_sweep_matches_separate_solves(self):
+        obliquities, limits = [23.5, 10.0, 22.0, 20.0], [0.0, -0.833, -6.0, -18.0]
+        kwargs = dict(decl_step_deg=0.5, hour_angle_step_deg=0.5)
+        for name in ("france.json", "usa.json", "russia.json"):
+            pts = to_latlon_list(load_country(DATA / name))
+            sweep = parameter_sweep(pts, obliquities_deg=obliquities, visibility_limits_deg=limits, **kwargs)
+            self.assertEqual(sweep.passes.shape, (4, 4))
+            for i, obliquity in enumerate(obliquities):
+                # 2 * obliquity is a multiple of the step, so the declinations coincide.
+                ref = check_never_sets(pts, obliquity_deg=obliquity, visibility_limit_deg=limits, **kwargs)
+                self.assertEqual(sweep.witnesses[i].worst_max_dot, ref[0].witness.worst_max_dot)
+                self.assertEqual(sweep.passes[i].tolist(), [r.always_daylight_somewhere for r in ref])
+                self.assertEqual(sweep.margins_deg[i].tolist(), [r.margin_altitude_deg for r in ref])
+        with self.assertRaises(ValueError):
+            parameter_sweep(pts, obliquities_deg=[], visibility_limits_deg=limits)
+
+    def test_ephemeris_mode_finds_worst_instant(self):
+        from datetime import datetime, timezone
+
+        from never_sets.core.ephemeris import J2000_UTC, check_never_sets_over_time, solar_position
+
+        def days(t):
+            return (t - J2000_UTC).total_seconds() / 86400.0
+
+        # June 2024 solstice at 20:51 UTC; on 11 February solar noon at Greenwich is near 12:14.
+        decl, _ = solar_position(np.array([days(datetime(2024, 6, 20, 20, 51, tzinfo=timezone.utc))]))
+        self.assertAlmostEqual(decl[0], 23.44, delta=0.01)
+        _, gha = solar_position(np.array([days(datetime(2024, 2, 11, 12, 14, tzinfo=timezone.utc))]))
+        self.assertLess(min(gha[0], 360.0 - gha[0]), 0.1)
+
+        c = load_country_arrays(DATA / "france.json")
+        start = datetime(2024, 12, 20, tzinfo=timezone.utc)
+        ref = None
+        for backend, max_bytes in (("numpy", 4096), ("auto", DEFAULT_MAX_BYTES)):
+            res = check_never_sets_over_time(
+                c, start=start, end="2024-12-22T23:59", step_seconds=300, visibility_limit_deg=[0.0, 89.0],
+                backend=backend, max_bytes=max_bytes,
+            )
+            ref = ref or res
+            self.assertEqual(res, ref)
+        # Brute force over the same instants.
+        decl, gha = solar_position(days(start) + np.arange(ref.instants) * 300 / 86400.0)
+        d, h = np.radians(decl), np.radians(-gha)
+        S = np.stack([np.cos(d) * np.cos(h), np.cos(d) * np.sin(h), np.sin(d)])
+        max_dots = (c.unit_vectors @ S).max(axis=0)
+        i = int(np.argmin(max_dots))
+        self.assertEqual(ref.instants, 3 * 288)
+        self.assertEqual((ref.worst_time_utc - start).total_seconds(), 300 * i)
+        self.assertAlmostEqual(ref.result[0].witness.worst_max_dot, max_dots[i], places=12)
+        self.assertEqual([r.always_daylight_somewhere for r in ref.result], [True, False])
+
+    def test_jitter_ensemble_matches_replica_sweeps(self):
+        from never_sets.core.point_index import fixed_order_dots
+        from never_sets.core.robustness import _jitter, _tangent_basis, jitter_ensemble
+
+        c = load_country_arrays(DATA / "usa.json")
+        kwargs = dict(decl_step_deg=2.0, hour_angle_step_deg=2.0)
+        base = check_never_sets(c, **kwargs)
+        still = jitter_ensemble(c, radius_deg=0.0, replicas=2, **kwargs)
+        self.assertEqual(still.worst_max_altitudes_deg.tolist(), [base.witness.worst_max_altitude_deg] * 2)
+
+        limits = [0.0, base.witness.worst_max_altitude_deg]
+        ens = jitter_ensemble(c, radius_deg=1.0, replicas=50, seed=7, visibility_limit_deg=limits, **kwargs)
+        small = jitter_ensemble(c, radius_deg=1.0, replicas=50, seed=7, visibility_limit_deg=limits, max_bytes=2048, **kwargs)
+        self.assertTrue(np.array_equal(ens.worst_max_altitudes_deg, small.worst_max_altitudes_deg))
+        # Each replica's worst case over the full grid, one at a time.
+        N, K = c.unit_vectors, c.unit_vectors.shape[0]
+        P = _jitter(N, _tangent_basis(N), 1.0, np.random.default_rng(7), 50)
+        S = SunGrid(**kwargs).materialize().sun_vectors.transpose(0, 2, 1).reshape(-1, 3)
+        worst = [fixed_order_dots(P[r * K : (r + 1) * K], S).max(axis=1).min() for r in range(50)]
+        self.assertTrue(np.array_equal(np.degrees(np.arcsin(worst)), ens.worst_max_altitudes_deg))
+        self.assertEqual(ens.pass_probability[0], 0.0)
+        self.assertTrue(0.0 < ens.pass_probability[1] < 1.0)
+        q = ens.margin_quantiles_deg[1]
+        self.assertEqual(list(q), sorted(q))
+
+    def test_columnar_country_matches_list_model(self):
+        kwargs = dict(visibility_limit_deg=[0.0, -18.0], decl_step_deg=2.0, hour_angle_step_deg=2.0)
+        for path in sorted(DATA.glob("*.json")):
+            country = load_country(path)
+            arrays = load_country_arrays(path)
+            self.assertEqual(list(arrays.points), country.points)
+            self.assertEqual(to_latlon_list(arrays), to_latlon_list(country))
+            self.assertTrue(np.array_equal(to_country_arrays(country).unit_vectors, arrays.unit_vectors))
+            self.assertEqual(check_never_sets(arrays, **kwargs), check_never_sets(to_latlon_list(country), **kwargs))
+        with tempfile.TemporaryDirectory() as tmp:
+            bad = Path(tmp) / "bad.json"
+            points = [{"label": "a", "lat": 0, "lon": 0}, {"label": "b", "lat": 91, "lon": 0}]
+            bad.write_text(json.dumps({"id": "x", "points": points}), encoding="utf-8")
+            with self.assertRaises(ValueError) as listed:
+                load_country(bad)
+            with self.assertRaises(ValueError) as columnar:
+                load_country_arrays(bad)
+            self.assertEqual(str(columnar.exception), str(listed.exception))
+
+    def test_densify_boundary_brackets_dense_sampling(self):
+        # Two coarse triangles whose worst case lies inside an edge, not at a vertex.
+        rings = [[(0.0, -60.0), (40.0, 60.0), (-10.0, 20.0)], [(-20.0, 150.0), (20.0, -160.0), (-30.0, 170.0)]]
+        kwargs = dict(decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        out = densify_boundary(rings, tolerance_deg=1e-3, **kwargs)
+        lo, hi = out.worst_max_altitude_bounds_deg
+        self.assertTrue(out.converged)
+        self.assertLessEqual(hi - lo, 1e-3)
+        self.assertEqual(out.result, check_never_sets(out.points, **kwargs))
+        self.assertLess(len(out.points) - 6, 6)
+
+        dense = []
+        for ring in rings:
+            for (la0, lo0), (la1, lo1) in zip(ring, ring[1:] + ring[:1]):
+                a, b = latlon_to_unit(la0, lo0), latlon_to_unit(la1, lo1)
+                for f in np.linspace(0.0, 1.0, 400):
+                    v = (1 - f) * a + f * b
+                    v /= np.linalg.norm(v)
+                    dense.append((math.degrees(math.asin(v[2])), math.degrees(math.atan2(v[1], v[0]))))
+        sampled = check_never_sets(dense, **kwargs).witness.worst_max_altitude_deg
+        vertices = check_never_sets([pt for ring in rings for pt in ring], **kwargs).witness.worst_max_altitude_deg
+        self.assertGreater(lo, vertices + 0.01)
+        self.assertLessEqual(sampled, hi + 1e-9)
+        self.assertGreater(sampled, lo - 1e-3)
+
+    def test_rejects_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            check_never_sets([(0.0, 0.0)], engine="bogus")
+
     def test_rejects_out_of_range_points(self):
         pts = [(100.0, 0.0)]
         with self.assertRaises(ValueError):
@@ -82,6 +540,210 @@ class TestNeverSets(unittest.TestCase):
         with self.assertRaises(ValueError):
             check_never_sets(pts)
 
+class TestBatch(unittest.TestCase):
+    def test_batch_reports_every_limit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = run_batch(DATA, tmp, limit=[0.0, -18.0], decl_step=2.0, hour_step=2.0)
+            self.assertEqual(summary["visibility_limit_deg"], [0.0, -18.0])
+            france = next(c for c in summary["countries"] if c["id"] == "france")
+            self.assertEqual([v["pass"] for v in france["verdicts"]], [True, True])
+            witness = json.loads((Path(tmp) / "france" / "witness.json").read_text(encoding="utf-8"))
+            self.assertEqual(len(witness["results"]), 2)
+            report = (Path(tmp) / "france" / "report.md").read_text(encoding="utf-8")
+            self.assertIn("2/2 limits PASS", report)
+
+    def test_batch_memory_respects_max_bytes(self):
+        import tracemalloc
+
+        grid_bytes = SunGrid(decl_step_deg=0.25, hour_angle_step_deg=0.25).nbytes
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp) / "data"
+            data.mkdir()
+            pts = [{"label": f"p{i}", "lat": 10.0 * i - 40.0, "lon": 35.0 * i} for i in range(8)]
+            (data / "t.json").write_text(json.dumps({"id": "t", "name": "t", "points": pts}), encoding="utf-8")
+            tracemalloc.start()
+            try:
+                run_batch(
+                    data,
+                    Path(tmp) / "out",
+                    limit=0.0,
+                    decl_step=0.25,
+                    hour_step=0.25,
+                    max_bytes=256 * 1024,
+                    backend="numpy",
+                )
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        # The (D,3,H) Sun grid is far over the budget, so it must not be built.
+        self.assertLess(peak, grid_bytes // 2)
+
+    def test_batch_single_limit_keeps_flat_summary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = run_batch(DATA, tmp, limit=0.0, decl_step=2.0, hour_step=2.0)
+            self.assertEqual(summary["visibility_limit_deg"], 0.0)
+            self.assertIn("pass", summary["countries"][0])
+            self.assertNotIn("verdicts", summary["countries"][0])
+
+    def test_batch_criticality_ranks_points(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            run_batch(DATA, tmp, limit=0.0, decl_step=2.0, hour_step=2.0, criticality=True)
+            witness = json.loads((Path(tmp) / "france" / "witness.json").read_text(encoding="utf-8"))
+            ranked = witness["witness"]["criticality"]
+            self.assertEqual(len(ranked), len(witness["country"]["points"]))
+            without = [r["worst_max_altitude_deg_without"] for r in ranked]
+            self.assertEqual(without, sorted(without))
+            report = (Path(tmp) / "france" / "report.md").read_text(encoding="utf-8")
+            self.assertIn("## Point criticality", report)
+
+    def test_batch_decide_mode_keeps_one_witness_per_limit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            limits = [0.0, -18.0]
+            summary = run_batch(DATA, tmp, limit=limits, decl_step=2.0, hour_step=2.0, mode="decide")
+            france = next(c for c in summary["countries"] if c["id"] == "france")
+            self.assertNotIn("worst_altitude_deg", france)
+            witness = json.loads((Path(tmp) / "france" / "witness.json").read_text(encoding="utf-8"))
+            self.assertNotIn("witness", witness)
+            pts = to_latlon_list(load_country(DATA / "france.json"))
+            decided = check_never_sets(
+                pts, visibility_limit_deg=limits, decl_step_deg=2.0, hour_angle_step_deg=2.0, mode="decide"
+            )
+            for v, w, r in zip(france["verdicts"], witness["results"], decided):
+                self.assertEqual(w["witness"]["kind"], "decision witness / bound")
+                self.assertEqual(w["witness"]["decl_deg"], r.witness.decl_deg)
+                self.assertEqual(v["witness_hour_angle_deg"], r.witness.hour_angle_deg)
+                self.assertEqual(v["altitude_upper_bound_deg"], r.witness.worst_max_altitude_deg)
+            report = (Path(tmp) / "france" / "report.md").read_text(encoding="utf-8")
+            self.assertIn("## Decision witness / bound (per limit)", report)
+            self.assertNotIn("## Witness (worst case", report)
+
+    def test_parallel_batch_matches_serial_and_records_failures(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp) / "data"
+            data.mkdir()
+            for name in ("france", "usa", "russia"):
+                (data / f"{name}.json").write_text((DATA / f"{name}.json").read_text(encoding="utf-8"), encoding="utf-8")
+            (data / "broken.json").write_text(json.dumps({"id": "broken"}), encoding="utf-8")
+            serial = run_batch(data, Path(tmp) / "serial", limit=0.0, decl_step=2.0, hour_step=2.0)
+            parallel = run_batch(data, Path(tmp) / "parallel", limit=0.0, decl_step=2.0, hour_step=2.0, workers=2)
+        self.assertEqual(serial["countries"], parallel["countries"])
+        self.assertEqual([c["id"] for c in parallel["countries"]], ["france", "russia", "usa"])
+        self.assertEqual([f["file"] for f in parallel["failures"]], ["broken.json"])
+
+    def test_consolidated_layouts_match_files(self):
+        import zipfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            kwargs = dict(limit=0.0, decl_step=2.0, hour_step=2.0)
+            files = run_batch(DATA, Path(tmp) / "files", **kwargs)
+            jsonl = run_batch(DATA, Path(tmp) / "jsonl", output_layout="jsonl", **kwargs)
+            run_batch(DATA, Path(tmp) / "zip", output_layout="zip", **kwargs)
+            self.assertNotIn("countries", jsonl)
+            self.assertEqual(jsonl["country_count"], len(files["countries"]))
+            entries = (Path(tmp) / "jsonl" / "summary.jsonl").read_text(encoding="utf-8").splitlines()
+            self.assertEqual([json.loads(e) for e in entries], files["countries"])
+
+            records = [json.loads(line) for line in (Path(tmp) / "jsonl" / "results.jsonl").open(encoding="utf-8")]
+            self.assertEqual([r["id"] for r in records], [c["id"] for c in files["countries"]])
+            with zipfile.ZipFile(Path(tmp) / "zip" / "results.zip") as zf:
+                for r in records:
+                    cid = r["id"]
+                    report = (Path(tmp) / "files" / cid / "report.md").read_text(encoding="utf-8")
+                    self.assertEqual(r["outputs"]["report.md"], report)
+                    self.assertEqual(zf.read(f"{cid}/report.md").decode("utf-8"), report)
+                    witness = json.loads(zf.read(f"{cid}/witness.json"))
+                    self.assertEqual(witness["witness"], r["outputs"]["witness.json"]["witness"])
+            self.assertFalse((Path(tmp) / "zip" / "france").exists())
+
+    def test_batch_reports_jitter_robustness(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = run_batch(
+                DATA, tmp, limit=[0.0, -18.0], decl_step=2.0, hour_step=2.0, jitter_radius_deg=0.5, jitter_replicas=20
+            )
+            france = next(c for c in summary["countries"] if c["id"] == "france")
+            self.assertEqual([v["pass_probability"] for v in france["verdicts"]], [1.0, 1.0])
+            witness = json.loads((Path(tmp) / "france" / "witness.json").read_text(encoding="utf-8"))
+            robustness = witness["robustness"]
+            self.assertEqual(robustness["replicas"], 20)
+            self.assertEqual(len(robustness["limits"][1]["margin_quantiles_deg"]), len(robustness["quantile_levels"]))
+            report = (Path(tmp) / "france" / "report.md").read_text(encoding="utf-8")
+            self.assertIn("## Robustness under coordinate uncertainty", report)
+
+    def test_batch_exports_coverage_field(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            run_batch(DATA, tmp, limit=0.0, decl_step=2.0, hour_step=2.0, export_field=True, field_dtype="float32")
+            witness = json.loads((Path(tmp) / "france" / "witness.json").read_text(encoding="utf-8"))
+            meta = witness["coverage_field"]
+            self.assertEqual(meta["max_dot_dtype"], "float32")
+            max_dot = np.load(Path(meta["directory"]) / meta["max_dot"], mmap_mode="r")
+            self.assertEqual(list(max_dot.shape), meta["shape"])
+            self.assertAlmostEqual(float(max_dot.min()), witness["witness"]["worst_max_dot"], places=6)
+
+
+    def test_cached_rerun_matches_and_incremental_skips_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp) / "data"
+            data.mkdir()
+            for name in ("france", "usa"):
+                (data / f"{name}.json").write_text((DATA / f"{name}.json").read_text(encoding="utf-8"), encoding="utf-8")
+            out = Path(tmp) / "out"
+            kwargs = dict(limit=0.0, decl_step=2.0, hour_step=2.0, incremental=True)
+            first = run_batch(data, out, **kwargs)
+            self.assertEqual(first["cache"], {"hits": 0, "misses": 2})
+
+            usa_report = out / "usa" / "report.md"
+            stamp = usa_report.stat().st_mtime_ns
+            payload = json.loads((data / "france.json").read_text(encoding="utf-8"))
+            payload["points"][0]["lat"] += 0.5
+            (data / "france.json").write_text(json.dumps(payload), encoding="utf-8")
+
+            second = run_batch(data, out, **kwargs)
+            self.assertEqual(second["cache"], {"hits": 1, "misses": 1})
+            self.assertEqual(usa_report.stat().st_mtime_ns, stamp)
+            usa = [c for c in second["countries"] if c["id"] == "usa"]
+            self.assertEqual(usa, [c for c in first["countries"] if c["id"] == "usa"])
+
+    def test_result_cache_evicts_least_recently_used(self):
+        from never_sets.io.result_cache import ResultCache
+
+        res = check_never_sets([(0.0, 0.0)], decl_step_deg=10.0, hour_angle_step_deg=10.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp, max_bytes=10**6)
+            cache.put("aa01", res.witness)
+            cache.put("bb02", res.witness)
+            entries = sorted(Path(tmp).glob("*/*.json"))
+            os.utime(entries[1], (1, 1))  # bb02 becomes the least recently used
+            cache.max_bytes = entries[0].stat().st_size
+            self.assertEqual(cache.evict(), 1)
+            self.assertIsNone(cache.get("bb02"))
+            self.assertEqual(cache.get("aa01"), res.witness)
+
+    def test_benchmark_history_and_compare(self):
+        from never_sets.cli.bench import BenchCase, append_history, compare_runs, load_history, run_suite
+
+        cases = [BenchCase("solve", "solve", 7, 5.0), BenchCase("batch", "batch", 7, 10.0, territories=2)]
+        with tempfile.TemporaryDirectory() as tmp:
+            history = Path(tmp) / "history.jsonl"
+            append_history(history, run_suite(cases, repeat=1, isolate=False))
+            append_history(history, run_suite(cases[:1], repeat=1, isolate=False))
+            runs = load_history(history)
+        self.assertEqual([len(r["cases"]) for r in runs], [2, 1])
+        first = runs[0]["cases"][1]
+        self.assertEqual(first["cells"], int(np.prod(SunGrid(decl_step_deg=10.0, hour_angle_step_deg=10.0).shape)))
+        self.assertGreater(first["peak_rss_mb"], 0.0)
+        self.assertAlmostEqual(first["throughput_cell_points_per_s"] * first["wall_s"], first["cells"] * 7 * 2)
+
+        rows = compare_runs(runs[0], runs[1])
+        self.assertEqual([(r["case"], r["metric"]) for r in rows], [("solve", "wall_s"), ("solve", "peak_rss_mb")])
+        base = {"cases": [dict(runs[0]["cases"][0], wall_s=1.0)]}
+        slower = {"cases": [dict(runs[0]["cases"][0], wall_s=1.05)]}
+        self.assertFalse(compare_runs(base, slower, threshold=0.1)[0]["regression"])
+        self.assertTrue(compare_runs(base, slower, threshold=0.01)[0]["regression"])
+        tiny = {"cases": [dict(runs[0]["cases"][0], wall_s=0.002)]}
+        tinier = {"cases": [dict(runs[0]["cases"][0], wall_s=0.001)]}
+        self.assertFalse(compare_runs(tinier, tiny)[0]["regression"])  # under the noise floor
+
+
 class TestCountryStore(unittest.TestCase):
     def write_country(self, payload: dict) -> Path:
         with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as tmp:
@@ -154,6 +816,48 @@ class TestCountryStore(unittest.TestCase):
             path.unlink(missing_ok=True)
         self.assertEqual(to_latlon_list(country), [(1.0, 2.0), (3.0, 4.0)])
         self.assertEqual(country.points[0].label, "main 1")
+        self.assertEqual(country_components(country), {"main": [(1.0, 2.0), (3.0, 4.0)]})
+
+    def test_streams_geojson_parts_as_components(self):
+        square = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+        features = [
+            {"type": "Feature", "properties": {"name": "A"}, "geometry": {"type": "Polygon", "coordinates": [square]}},
+            {
+                "type": "Feature",
+                "properties": {"name": "B"},
+                "geometry": {
+                    "type": "MultiPolygon",
+                    "coordinates": [[[[100, -5], [101, -5], [101, -4], [100, -5]]], [[[-120, 40], [-119, 41], [-120, 40]]]],
+                },
+            },
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "t.geojson"
+            path.write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+            # A tiny read size forces features to be decoded across many buffer refills.
+            with mock.patch("never_sets.io.stream_loader._CHUNK_CHARS", 16):
+                country = load_geojson(path)
+        self.assertEqual(country.id, "t")
+        self.assertEqual(country.components, ("A", "B #1", "B #2"))
+        self.assertEqual(to_latlon_list(country)[:4], [(0.0, 0.0), (0.0, 10.0), (10.0, 10.0), (10.0, 0.0)])
+        self.assertEqual(country.lat.size, 4 + 3 + 2)
+        self.assertEqual(set(country_components(country)), {"A", "B #1", "B #2"})
+
+    def test_decimation_stays_within_tolerance(self):
+        t = np.linspace(0.0, 2 * np.pi, 5001)[:-1]
+        lines = ["lat,lon"] + [f"{45 + 10 * math.sin(x)},{20 * math.cos(x)}" for x in t]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ring.csv"
+            path.write_text("\n".join(lines), encoding="utf-8")
+            full = load_csv_points(path)
+            coarse = load_territory(path, decimate_deg=1.0)
+        self.assertEqual(full.lat.size, t.size)
+        self.assertLess(coarse.lat.size, t.size // 10)
+        kwargs = dict(visibility_limit_deg=-70.0, decl_step_deg=1.0, hour_angle_step_deg=1.0)
+        exact = check_never_sets(full, **kwargs).witness.worst_max_altitude_deg
+        approx = check_never_sets(coarse, **kwargs).witness.worst_max_altitude_deg
+        self.assertLessEqual(approx, exact)
+        self.assertLessEqual(exact - approx, 1.0)
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)